@@ -8,84 +8,264 @@
 from player import Player
 from board import Board
 from ship import Ship
+from frontier import HuntTargetFrontier
+from cell_pool import CellPool
+from placements import placement_table
+from game_logic import DEFAULT_SHIPS
 import random
+import time
+
+# Every difficulty, weakest first. The order is part of the save and replay
+# formats (they store the index), so new levels go at the end.
+DIFFICULTIES = ("easy", "medium", "hard", "expert")
+
+# Fleet samples the expert AI needs before it prefers them to the hard answer
+EXPERT_MIN_SAMPLES = 500
 
 
 class AI:
-    def __init__(self, player: Player, difficulty: str = "easy"):
+    def __init__(self, player: Player, difficulty: str = "easy", heatmap=None):
         
         # AI brain that controls a Player object.
-        # Difficulty options: 'easy', 'medium', 'hard'
+        # Difficulty options: 'easy', 'medium', 'hard', 'expert'
+        # heatmap: optional heatmap.ShotHeatmap of where opponents have shot,
+        # used to place ships away from their favourite cells
         
         self.player = player
         self.difficulty = difficulty
+        self.heatmap = heatmap
 
         # Memory for targeting behavior
         self.previous_shots = set()
         self.hit_stack = []   # for medium/hard targeting behavior
+        self.pool = None      # CellPool of unshot opponent cells, used on easy
+        self.frontier = None  # HuntTargetFrontier, created on the first medium-mode shot
+        self.targeter = None  # DensityTargeter, created on the first hard-mode shot
+        self.sampler = None   # MonteCarloTargeter, created on the first expert-mode shot
+        self.seen_shots = 0   # Bitmask of opponent cells whose result the AI has seen
+        self.opponent_cols = None
+        self.last_search = None  # How much the last choose_shot() searched (see there)
+        self.in_book = True   # Hard/expert: still following the opening book (opening_book.py)
 
     # SHIP PLACEMENT
     def place_ships(self, ship_list):
         
         # Given a list of Ship objects, place them on the Player's board.
-        # This is where the AI decides *where* to put each ship.
-        
+        # This is where the AI decides *where* to put each ship: uniformly
+        # among the precomputed placements that don't overlap placed ships,
+        # or weighted towards rarely shot cells once there is a heatmap.
+        board = self.player.board
+        heatmap = self.heatmap
+        if heatmap is not None and (not heatmap.games or
+                                    (heatmap.rows, heatmap.cols) != (board.rows, board.cols)):
+            heatmap = None
         for ship in ship_list:
-            placed = False
-            while not placed:
-                # EASY: random placement (can be improved later)
-                row = random.randint(0, self.player.board.rows - 1)
-                col = random.randint(0, self.player.board.cols - 1)
-                direction = random.choice(["H", "V"])
-
-                placed = self.player.add_ship(ship, (row, col), direction)
-                
+            table = placement_table(board.rows, board.cols, ship.size)
+            if heatmap is not None:
+                index = heatmap.draw(ship.size, board.ship_mask, random)
+            else:
+                index = table.draw(board.ship_mask, random)
+            if index is None:
+                raise ValueError(f"No room left on the board for {ship.name}")
+            start, direction = table.placements[index]
+            self.player.add_ship(ship, start, direction)
+
     # ATTACK DECISION
-    def choose_shot(self, opponent_board: Board) -> tuple:
+    def choose_shot(self, opponent_board: Board, budget: float = None) -> tuple:
         # Decide where to fire based on difficulty level.
         # Returns (row, col).
+        #
+        # budget: seconds to think. Each difficulty refines its answer step by
+        # step and the best shot found when the budget runs out is returned;
+        # the first step always runs, so there is always an answer. None lets
+        # every difficulty finish (expert then uses its own sampling budget).
+        # self.last_search reports the search: refinement steps, samples
+        # counted (expert), elapsed milliseconds, whether it completed
+        # (always for the single-step difficulties; for expert, a full set of
+        # samples was drawn and counted) and whether the shot came from the
+        # opening book.
+        start = time.perf_counter()
+        deadline = None if budget is None else start + budget
+        search = self._search(opponent_board, deadline)
+        choice = None
+        steps = 0
+        try:
+            for choice in search:
+                steps += 1
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+        finally:
+            search.close()
+
+        # in_book is cleared before any live search, so it is still set
+        # only if this shot came from the opening book
+        book = self.in_book and self.difficulty in ("hard", "expert")
+        sampled = self.difficulty == "expert" and not book
+        self.last_search = {
+            "difficulty": self.difficulty,
+            "steps": steps,
+            "samples": self.sampler.counted if sampled else 0,
+            "elapsed_ms": round(1e3 * (time.perf_counter() - start), 3),
+            "complete": self.sampler.complete if sampled else True,
+            "book": book,
+        }
+        if choice is not None:
+            self.previous_shots.add(choice)
+        return choice
+
+    def _search(self, opponent_board, deadline):
+        # Yields successively better shots. Easy, medium and hard answer in
+        # one cheap step; expert refines as fleet samples come in. Hard and
+        # expert open from the book while the position is in it.
+        if self.difficulty in ("hard", "expert") and self.in_book:
+            choice = self._book_shot(opponent_board)
+            if choice is not None:
+                yield choice
+                return
+
         if self.difficulty == "easy":
-            return self._choose_shot_easy(opponent_board)
+            yield self._choose_shot_easy(opponent_board)
         elif self.difficulty == "medium":
-            return self._choose_shot_medium(opponent_board)
+            yield self._choose_shot_medium(opponent_board)
+        elif self.difficulty == "expert":
+            yield from self._search_expert(opponent_board, deadline)
         else:  # hard
-            return self._choose_shot_hard(opponent_board)
+            yield self._choose_shot_hard(opponent_board)
+
+    # OPENING BOOK
+    def _book_shot(self, opponent_board):
+        # One of the hard AI's best cells from the precomputed book, or None
+        # (for good) once the game has left it
+        from opening_book import get_book
+        sizes = [ship.size for ship in opponent_board.ships] or [size for _, size in DEFAULT_SHIPS]
+        book = get_book(opponent_board.rows, opponent_board.cols, tuple(sorted(sizes, reverse=True)))
+        cells = None
+        if book is not None and not any(ship.is_sunk() for ship in opponent_board.ships):
+            cells = book.lookup(opponent_board.shot_mask, opponent_board.hit_mask)
+        if not cells:
+            self.in_book = False
+            return None
+        return random.choice(cells)
 
     # EASY MODE (random)
     def _choose_shot_easy(self, opponent_board):
-        # Shoot randomly at an unshot tile.
-        rows = opponent_board.rows
-        cols = opponent_board.cols
-
-        choice = None
-
-        while choice is None or choice in self.previous_shots:
-            choice = (random.randint(0, rows - 1),
-                      random.randint(0, cols - 1))
+        # Shoot randomly at an unshot tile, drawn from the pool of
+        # remaining cells instead of retrying random coordinates.
+        if self.pool is None:
+            self.pool = CellPool(opponent_board.rows, opponent_board.cols)
+            for row, col in self.previous_shots:
+                self.pool.remove(row * opponent_board.cols + col)
+        self._sync(opponent_board)
 
+        cell = self.pool.draw()
+        if cell is None:
+            return None
+        choice = divmod(cell, opponent_board.cols)
         self.previous_shots.add(choice)
         return choice
 
     # MEDIUM MODE (hunt + target)
     def _choose_shot_medium(self, opponent_board):
-        # Hunt mode: random until a hit.
-        # Target mode: check tiles around hits.
-        
-        # TODO: Implement targeting behavior
-        return self._choose_shot_easy(opponent_board)
+        # Hunt mode: random parity cells until a hit.
+        # Target mode: check tiles around hits, along the line once two hits
+        # line up (see frontier.py).
+        if self.frontier is None:
+            self.frontier = HuntTargetFrontier(opponent_board.rows, opponent_board.cols)
+            self.hit_stack = self.frontier.around
+        self._sync(opponent_board)
+
+        choice = self.frontier.next_shot()
+        self.previous_shots.add(choice)
+        return choice
 
-    # HARD MODE (advanced patterning or probability map)
+    # HARD MODE (probability density)
     def _choose_shot_hard(self, opponent_board):
-        # Use a smarter approach: parity, probability density,
-        # or pattern scanning (to be implemented).
-        
-        # TODO: Implement probability targeting
-        return self._choose_shot_easy(opponent_board)
+        # Fire at the cell covered by the most legal placements of the
+        # ships still afloat (see density.py).
+        if self.targeter is None:
+            # Imported here so easy/medium AIs (and `import AI`) never load NumPy
+            from density import DensityTargeter
+            sizes = [ship.size for ship in opponent_board.ships]
+            if not sizes:
+                sizes = [size for _, size in DEFAULT_SHIPS]
+            self.targeter = DensityTargeter(opponent_board.rows, opponent_board.cols, sizes)
+        self._sync(opponent_board)
+
+        choice = self.targeter.best_cell()
+        self.previous_shots.add(choice)
+        return choice
+
+    # EXPERT MODE (Monte Carlo fleet sampling)
+    def _search_expert(self, opponent_board, deadline):
+        # Starts from the hard AI's answer, so a tight budget plays like hard
+        # rather than at random. Then fires at the cell occupied most often
+        # across sampled fleet layouts that agree with every result so far
+        # (see montecarlo.py), once EXPERT_MIN_SAMPLES of them back it,
+        # yielding a better estimate after each batch of samples.
+        if self.sampler is None:
+            # Created before the hard step syncs, so it sees the same shots
+            from montecarlo import MonteCarloTargeter
+            sizes = [ship.size for ship in opponent_board.ships]
+            if not sizes:
+                sizes = [size for _, size in DEFAULT_SHIPS]
+            self.sampler = MonteCarloTargeter(opponent_board.rows, opponent_board.cols, sizes)
+        refinement = self.sampler.refine(deadline)
+        yield self._choose_shot_hard(opponent_board)
+        for choice in refinement:
+            if self.sampler.counted >= EXPERT_MIN_SAMPLES:
+                yield choice
+
+    # SHOT RESULTS
+    def record_result(self, coord, result):
+        # Called with the outcome of every shot at the opponent's board
+        # (GameLogic.fire does this), so targeting memory stays current.
+        self.previous_shots.add(coord)
+        if self.opponent_cols is not None:
+            cell = coord[0] * self.opponent_cols + coord[1]
+            self.seen_shots |= 1 << cell
+            if self.pool is not None:
+                self.pool.remove(cell)
+        if self.frontier is not None:
+            self.frontier.observe(coord, result)
+        if self.targeter is not None:
+            self.targeter.observe(coord, result)
+        if self.sampler is not None:
+            self.sampler.observe(coord, result)
+
+    def _sync(self, opponent_board):
+        # Pick up shots at the opponent's board that were not reported
+        # through record_result(). Only the public hit/miss/sunk outcome is read.
+        self.opponent_cols = opponent_board.cols
+        new = opponent_board.shot_mask & ~self.seen_shots
+        self.seen_shots = opponent_board.shot_mask
+        hit_ships = set()
+        while new:
+            bit = new & -new
+            new ^= bit
+            index = bit.bit_length() - 1
+            coord = divmod(index, opponent_board.cols)
+            if opponent_board.hit_mask & bit:
+                hit_ships.add(opponent_board.cell_ship[index])
+                self.record_result(coord, "hit")
+            else:
+                self.record_result(coord, "miss")
+
+        for ship_id in hit_ships:
+            ship = opponent_board.ships[ship_id]
+            if ship.is_sunk():
+                self.record_result(ship.start, ("sunk", ship))
+
+    def record_game(self):
+        # Called when a game ends (GameLogic.end_game): add where the
+        # opponent shot at this AI's board to the heatmap
+        if self.heatmap is not None:
+            self.heatmap.record(self.player.board.shot_mask)
 
     # FULL TURN ACTION
-    def take_turn(self, opponent_player: Player):
-        # AI selects a shot, then uses Player.fire_at()
-        # to actually take the shot.
-        coord = self.choose_shot(opponent_player.board)
+    def take_turn(self, opponent_player: Player, budget: float = None):
+        # AI selects a shot (within `budget` seconds, see choose_shot),
+        # then uses Player.fire_at() to actually take the shot.
+        coord = self.choose_shot(opponent_player.board, budget)
         result = self.player.fire_at(opponent_player.board, coord)
+        self.record_result(coord, result)
         return coord, result
@@ -5,6 +5,10 @@ from ship import Ship
 from player import Player
 from AI import AI
 from game_logic import GameLogic
+from ai_worker import AITurnWorker
+from render import BoardRenderer
+from assets import draw_popup, popup_button_rects
+from frame_loop import FrameLoop
 
 ROWS, COLS = 10, 10
 CELL_SIZE = 40
@@ -21,12 +25,6 @@ GREEN = (60, 200, 80)
 YELLOW = (230, 200, 40)
 PREVIEW_ALPHA = 140
 
-POPUP_WIDTH = 300
-POPUP_HEIGHT = 150
-BUTTON_WIDTH = 120
-BUTTON_HEIGHT = 40
-BUTTON_SPACING = 20
-
 ships_to_place = [
     Ship("Carrier", 5),
     Ship("Battleship", 4),
@@ -35,48 +33,12 @@ ships_to_place = [
     Ship("Destroyer", 2)
 ]
 
-def draw_popup(screen, message, button_rects):
-    """Draw a popup dialog with message and buttons."""
-    popup_x = (SCREEN_WIDTH - POPUP_WIDTH) // 2
-    popup_y = (SCREEN_HEIGHT - POPUP_HEIGHT) // 2
-    
-    # Draw semi-transparent overlay
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 200))
-    screen.blit(overlay, (0, 0))
-    
-    # Draw popup background
-    popup_rect = pygame.Rect(popup_x, popup_y, POPUP_WIDTH, POPUP_HEIGHT)
-    pygame.draw.rect(screen, WHITE, popup_rect)
-    pygame.draw.rect(screen, GRAY, popup_rect, 2)
-    
-    # Draw message
-    font_large = pygame.font.SysFont(None, 28)
-    msg_surf = font_large.render(message, True, BLACK)
-    msg_rect = msg_surf.get_rect(center=(SCREEN_WIDTH // 2, popup_y + 40))
-    screen.blit(msg_surf, msg_rect)
-    
-    # Draw buttons
-    font_button = pygame.font.SysFont(None, 24)
-    for i, (label, color) in enumerate([("Play Again", GREEN), ("Quit", RED)]):
-        btn_x = popup_x + 35 + i * (BUTTON_WIDTH + BUTTON_SPACING)
-        btn_y = popup_y + POPUP_HEIGHT - 60
-        btn_rect = pygame.Rect(btn_x, btn_y, BUTTON_WIDTH, BUTTON_HEIGHT)
-        button_rects[label] = btn_rect
-        
-        pygame.draw.rect(screen, color, btn_rect)
-        pygame.draw.rect(screen, BLACK, btn_rect, 2)
-        
-        btn_surf = font_button.render(label, True, BLACK)
-        btn_text_rect = btn_surf.get_rect(center=btn_rect.center)
-        screen.blit(btn_surf, btn_text_rect)
-
 def run_ai():
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Battleship vs AI")
-    font = pygame.font.SysFont(None, 24)
-    clock = pygame.time.Clock()
+    loop = FrameLoop(name="ai_window")
+    ai_turn = AITurnWorker()   # The AI thinks on a worker thread
 
     # Boards
     player_board = Board(ROWS, COLS)
@@ -86,6 +48,12 @@ def run_ai():
     ai_player = Player("CPU", ai_board)
     ai_player.is_ai = True
     ai_player.ai = AI(ai_player, difficulty="easy")
+    try:
+        # Learn where this player likes to shoot, across games
+        from heatmap import get_heatmap
+        ai_player.ai.heatmap = get_heatmap(ROWS, COLS)
+    except (OSError, ValueError) as e:
+        print("Shot heatmap unavailable:", e)
 
     game = GameLogic(player, ai_player)
     game.auto_place_ships_if_ai()
@@ -103,26 +71,22 @@ def run_ai():
         row = (y - PADDING) // CELL_SIZE
         return row, col
 
-    def draw_board(board, offset_x, reveal_ships=True):
-        for r in range(board.rows):
-            for c in range(board.cols):
-                rect = pygame.Rect(offset_x + c*CELL_SIZE, PADDING + r*CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                cell = board.grid[r][c]
-                color = BLUE
-                if cell == "S" and reveal_ships:
-                    color = GRAY
-                elif cell == "X":
-                    color = RED
-                elif cell == "O":
-                    color = WHITE
-                pygame.draw.rect(screen, color, rect)
-                pygame.draw.rect(screen, BLACK, rect, 1)
+    # Cached board surfaces; only changed cells are redrawn each frame
+    colors = {"~": BLUE, "S": GRAY, "X": RED, "O": WHITE, "grid": BLACK}
+    player_view = BoardRenderer(ROWS, COLS, CELL_SIZE, (PADDING, PADDING), colors, reveal_ships=True)
+    ai_view = BoardRenderer(ROWS, COLS, CELL_SIZE, (COLS*CELL_SIZE + 2*PADDING, PADDING), colors, reveal_ships=False)
+    preview_surf = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+    shown_preview = None   # (coords, valid) currently drawn on screen
+    popup_shown = False
+    first_frame = True
 
     running = True
     while running:
-        screen.fill(BLACK)
+        # Nothing animates, so after the first frame wait for input, except
+        # while the AI is thinking: then poll for its shot every frame
+        events = loop.events(busy=first_frame or ai_turn.pending)
         mouse_pos = pygame.mouse.get_pos()
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
@@ -133,19 +97,12 @@ def run_ai():
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 # Handle popup clicks
                 if game_won:
-                    button_rects = {}
-                    popup_x = (SCREEN_WIDTH - POPUP_WIDTH) // 2
-                    popup_y = (SCREEN_HEIGHT - POPUP_HEIGHT) // 2
-                    
-                    for i, label in enumerate(["Play Again", "Quit"]):
-                        btn_x = popup_x + 35 + i * (BUTTON_WIDTH + BUTTON_SPACING)
-                        btn_y = popup_y + POPUP_HEIGHT - 60
-                        btn_rect = pygame.Rect(btn_x, btn_y, BUTTON_WIDTH, BUTTON_HEIGHT)
-                        button_rects[label] = btn_rect
-                    
-                    if button_rects.get("Play Again", pygame.Rect(0, 0, 0, 0)).collidepoint(event.pos):
+                    button_rects = popup_button_rects(SCREEN_WIDTH, SCREEN_HEIGHT)
+                    if button_rects["Play Again"].collidepoint(event.pos):
                         running = False  # Exit game loop to restart
-                    elif button_rects.get("Quit", pygame.Rect(0, 0, 0, 0)).collidepoint(event.pos):
+                    elif button_rects["Quit"].collidepoint(event.pos):
+                        ai_turn.close()
+                        loop.close()
                         pygame.quit()
                         import sys
                         sys.exit()
@@ -160,7 +117,7 @@ def run_ai():
                             current_ship_index += 1
                             if current_ship_index >= len(ships_to_place):
                                 placing_ships = False
-                else:
+                elif not ai_turn.pending:
                     row, col = get_tile(event.pos, COLS*CELL_SIZE + 2*PADDING)
                     if 0 <= row < ROWS and 0 <= col < COLS:
                         result = game.fire(row, col)
@@ -170,49 +127,68 @@ def run_ai():
                         if game.is_game_over():
                             game_won = True
                             winner = game.get_current_player().name
-                        else:
-                            if game.get_current_player().is_ai:
-                                ai_result = game.ai_take_turn()
-                                print("AI RESULT:", ai_result)
-                                if game.is_game_over():
-                                    game_won = True
-                                    winner = game.get_current_player().name
+                        elif game.get_current_player().is_ai:
+                            ai_turn.start(game)
+
+        # Apply the AI's shot once it has been chosen
+        ai_result = ai_turn.poll(game)
+        if ai_result is not None:
+            print("AI RESULT:", ai_result)
+            if game.is_game_over():
+                game_won = True
+                winner = game.get_current_player().name
 
         # Draw ship placement preview
         if placing_ships:
             pr, pc = get_tile(mouse_pos, PADDING)
             ship = ships_to_place[current_ship_index]
             coords = []
-            valid = True
             for i in range(ship.size):
                 rr = pr + (i if orientation == "V" else 0)
                 cc = pc + (i if orientation == "H" else 0)
                 coords.append((rr, cc))
-                if rr < 0 or cc < 0 or rr >= ROWS or cc >= COLS:
-                    valid = False
-                else:
-                    # Check collision with existing ships
-                    if player.board.grid[rr][cc] != "~":
-                        valid = False
+            # Single table lookup: in bounds and no collision with placed ships
+            valid = player.board.can_place(ship, (pr, pc), orientation)
             highlight = {"coords": coords, "valid": valid}
 
-        draw_board(player.board, PADDING, reveal_ships=True)
-        draw_board(ai_player.board, COLS*CELL_SIZE + 2*PADDING, reveal_ships=False)
-        
-        # Draw preview squares during ship placement
-        if placing_ships and highlight:
-            s = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-            color = (GREEN[0], GREEN[1], GREEN[2], PREVIEW_ALPHA) if highlight["valid"] else (255, 80, 80, PREVIEW_ALPHA)
-            s.fill(color)
-            for (r, c) in highlight["coords"]:
-                if 0 <= r < ROWS and 0 <= c < COLS:
-                    rect = pygame.Rect(PADDING + c * CELL_SIZE, PADDING + r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                    screen.blit(s, (rect.x, rect.y))
+        dirty = []
+        if first_frame:
+            screen.fill(BLACK)
+            player_view.sync_board(player.board)
+            ai_view.sync_board(ai_player.board)
+            dirty.append(player_view.blit_all(screen))
+            dirty.append(ai_view.blit_all(screen))
+        else:
+            dirty += player_view.blit_cells(screen, player_view.sync_board(player.board))
+            dirty += ai_view.blit_cells(screen, ai_view.sync_board(ai_player.board))
+
+        # Draw preview squares during ship placement, restoring the old ones
+        preview = (tuple(highlight["coords"]), highlight["valid"]) if placing_ships and highlight else None
+        if not popup_shown and (preview != shown_preview or dirty):
+            if shown_preview:
+                dirty += player_view.blit_cells(screen, shown_preview[0])
+            if preview:
+                color = (GREEN[0], GREEN[1], GREEN[2], PREVIEW_ALPHA) if preview[1] else (255, 80, 80, PREVIEW_ALPHA)
+                preview_surf.fill(color)
+                for (r, c) in preview[0]:
+                    if 0 <= r < ROWS and 0 <= c < COLS:
+                        rect = player_view.cell_rect(r, c)
+                        screen.blit(preview_surf, rect)
+                        dirty.append(rect)
+            shown_preview = preview
         
         # Draw popup if game is won
-        if game_won:
+        if game_won and not popup_shown:
             button_rects = {}
             draw_popup(screen, f"{winner} WINS!", button_rects)
+            popup_shown = True
+            dirty = [screen.get_rect()]
         
-        pygame.display.flip()
-        clock.tick(60)
+        if first_frame:
+            pygame.display.flip()
+            first_frame = False
+        elif dirty:
+            pygame.display.update(dirty)
+
+    ai_turn.close()
+    loop.close()
@@ -0,0 +1,68 @@
+# Title: Background AI Turns
+# Author: Nathan Vallad
+# Date: 12/21/2025
+# Purpose: Let a window keep drawing and handling input while the AI thinks.
+# The AI picks its shot on a worker thread; the window polls once per frame
+# and the shot is fired on the window's own thread, so GameLogic is only
+# ever changed there. While a decision is pending the worker only reads the
+# opponent's board, and the window must not fire (it is the AI's turn).
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AITurnWorker:
+    def __init__(self, budget=None):
+        self.budget = budget    # Seconds per decision, passed to AI.choose_shot
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="ai-turn")
+        self._future = None
+        self._started = 0.0
+
+        # Counters
+        self.turns = 0
+        self.think_time = 0.0
+        self.max_think_time = 0.0
+
+    @property
+    def pending(self) -> bool:
+        return self._future is not None
+
+    def start(self, game):
+        # Start choosing the current (AI) player's shot
+        if self._future is not None:
+            raise RuntimeError("An AI turn is already in progress")
+        ai = game.get_current_player().ai
+        board = game.get_opponent().board
+        self._started = time.perf_counter()
+        self._future = self._executor.submit(ai.choose_shot, board, self.budget)
+
+    def poll(self, game):
+        """
+        Fire the AI's shot if it has been chosen, returning the result of
+        game.fire(). Returns None while the AI is still thinking (or when no
+        turn was started).
+        """
+        future = self._future
+        if future is None or not future.done():
+            return None
+        self._future = None
+        elapsed = time.perf_counter() - self._started
+        self.turns += 1
+        self.think_time += elapsed
+        self.max_think_time = max(self.max_think_time, elapsed)
+        row, col = future.result()
+        return game.fire(row, col)
+
+    def stats(self):
+        return {
+            "turns": self.turns,
+            "avg_think_ms": round(self.think_time * 1000 / self.turns, 3) if self.turns else 0.0,
+            "max_think_ms": round(self.max_think_time * 1000, 3),
+        }
+
+    def close(self):
+        # Drop a pending decision; the thread finishes it in the background
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,97 @@
+# assets.py
+"""
+Render assets shared by the menu and both game windows.
+Fonts are loaded once per size, rendered text surfaces are memoized in a
+bounded LRU, and the win popup (overlay, panel and buttons) is built once
+per screen size, so none of this happens inside the frame loop.
+Everything here needs pygame to be initialised first.
+"""
+
+import os
+from functools import lru_cache
+
+import pygame
+
+BLACK = (20, 20, 20)
+WHITE = (240, 240, 240)
+GRAY = (120, 120, 120)
+RED = (220, 40, 40)
+GREEN = (60, 200, 80)
+
+POPUP_WIDTH = 300
+POPUP_HEIGHT = 150
+BUTTON_WIDTH = 120
+BUTTON_HEIGHT = 40
+BUTTON_SPACING = 20
+POPUP_BUTTONS = (("Play Again", GREEN), ("Quit", RED))
+
+
+@lru_cache(maxsize=None)
+def get_font(size, name=None):
+    # SysFont lookups can be slow (fontconfig), so each font is loaded once
+    return pygame.font.SysFont(name, size)
+
+
+@lru_cache(maxsize=256)
+def render_text(text, size, color, antialias=True):
+    # Rendered text surface; treat it as read-only since it is shared
+    return get_font(size).render(text, antialias, color)
+
+
+def clear():
+    # Drop every cached font and surface (call after pygame.quit())
+    get_font.cache_clear()
+    render_text.cache_clear()
+    _popup_base.cache_clear()
+
+
+# A forked window process gets its own fonts rather than the parent's
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=clear)
+
+
+def popup_origin(screen_width, screen_height):
+    return (screen_width - POPUP_WIDTH) // 2, (screen_height - POPUP_HEIGHT) // 2
+
+
+def popup_button_rects(screen_width, screen_height):
+    """Screen rects of the popup buttons as {label: Rect}."""
+    popup_x, popup_y = popup_origin(screen_width, screen_height)
+    rects = {}
+    for i, (label, _) in enumerate(POPUP_BUTTONS):
+        btn_x = popup_x + 35 + i * (BUTTON_WIDTH + BUTTON_SPACING)
+        btn_y = popup_y + POPUP_HEIGHT - 60
+        rects[label] = pygame.Rect(btn_x, btn_y, BUTTON_WIDTH, BUTTON_HEIGHT)
+    return rects
+
+
+@lru_cache(maxsize=4)
+def _popup_base(screen_width, screen_height):
+    # Overlay plus popup panel and buttons, without the message
+    base = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+    base.fill((0, 0, 0, 200))
+
+    popup_rect = pygame.Rect(*popup_origin(screen_width, screen_height), POPUP_WIDTH, POPUP_HEIGHT)
+    pygame.draw.rect(base, WHITE, popup_rect)
+    pygame.draw.rect(base, GRAY, popup_rect, 2)
+
+    rects = popup_button_rects(screen_width, screen_height)
+    for label, color in POPUP_BUTTONS:
+        btn_rect = rects[label]
+        pygame.draw.rect(base, color, btn_rect)
+        pygame.draw.rect(base, BLACK, btn_rect, 2)
+        btn_surf = render_text(label, 24, BLACK)
+        base.blit(btn_surf, btn_surf.get_rect(center=btn_rect.center))
+    return base
+
+
+def draw_popup(screen, message, button_rects):
+    """Draw a popup dialog with message and buttons."""
+    width, height = screen.get_size()
+    screen.blit(_popup_base(width, height), (0, 0))
+
+    msg_surf = render_text(message, 28, BLACK)
+    popup_y = popup_origin(width, height)[1]
+    screen.blit(msg_surf, msg_surf.get_rect(center=(width // 2, popup_y + 40)))
+
+    button_rects.update(popup_button_rects(width, height))
@@ -0,0 +1,4 @@
+"""
+Benchmarks for the Battleship core.
+Run from the project root, e.g. `python -m benchmarks.memory`.
+"""
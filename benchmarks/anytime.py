@@ -0,0 +1,82 @@
+"""
+Deadline-aware AI decisions (AI.choose_shot with a budget): for every
+difficulty and budget, how far past the budget the decision returns, how
+much search fits in, and how many shots a game takes at that budget.
+
+    python -m benchmarks.anytime [--budgets 0,0.002,0.01,0.05] [--games 3] [--workers N] [--json]
+"""
+
+import argparse
+import json
+import random
+import statistics
+
+from AI import AI
+from board import Board
+from game_logic import DEFAULT_SHIPS
+from player import Player
+from AI import DIFFICULTIES
+from ship import Ship
+
+
+def decisions(difficulty, budget, seed, workers):
+    # last_search of every decision in one game of `difficulty` against a seeded fleet
+    random.seed(seed)
+    defender = Player("Defender", Board())
+    AI(defender, "easy").place_ships([Ship(name, size) for name, size in DEFAULT_SHIPS])
+
+    attacker = Player("Attacker", Board(), is_ai=True)
+    attacker.ai = AI(attacker, difficulty)
+    if difficulty == "expert":
+        from montecarlo import MonteCarloTargeter
+        attacker.ai.sampler = MonteCarloTargeter(10, 10, [size for _, size in DEFAULT_SHIPS],
+                                                 workers=workers)
+    searches = []
+    while not defender.board.all_ships_sunk():
+        attacker.ai.take_turn(defender, budget)
+        searches.append(attacker.ai.last_search)
+    return searches
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budgets", default="0,0.002,0.01,0.05",
+                        help="comma separated seconds per decision")
+    parser.add_argument("--games", type=int, default=3, help="games per difficulty and budget")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+    budgets = [float(b) for b in args.budgets.split(",")]
+
+    results = {}
+    for difficulty in DIFFICULTIES:
+        for budget in budgets:
+            searches = []
+            for i in range(args.games):
+                searches += decisions(difficulty, budget, args.seed + i, args.workers)
+            over = [max(0.0, s["elapsed_ms"] - 1e3 * budget) for s in searches]
+            results[f"{difficulty}@{budget * 1e3:g}ms"] = {
+                "mean_shots": round(len(searches) / args.games, 2),
+                "steps_mean": round(statistics.mean(s["steps"] for s in searches), 1),
+                "samples_mean": round(statistics.mean(s["samples"] for s in searches), 1),
+                "completed": round(sum(s["complete"] for s in searches) / len(searches), 3),
+                "overshoot_ms_p50": round(_percentile(over, 0.5), 3),
+                "overshoot_ms_p99": round(_percentile(over, 0.99), 3),
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, row in results.items():
+            print(f"{name:>16}: " + "  ".join(f"{k}={v}" for k, v in row.items()))
+    return results
+
+
+if __name__ == "__main__":
+    main()
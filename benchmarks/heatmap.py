@@ -0,0 +1,98 @@
+"""
+Adaptive ship placement (heatmap.py): cost per game of recording the
+opponent's shots and placing a fleet from the heatmap as the history
+grows, and how many more shots an opponent needs against fleets placed
+from its learned heatmap than against uniformly placed ones.
+
+    python -m benchmarks.heatmap [--learn 300] [--games 200] [--opponents medium,hard] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from AI import AI
+from board import Board
+from game_logic import DEFAULT_SHIPS
+from heatmap import ShotHeatmap
+from player import Player
+from ship import Ship
+
+
+def _fleet():
+    return [Ship(name, size) for name, size in DEFAULT_SHIPS]
+
+
+def shots_to_sink(opponent, heatmap, seed):
+    # Shots `opponent` needs against a fleet placed with `heatmap` (None: uniform).
+    # Returns (shots, shot mask at the end).
+    random.seed(seed)
+    defender = Player("Defender", Board())
+    AI(defender, "easy", heatmap=heatmap).place_ships(_fleet())
+    attacker = Player("Attacker", Board(), is_ai=True)
+    attacker.ai = AI(attacker, opponent)
+    shots = 0
+    while not defender.board.all_ships_sunk():
+        attacker.ai.take_turn(defender)
+        shots += 1
+    return shots, defender.board.shot_mask
+
+
+def game_cost_us(heatmap, history, games=200):
+    # Record + adaptive placement per game with `history` games already counted
+    counts = heatmap.counts
+    scale = history / max(counts[0], 1)
+    counts[0] = history
+    for i in range(1, len(counts)):
+        counts[i] = int(counts[i] * scale)
+    masks = [random.getrandbits(100) for _ in range(games)]
+    start = time.perf_counter()
+    for mask in masks:
+        heatmap.record(mask)
+        AI(Player("P", Board()), "easy", heatmap=heatmap).place_ships(_fleet())
+    return (time.perf_counter() - start) * 1e6 / games
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--learn", type=int, default=300, help="games to learn each opponent from")
+    parser.add_argument("--games", type=int, default=200, help="games per comparison")
+    parser.add_argument("--opponents", default="medium,hard")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for opponent in args.opponents.split(","):
+            heatmap = ShotHeatmap(os.path.join(tmp, f"{opponent}.bin"))
+            # Learn from games against uniformly placed fleets
+            for i in range(args.learn):
+                heatmap.record(shots_to_sink(opponent, None, args.seed + i)[1])
+            seeds = range(args.seed + args.learn, args.seed + args.learn + args.games)
+            uniform = [shots_to_sink(opponent, None, seed)[0] for seed in seeds]
+            adaptive = [shots_to_sink(opponent, heatmap, seed)[0] for seed in seeds]
+            results[f"vs_{opponent}_uniform_shots"] = round(statistics.mean(uniform), 2)
+            results[f"vs_{opponent}_adaptive_shots"] = round(statistics.mean(adaptive), 2)
+            heatmap.close()
+
+        heatmap = ShotHeatmap(os.path.join(tmp, "cost.bin"))
+        heatmap.record(random.getrandbits(100))
+        for history in (10 ** 3, 10 ** 6, 10 ** 9):
+            results[f"us_per_game_at_{history}_games"] = round(game_cost_us(heatmap, history), 1)
+        heatmap.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print(f"{name:>32}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
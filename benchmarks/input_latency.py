@@ -0,0 +1,129 @@
+"""
+Input latency of the vs-AI window while the AI thinks: AI turns run inline
+in the frame loop (as ai_window.py used to) against AITurnWorker
+(ai_worker.py). A helper thread posts timestamped events every few
+milliseconds; latency is the time until the frame loop receives them.
+Runs headless with SDL's dummy video driver.
+
+    python -m benchmarks.input_latency [--difficulty expert] [--budget 0.05] [--turns 30] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402
+
+from AI import AI  # noqa: E402
+from ai_worker import AITurnWorker  # noqa: E402
+from board import Board  # noqa: E402
+from frame_loop import FrameLoop  # noqa: E402
+from game_logic import GameLogic  # noqa: E402
+from player import Player  # noqa: E402
+
+PROBE = pygame.USEREVENT + 2
+
+
+def _new_game(difficulty, seed):
+    random.seed(seed)
+    human = Player("Player", Board(), is_ai=True)
+    human.ai = AI(human, "easy")   # Only used to place ships and to "click"
+    cpu = Player("CPU", Board(), is_ai=True)
+    cpu.ai = AI(cpu, difficulty)
+    game = GameLogic(human, cpu)
+    game.auto_place_ships_if_ai()
+    return game
+
+
+def _post_probes(stop, interval):
+    while not stop.is_set():
+        pygame.event.post(pygame.event.Event(PROBE, t=time.perf_counter()))
+        time.sleep(interval)
+
+
+def measure(mode, difficulty, budget, turns, seed, interval=0.003):
+    # Play until the AI has taken `turns` turns; returns (latencies, loop stats)
+    game = _new_game(difficulty, seed)
+    human, cpu = game.players
+    loop = FrameLoop(name=mode)
+    worker = AITurnWorker(budget) if mode == "worker" else None
+    latencies = []
+    ai_turns = 0
+
+    pygame.event.clear()
+    stop = threading.Event()
+    poster = threading.Thread(target=_post_probes, args=(stop, interval), daemon=True)
+    poster.start()
+    try:
+        while ai_turns < turns and not game.is_game_over():
+            events = loop.events(busy=True)
+            now = time.perf_counter()
+            for event in events:
+                if event.type == PROBE:
+                    latencies.append(now - event.t)
+
+            if game.get_current_player() is human:
+                # The player clicks as soon as it is their turn
+                game.fire(*human.ai.choose_shot(cpu.board))
+                if not game.is_game_over():
+                    if worker is None:
+                        game.ai_take_turn(budget)
+                        ai_turns += 1
+                    else:
+                        worker.start(game)
+            elif worker is not None and worker.poll(game) is not None:
+                ai_turns += 1
+    finally:
+        stop.set()
+        poster.join()
+        if worker is not None:
+            worker.close()
+    return latencies, loop.stats()
+
+
+def _ms(values, q):
+    values = sorted(values)
+    return round(1e3 * values[min(len(values) - 1, int(len(values) * q))], 2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--difficulty", default="expert")
+    parser.add_argument("--budget", type=float, default=0.05, help="seconds per AI decision")
+    parser.add_argument("--turns", type=int, default=30, help="AI turns per mode")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    results = {}
+    try:
+        for mode in ("inline", "worker"):
+            latencies, stats = measure(mode, args.difficulty, args.budget, args.turns, args.seed)
+            results[mode] = {
+                "input_ms_p50": _ms(latencies, 0.5),
+                "input_ms_p99": _ms(latencies, 0.99),
+                "input_ms_max": _ms(latencies, 1.0),
+                "max_frame_ms": stats["max_frame_ms"],
+                "fps": stats["fps"],
+            }
+    finally:
+        pygame.quit()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for mode, row in results.items():
+            print(f"{mode:>8}: " + "  ".join(f"{k}={v}" for k, v in row.items()))
+    return results
+
+
+if __name__ == "__main__":
+    main()
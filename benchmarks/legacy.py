@@ -0,0 +1,103 @@
+"""
+The original list/set based Ship, Board and Player classes, kept only as a
+baseline for the benchmarks. Do not use these in the game.
+"""
+
+
+class LegacyShip:
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.positions = []    # List[(row, col)]
+        self.hits = set()      # Set[(row, col)]
+
+    def place(self, start, direction):
+        r, c = start
+        self.positions = []
+        for i in range(self.size):
+            if direction == 'H':
+                self.positions.append((r, c + i))
+            elif direction == 'V':
+                self.positions.append((r + i, c))
+            else:
+                raise ValueError("Direction must be 'H' or 'V'")
+
+    def register_hit(self, pos):
+        if pos in self.positions:
+            self.hits.add(pos)
+
+    def is_sunk(self):
+        return len(self.hits) == self.size
+
+
+class LegacyBoard:
+    def __init__(self, rows=10, cols=10):
+        self.rows = rows
+        self.cols = cols
+        self.ships = []
+        self.shots_taken = set()
+        self.grid = [["~" for _ in range(cols)] for _ in range(rows)]
+
+    def in_bounds(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def can_place(self, ship, start, direction):
+        r, c = start
+        for i in range(ship.size):
+            nr = r + (i if direction == 'V' else 0)
+            nc = c + (i if direction == 'H' else 0)
+            if not self.in_bounds(nr, nc):
+                return False
+            for s in self.ships:
+                if (nr, nc) in s.positions:
+                    return False
+        return True
+
+    def place_ship(self, ship, start, direction):
+        if not self.can_place(ship, start, direction):
+            return False
+        ship.place(start, direction)
+        self.ships.append(ship)
+        for (r, c) in ship.positions:
+            self.grid[r][c] = "S"
+        return True
+
+    def take_shot(self, row, col):
+        cell = self.grid[row][col]
+        if cell in ["X", "O"]:
+            return "miss"
+        for ship in self.ships:
+            if (row, col) in ship.positions:
+                ship.register_hit((row, col))
+                self.grid[row][col] = "X"
+                if ship.is_sunk():
+                    return ("sunk", ship)
+                return "hit"
+        self.grid[row][col] = "O"
+        return "miss"
+
+    def all_ships_sunk(self):
+        return all(ship.is_sunk() for ship in self.ships)
+
+
+class LegacyPlayer:
+    def __init__(self, name, board, is_ai=False):
+        self.name = name
+        self.is_ai = is_ai
+        self.board = board
+        self.ships = []
+
+    def add_ship(self, ship, start, direction):
+        if self.board.place_ship(ship, start, direction):
+            self.ships.append(ship)
+            return True
+        return False
+
+
+def legacy_choose_shot_easy(previous_shots, rows, cols, rng):
+    # The original easy-mode shot: redraw until an unshot cell comes up
+    choice = None
+    while choice is None or choice in previous_shots:
+        choice = (rng.randint(0, rows - 1), rng.randint(0, cols - 1))
+    previous_shots.add(choice)
+    return choice
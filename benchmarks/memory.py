@@ -0,0 +1,117 @@
+"""
+Bytes-per-game and ship placement throughput of the slotted Ship/Player/Board
+classes against the original list/set based ones (benchmarks/legacy.py).
+
+    python -m benchmarks.memory [--games N] [--shots N] [--seed S] [--json]
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from board import Board
+from game_logic import DEFAULT_SHIPS, GameLogic
+from player import Player
+from ship import Ship
+from benchmarks.legacy import LegacyBoard, LegacyPlayer, LegacyShip
+
+IMPLEMENTATIONS = {
+    "legacy": (LegacyShip, LegacyBoard, LegacyPlayer),
+    "current": (Ship, Board, Player),
+}
+
+
+def make_layouts(count, rng, rows=10, cols=10):
+    # Random legal fleets as [(name, size, start, direction)], shared by both
+    # implementations so they do exactly the same work.
+    layouts = []
+    for _ in range(count):
+        board = Board(rows, cols)
+        layout = []
+        for name, size in DEFAULT_SHIPS:
+            while True:
+                start = (rng.randrange(rows), rng.randrange(cols))
+                direction = rng.choice("HV")
+                if board.place_ship(Ship(name, size), start, direction):
+                    layout.append((name, size, start, direction))
+                    break
+        layouts.append(layout)
+    return layouts
+
+
+def build_game(impl, layouts, shots):
+    ship_cls, board_cls, player_cls = IMPLEMENTATIONS[impl]
+    players = []
+    for i, layout in enumerate(layouts):
+        player = player_cls(f"Player {i + 1}", board_cls())
+        for name, size, start, direction in layout:
+            player.add_ship(ship_cls(name, size), start, direction)
+        players.append(player)
+
+    # Play part of a game so hit tracking is populated too
+    for row, col in shots:
+        players[0].board.take_shot(row, col)
+        players[1].board.take_shot(row, col)
+    return GameLogic(players[0], players[1])
+
+
+def bytes_per_game(impl, layouts, shots):
+    pairs = list(zip(layouts[::2], layouts[1::2]))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = [build_game(impl, pair, shots) for pair in pairs]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del games
+    return (after - before) / len(pairs)
+
+
+def ships_per_second(impl, layouts):
+    ship_cls, board_cls, _ = IMPLEMENTATIONS[impl]
+    start = time.perf_counter()
+    placed = 0
+    for layout in layouts:
+        board = board_cls()
+        for name, size, pos, direction in layout:
+            board.place_ship(ship_cls(name, size), pos, direction)
+            placed += 1
+    return placed / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--shots", type=int, default=40, help="shots fired at each board")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    layouts = make_layouts(2 * args.games, rng)
+    cells = [(r, c) for r in range(10) for c in range(10)]
+    shots = rng.sample(cells, min(args.shots, len(cells)))
+
+    results = {}
+    for impl in IMPLEMENTATIONS:
+        results[impl] = {
+            "bytes_per_game": round(bytes_per_game(impl, layouts, shots)),
+            "ships_per_second": round(ships_per_second(impl, layouts)),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for impl, row in results.items():
+            print(f"{impl:>8}: {row['bytes_per_game']:>7} bytes/game  "
+                  f"{row['ships_per_second']:>9} ships/s")
+        ratio = results["legacy"]["bytes_per_game"] / results["current"]["bytes_per_game"]
+        print(f"current uses {ratio:.1f}x less memory per game")
+    return results
+
+
+if __name__ == "__main__":
+    main()
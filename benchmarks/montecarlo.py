@@ -0,0 +1,88 @@
+"""
+Monte Carlo fleet sampling (montecarlo.py, AI difficulty "expert") against
+the hard AI: shots needed to sink the same seeded fleets, plus sampling
+throughput and per-move latency.
+
+    python -m benchmarks.montecarlo [--games 20] [--budget 0.05] [--workers N] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+
+from AI import AI
+from board import Board
+from game_logic import DEFAULT_SHIPS
+from montecarlo import MOVE_BUDGET, MonteCarloTargeter
+from player import Player
+from ship import Ship
+
+
+def shots_to_sink(difficulty, seed, **sampler_args):
+    # Shots an AI needs to sink a fleet placed from `seed`. Returns (shots, AI).
+    random.seed(seed)
+    defender = Player("Defender", Board())
+    placer = AI(defender, "easy")
+    placer.place_ships([Ship(name, size) for name, size in DEFAULT_SHIPS])
+
+    attacker = Player("Attacker", Board(), is_ai=True)
+    attacker.ai = AI(attacker, difficulty)
+    if difficulty == "expert":
+        attacker.ai.sampler = MonteCarloTargeter(10, 10, [size for _, size in DEFAULT_SHIPS],
+                                                 **sampler_args)
+    shots = 0
+    while not defender.board.all_ships_sunk():
+        attacker.ai.take_turn(defender)
+        shots += 1
+    return shots, attacker.ai
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=MOVE_BUDGET, help="seconds per move")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    hard = [shots_to_sink("hard", args.seed + i)[0] for i in range(args.games)]
+    expert = []
+    totals = {"moves": 0, "samples_drawn": 0, "samples_reused": 0}
+    sample_time = 0.0
+    latencies = []
+    for i in range(args.games):
+        shots, ai = shots_to_sink("expert", args.seed + i, budget=args.budget, workers=args.workers)
+        expert.append(shots)
+        stats = ai.sampler.stats()
+        for key in totals:
+            totals[key] += stats[key]
+        sample_time += ai.sampler.sample_time
+        latencies += ai.sampler.latencies
+
+    latencies.sort()
+    results = {
+        "games": args.games,
+        "workers": args.workers,
+        "budget_ms": round(args.budget * 1e3, 1),
+        "hard_mean_shots": round(statistics.mean(hard), 2),
+        "expert_mean_shots": round(statistics.mean(expert), 2),
+        "samples_per_second": round(totals["samples_drawn"] / sample_time, 1) if sample_time else 0.0,
+        "samples_reused_per_move": round(totals["samples_reused"] / totals["moves"], 1),
+        "move_ms_p50": round(1e3 * latencies[len(latencies) // 2], 2),
+        "move_ms_p99": round(1e3 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2),
+        "move_ms_max": round(1e3 * latencies[-1], 2),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print(f"{name:>24}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Opening book (opening_book.py): time per decision over the book's opening
+shots for the hard and expert AIs with and without the book, plus book
+size, open time and lookup cost.
+
+    python -m benchmarks.opening_book [--games 20] [--seed S] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+from AI import AI
+from board import Board
+from game_logic import DEFAULT_SHIPS
+from opening_book import OpeningBook, book_path
+from player import Player
+from ship import Ship
+
+SIZES = tuple(sorted((size for _, size in DEFAULT_SHIPS), reverse=True))
+
+
+def opening_ms(difficulty, use_book, games, seed, depth):
+    # Mean milliseconds per decision over the first `depth` shots
+    times = []
+    for i in range(games):
+        random.seed(seed + i)
+        defender = Player("Defender", Board())
+        AI(defender, "easy").place_ships([Ship(name, size) for name, size in DEFAULT_SHIPS])
+        attacker = Player("Attacker", Board(), is_ai=True)
+        attacker.ai = AI(attacker, difficulty)
+        attacker.ai.in_book = use_book
+        for _ in range(depth):
+            start = time.perf_counter()
+            attacker.ai.take_turn(defender)
+            times.append(time.perf_counter() - start)
+    return round(1e3 * statistics.mean(times), 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    path = book_path(10, 10, SIZES)
+    if not os.path.exists(path):
+        parser.error(f"no book at {path}; build it with: python opening_book.py")
+
+    start = time.perf_counter()
+    book = OpeningBook(path)
+    open_us = (time.perf_counter() - start) * 1e6
+
+    # Lookups of positions along seeded openings
+    positions = []
+    rng = random.Random(args.seed)
+    for _ in range(200):
+        board = Board()
+        AI(Player("Defender", board), "easy").place_ships([Ship(n, s) for n, s in DEFAULT_SHIPS])
+        for _ in range(rng.randrange(book.depth)):
+            cells = book.lookup(board.shot_mask, board.hit_mask)
+            if not cells or any(ship.is_sunk() for ship in board.ships):
+                break
+            board.take_shot(*rng.choice(cells))
+        positions.append((board.shot_mask, board.hit_mask))
+    start = time.perf_counter()
+    for shot_mask, hit_mask in positions:
+        book.lookup(shot_mask, hit_mask)
+    lookup_us = (time.perf_counter() - start) * 1e6 / len(positions)
+
+    # Run each live search once, untimed, so loading density.py/montecarlo.py
+    # and starting the expert AI's worker pool aren't counted
+    for difficulty in ("hard", "expert"):
+        opening_ms(difficulty, False, 1, args.seed, book.depth)
+
+    results = {
+        "book_bytes": os.path.getsize(path),
+        "positions": book.count,
+        "depth": book.depth,
+        "open_us": round(open_us, 1),
+        "lookup_us": round(lookup_us, 2),
+    }
+    for difficulty in ("hard", "expert"):
+        for use_book in (False, True):
+            key = f"{difficulty}_{'book' if use_book else 'search'}_ms_per_opening_move"
+            results[key] = opening_ms(difficulty, use_book, args.games, args.seed, book.depth)
+    book.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print(f"{name:>36}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Load test for the PvP network server (pvp_server.py).
+Opens many client connections, pairs them into games and plays every game to
+the end with random placements and shots, then reports shots per second and
+the FIRE -> result round-trip latency.
+
+    python -m benchmarks.pvp_load [--clients 2000] [--port P] [--seed S] [--json]
+
+Without --port a server is started in a separate process on a free loopback
+port, so client and server don't share an event loop.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import socket
+import time
+
+from placements import placement_table
+from pvp_server import serve
+
+try:
+    import resource
+except ImportError:   # Not on Windows
+    resource = None
+
+
+def _raise_fd_limit(needed):
+    # Thousands of sockets need more than the usual 1024 descriptors
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def _free_port(host):
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def _run_server(host, port):
+    _raise_fd_limit(65536)
+    asyncio.run(serve(host, port))
+
+
+async def play_client(host, port, rng, latencies):
+    """
+    Play one game as one client. Appends the latency of each of its shots
+    (seconds) to `latencies`. Returns "win", "loss" or "bye".
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(b"JOIN\n")
+        while True:
+            parts = (await reader.readline()).split()
+            if parts[0] == b"START":
+                break
+        idx, rows, cols = int(parts[1]), int(parts[2]), int(parts[3])
+        sizes = [int(size) for size in parts[4].split(b",")]
+
+        # Random legal fleet, sent in one write
+        occupied = 0
+        lines = []
+        for size in sizes:
+            table = placement_table(rows, cols, size)
+            i = table.draw(occupied, rng)
+            occupied |= table.masks[i]
+            (r, c), direction = table.placements[i]
+            lines.append(f"PLACE {r} {c} {direction}\n")
+        writer.write("".join(lines).encode())
+
+        targets = [(r, c) for r in range(rows) for c in range(cols)]
+        rng.shuffle(targets)
+        sent = 0.0
+        while True:
+            line = await reader.readline()
+            if not line:
+                return "bye"
+            parts = line.split()
+            kind = parts[0]
+            my_turn = False
+            if kind == b"GO":
+                my_turn = int(parts[1]) == idx
+            elif kind == b"O":
+                my_turn = parts[3] != b"W"
+            elif kind == b"R":
+                latencies.append(time.perf_counter() - sent)
+            elif kind == b"END":
+                return "win" if int(parts[1]) == idx else "loss"
+            elif kind == b"BYE":
+                return "bye"
+            elif kind == b"ERR":
+                raise RuntimeError(line.decode().strip())
+
+            if my_turn:
+                r, c = targets.pop()
+                sent = time.perf_counter()
+                writer.write(f"FIRE {r} {c}\n".encode())
+    finally:
+        writer.close()
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run_load(host, port, clients, seed=1):
+    latencies = []
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(play_client(host, port, random.Random(rng.random()), latencies) for _ in range(clients)),
+        return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    errors = [o for o in outcomes if isinstance(o, BaseException)]
+    latencies.sort()
+    return {
+        "clients": clients,
+        "games": sum(1 for o in outcomes if o == "win"),
+        "errors": len(errors),
+        "first_error": repr(errors[0]) if errors else None,
+        "shots": len(latencies),
+        "seconds": round(elapsed, 3),
+        "shots_per_second": round(len(latencies) / elapsed) if elapsed else 0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 0.50) * 1000, 3),
+            "p99": round(_percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+
+async def _wait_for_server(host, port, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=2000, help="connections (two per game)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="use a running server instead of starting one")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    clients = args.clients + args.clients % 2
+    _raise_fd_limit(clients + 256)
+
+    server = None
+    port = args.port
+    if port is None:
+        port = _free_port(args.host)
+        server = multiprocessing.Process(target=_run_server, args=(args.host, port), daemon=True)
+        server.start()
+    try:
+        asyncio.run(_wait_for_server(args.host, port))
+        results = asyncio.run(run_load(args.host, port, clients, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        lat = results["latency_ms"]
+        print(f"{results['clients']} clients, {results['games']} games, {results['shots']} shots "
+              f"in {results['seconds']:.2f}s ({results['errors']} errors)")
+        print(f"{results['shots_per_second']:,} shots/s  latency p50 {lat['p50']:.2f} ms  "
+              f"p99 {lat['p99']:.2f} ms  max {lat['max']:.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    main()
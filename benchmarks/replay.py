@@ -0,0 +1,140 @@
+"""
+Replay log (replay.py): bytes per game, recording overhead, time to open and
+index the file, and the cost of rebuilding a random turn of a random game
+(ReplayLog.state) against replaying its shots one by one onto fresh boards.
+Every rebuilt turn of the first games is also checked against the live game.
+
+    python -m benchmarks.replay [--games 2000] [--rows R --cols C] [--seed S] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from AI import AI
+from board import Board
+from game_logic import GameLogic
+from player import Player
+from replay import ReplayLog, ReplayWriter
+
+
+def _snapshot(game):
+    return game.current_turn, [(p.board.shot_mask, p.board.hit_mask) for p in game.players]
+
+
+def play_games(count, seed, writer=None, rows=10, cols=10, history=None):
+    # Seeded medium-vs-medium games, recorded when a writer is given.
+    # history (optional list) gets each game's snapshot after every turn.
+    random.seed(seed)
+    for _ in range(count):
+        players = []
+        for i in (0, 1):
+            player = Player(f"Player {i + 1}", Board(rows, cols), is_ai=True)
+            player.ai = AI(player, "medium")
+            players.append(player)
+        game = GameLogic(players[0], players[1])
+        game.auto_place_ships_if_ai()
+        if writer is not None:
+            writer.attach(game)
+        snapshots = [_snapshot(game)]
+        while True:
+            result = game.ai_take_turn()
+            if history is not None:
+                snapshots.append(_snapshot(game))
+            if result == ("win", None):
+                break
+        if history is not None:
+            history.append(snapshots)
+
+
+def shot_by_shot(log, game_id, turn):
+    # Reference seek: the boards at turn 0, then every shot taken in order
+    game = log.state(game_id, 0)
+    for _, attacker, row, col, _ in log.shots(game_id)[:turn]:
+        game.players[1 - attacker].board.take_shot(row, col)
+    return game
+
+
+def check(path, history):
+    # Every turn of the recorded games rebuilds to what was played
+    with ReplayLog(path) as log:
+        for game_id, snapshots in zip(log.games, history):
+            for turn, expected in enumerate(snapshots):
+                if _snapshot(log.state(game_id, turn)) != expected:
+                    raise AssertionError(f"game {game_id} turn {turn} differs")
+
+
+def seek_us(path, probes, seed, seek):
+    rng = random.Random(seed)
+    with ReplayLog(path) as log:
+        games = log.games
+        targets = []
+        for _ in range(probes):
+            game_id = rng.choice(games)
+            targets.append((game_id, rng.randint(1, log.turns(game_id))))
+        start = time.perf_counter()
+        for game_id, turn in targets:
+            seek(log, game_id, turn)
+        return (time.perf_counter() - start) * 1e6 / probes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--probes", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--check-games", type=int, default=50,
+                        help="games whose every turn is checked against the live game")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.replay")
+
+        start = time.perf_counter()
+        play_games(args.games, args.seed, None, args.rows, args.cols)
+        bare = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ReplayWriter(path) as writer:
+            play_games(args.games, args.seed, writer, args.rows, args.cols)
+        recorded = time.perf_counter() - start
+
+        checked = os.path.join(tmp, "checked.replay")
+        history = []
+        with ReplayWriter(checked) as writer:
+            play_games(args.check_games, args.seed, writer, args.rows, args.cols, history)
+        check(checked, history)
+
+        start = time.perf_counter()
+        with ReplayLog(path) as log:
+            records = len(log)
+            log.games
+        index_ms = (time.perf_counter() - start) * 1e3
+
+        results = {
+            "games": args.games,
+            "records": records,
+            "bytes_per_game": round(os.path.getsize(path) / args.games, 1),
+            "recording_overhead_pct": round((recorded / bare - 1) * 100, 1),
+            "open_and_index_ms": round(index_ms, 2),
+            "seek_us": round(seek_us(path, args.probes, args.seed, ReplayLog.state), 1),
+            "seek_us_shot_by_shot": round(seek_us(path, args.probes, args.seed, shot_by_shot), 1),
+            "checked_games": args.check_games,
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print(f"{name:>30}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
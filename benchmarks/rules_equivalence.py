@@ -0,0 +1,139 @@
+"""
+Check that every backend of the rules engine (rules.py) plays the same
+game: random placements (including invalid ones) and random shots on
+random board sizes, replayed on GameLogic, PvPHandler, the shared-memory
+state (pvp_shm), the Manager dict (pvp_shared) and SessionHost, both
+shot by shot (fire) and through the batched path its ticks use
+(fire_many). Every placement answer, shot result, turn, grid and winner
+must agree. Exits non-zero on the first difference.
+
+    python -m benchmarks.rules_equivalence [--games 30] [--manager-games 5] [--seed S]
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+
+from board import Board
+from game_logic import DEFAULT_SHIPS, GameLogic
+from player import Player
+from pvp_handler import PvPHandler
+from pvp_shared import fire_shared, init_shared_state, place_ship_shared
+from pvp_shm import SharedPvPState
+from session_host import SessionHost
+from ship import Ship
+
+
+def _key(result, game_over=False):
+    # Comparable form of a shot result; a game-ending shot is "win" everywhere
+    if game_over or result == ("win", None):
+        return "win"
+    if isinstance(result, tuple):
+        ship = result[1]
+        return ("sunk", ship.name, ship.positions, sorted(ship.hits), ship.is_sunk())
+    return result
+
+
+def _check(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def play(seed, manager=None):
+    rng = random.Random(seed)
+    size = rng.choice([6, 10, 13])
+    handler = PvPHandler(Player("Player 1", Board(size, size)), Player("Player 2", Board(size, size)))
+    logic = GameLogic(Player("Player 1", Board(size, size)), Player("Player 2", Board(size, size)))
+    shm = SharedPvPState.create(size, size)
+    shared = manager.dict(init_shared_state(size, size)) if manager is not None else None
+    try:
+        # Placement, with out-of-bounds, overlapping and bad-direction attempts
+        fleets = ([], [])
+        for idx in (0, 1):
+            for name, ship_size in DEFAULT_SHIPS:
+                while True:
+                    start = (rng.randrange(-1, size), rng.randrange(size))
+                    direction = rng.choice("HVX")
+                    try:
+                        placed = handler.players[idx].add_ship(Ship(name, ship_size), start, direction)
+                    except ValueError:
+                        placed = False
+                    try:
+                        other = logic.players[idx].add_ship(Ship(name, ship_size), start, direction)
+                    except ValueError:
+                        other = False
+                    answers = [placed, other, place_ship_shared(shm, idx, name, ship_size, start, direction)]
+                    if shared is not None:
+                        answers.append(place_ship_shared(shared, idx, name, ship_size, start, direction))
+                    _check(len(set(answers)) == 1, f"seed {seed}: placement {start} {direction}: {answers}")
+                    if placed:
+                        fleets[idx].append((start, direction))
+                        break
+
+        host = SessionHost(size, size, fleet=DEFAULT_SHIPS, capacity=1)
+        session = host.create(ai=(None, None), fleets=fleets)
+        batch = SessionHost(size, size, fleet=DEFAULT_SHIPS, capacity=1)
+        batched = batch.create(ai=(None, None), fleets=fleets)
+
+        while not handler.game_over:
+            row, col = rng.randrange(size), rng.randrange(size)
+            turn = handler.current_turn
+            expected = _key(*handler.fire(row, col))
+            results = {
+                "GameLogic": _key(logic.fire(row, col)),
+                "pvp_shm": _key(*fire_shared(shm, turn, row, col)),
+                "SessionHost": _key(host.fire(session, row, col)),
+                "SessionHost batch": _key(batch.fire_many([batched], [row * size + col])[0]),
+            }
+            if shared is not None:
+                results["pvp_shared"] = _key(*fire_shared(shared, turn, row, col))
+            for name, result in results.items():
+                _check(result == expected, f"seed {seed}: shot {(row, col)}: {name} {result} != {expected}")
+
+            turns = [logic.current_turn, shm.current_turn, host.state(session)["current_turn"],
+                     batch.state(batched)["current_turn"]]
+            if shared is not None:
+                turns.append(shared["current_turn"])
+            if not handler.game_over:
+                _check(set(turns) == {handler.current_turn}, f"seed {seed}: turns {turns}")
+            for p in (0, 1):
+                grid = handler.players[p].board.grid
+                grids = [logic.players[p].board.grid, shm.copy()[f"player{p + 1}_board_grid"],
+                         host.grid(session, p), batch.grid(batched, p)]
+                if shared is not None:
+                    grids.append(shared[f"player{p + 1}_board_grid"])
+                _check(all(g == grid for g in grids), f"seed {seed}: player {p + 1} grids differ")
+
+        winner = handler.winner.name
+        _check(shm["game_over"] and shm["winner"] == winner, f"seed {seed}: pvp_shm winner")
+        _check(logic.is_game_over(), f"seed {seed}: GameLogic not over")
+        for name, state in (("SessionHost", host.state(session)), ("SessionHost batch", batch.state(batched))):
+            _check(state["game_over"] and state["winner"] == handler.players.index(handler.winner),
+                   f"seed {seed}: {name} winner")
+        if shared is not None:
+            _check(shared["game_over"] and shared["winner"] == winner, f"seed {seed}: pvp_shared winner")
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=30)
+    parser.add_argument("--manager-games", type=int, default=5,
+                        help="games also replayed on the (slow) Manager dict backend")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with multiprocessing.Manager() as manager:
+        for i in range(args.games):
+            play(args.seed + i, manager if i < args.manager_games else None)
+    print(f"{args.games} games: all backends agree")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except AssertionError as e:
+        sys.exit(f"Backends disagree: {e}")
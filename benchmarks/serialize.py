@@ -0,0 +1,106 @@
+"""
+Size and encode/decode speed of serialization.py against pickle, for a
+Board and a whole GameLogic halfway through a game.
+
+    python -m benchmarks.serialize [--games 2000] [--repeat 5] [--seed S] [--json]
+
+Pickle gets games without AI controllers (AI objects hold a module reference
+and cannot be pickled); the binary encoding would add one byte per player.
+"""
+
+import argparse
+import json
+import pickle
+import random
+import time
+
+from AI import AI
+from board import Board
+from game_logic import GameLogic
+from player import Player
+from pvp_shared import init_shared_state, place_ship_shared
+import serialization
+
+
+def make_games(count, seed):
+    random.seed(seed)
+    games = []
+    for _ in range(count):
+        players = []
+        for i in (0, 1):
+            player = Player(f"Player {i + 1}", Board(), is_ai=True)
+            player.ai = AI(player, "medium")
+            players.append(player)
+        game = GameLogic(players[0], players[1])
+        game.auto_place_ships_if_ai()
+        for _ in range(random.randrange(20, 80)):
+            if game.ai_take_turn() == ("win", None):
+                break
+        for player in players:
+            player.ai = None
+        games.append(game)
+    return games
+
+
+def manager_state(game):
+    # The same game in the Manager dict format used by local PvP
+    state = init_shared_state()
+    for idx, player in enumerate(game.players):
+        for ship in player.board.ships:
+            place_ship_shared(state, idx, ship.name, ship.size, ship.start, ship.direction)
+        state[f"player{idx + 1}_board_grid"] = [row[:] for row in player.board.grid]
+    return state
+
+
+def _time(fn, items, repeat):
+    # Best of `repeat` passes, so one noisy pass doesn't decide the result
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e9 / len(items)
+
+
+def measure(objects, encode, decode, repeat):
+    encoded = [encode(obj) for obj in objects]
+    return {
+        "bytes": round(sum(map(len, encoded)) / len(encoded), 1),
+        "encode_ns": round(_time(encode, objects, repeat)),
+        "decode_ns": round(_time(decode, encoded, repeat)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5, help="timed passes, best kept")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    games = make_games(args.games, args.seed)
+    boards = [game.players[0].board for game in games]
+    states = [manager_state(game) for game in games]
+    pickle_dumps = lambda obj: pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+    results = {
+        "board.binary": measure(boards, serialization.dumps, serialization.loads, args.repeat),
+        "board.pickle": measure(boards, pickle_dumps, pickle.loads, args.repeat),
+        "game.binary": measure(games, serialization.dumps, serialization.loads, args.repeat),
+        "game.pickle": measure(games, pickle_dumps, pickle.loads, args.repeat),
+        "manager_dict.pickle": measure(states, pickle_dumps, pickle.loads, args.repeat),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, row in results.items():
+            print(f"{name:>20}: {row['bytes']:>8.1f} bytes  encode {row['encode_ns']:>8,} ns  "
+                  f"decode {row['decode_ns']:>8,} ns")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Memory per live game and AI turns per second with many concurrent games:
+SessionHost (pooled arrays, batched ticks) against one GameLogic object graph
+per game stepped with ai_take_turn().
+
+    python -m benchmarks.sessions [--games 10000] [--rounds 20] [--level density] [--json]
+
+The host's AIs are its own batched heuristics (see session_host.py); the
+object graphs play the nearest AI.py difficulty (NEAREST).
+
+Each round plays one turn in every game. Memory is measured with tracemalloc
+after two rounds, so lazily created AI state is included.
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from AI import AI
+from board import Board
+from game_logic import GameLogic
+from player import Player
+from session_host import LEVELS, SessionHost
+
+NEAREST = {"random": "easy", "parity": "medium", "density": "hard"}
+
+
+def build_host(games, level, seed):
+    host = SessionHost(capacity=1024, linger=10**9, seed=seed)
+    for _ in range(games):
+        host.create(ai=(level, level))
+    return host
+
+
+def build_objects(games, level, seed):
+    difficulty = NEAREST[level]
+    random.seed(seed)
+    sessions = []
+    for _ in range(games):
+        players = []
+        for i in (0, 1):
+            player = Player(f"Player {i + 1}", Board(), is_ai=True)
+            player.ai = AI(player, difficulty)
+            players.append(player)
+        game = GameLogic(players[0], players[1])
+        game.auto_place_ships_if_ai()
+        sessions.append(game)
+    return sessions
+
+
+def play_host(host, rounds):
+    turns = 0
+    for _ in range(rounds):
+        turns += host.tick()
+    return turns
+
+
+def play_objects(sessions, rounds):
+    turns = 0
+    for _ in range(rounds):
+        for game in sessions:
+            if not game.is_game_over():
+                game.ai_take_turn()
+                turns += 1
+    return turns
+
+
+IMPLEMENTATIONS = {
+    "objects": (build_objects, play_objects),
+    "session_host": (build_host, play_host),
+}
+
+
+def measure(impl, games, rounds, level, seed):
+    build, play = IMPLEMENTATIONS[impl]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    state = build(games, level, seed)
+    play(state, 2)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del state
+    gc.collect()
+
+    state = build(games, level, seed)
+    start = time.perf_counter()
+    turns = play(state, rounds)
+    elapsed = time.perf_counter() - start
+    return {
+        "bytes_per_session": round((after - before) / games),
+        "turns": turns,
+        "turns_per_second": round(turns / elapsed) if elapsed else 0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--level", choices=LEVELS, default="density")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {impl: measure(impl, args.games, args.rounds, args.level, args.seed)
+               for impl in IMPLEMENTATIONS}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.games} live {args.level} games "
+              f"(objects: {NEAREST[args.level]}), {args.rounds} rounds")
+        for impl, row in results.items():
+            print(f"{impl:>12}: {row['bytes_per_session']:>7} bytes/session  "
+                  f"{row['turns_per_second']:>9,} turns/s")
+    return results
+
+
+if __name__ == "__main__":
+    main()
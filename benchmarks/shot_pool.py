@@ -0,0 +1,80 @@
+"""
+Per-shot cost of easy-mode random shooting across a whole game: the original
+rejection sampler against the CellPool draw used by AI._choose_shot_easy.
+Every cell of the board is shot once; the cost is reported per tenth of the
+game, so a flat row means the cost does not grow as the board fills up.
+
+    python -m benchmarks.shot_pool [--sizes 10,100] [--seed S] [--json]
+"""
+
+import argparse
+import json
+import random
+import time
+
+from AI import AI
+from board import Board
+from player import Player
+from benchmarks.legacy import legacy_choose_shot_easy
+
+BUCKETS = 10
+
+
+def _bucketed(timings):
+    size = len(timings) / BUCKETS
+    return [round(1e9 * sum(timings[int(i * size):int((i + 1) * size)]) /
+                  max(1, int((i + 1) * size) - int(i * size)))
+            for i in range(BUCKETS)]
+
+
+def legacy_game(size, seed):
+    rng = random.Random(seed)
+    previous = set()
+    timings = []
+    for _ in range(size * size):
+        start = time.perf_counter()
+        legacy_choose_shot_easy(previous, size, size, rng)
+        timings.append(time.perf_counter() - start)
+    return _bucketed(timings)
+
+
+def pool_game(size, seed):
+    random.seed(seed)
+    board = Board(size, size)
+    ai = AI(Player("CPU", Board(size, size)), "easy")
+    timings = []
+    for _ in range(size * size):
+        start = time.perf_counter()
+        coord = ai.choose_shot(board)
+        timings.append(time.perf_counter() - start)
+        ai.record_result(coord, board.take_shot(*coord))
+    return _bucketed(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10,100")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in (int(s) for s in args.sizes.split(",")):
+        results[f"{size}x{size}"] = {
+            "legacy_ns_per_shot": legacy_game(size, args.seed),
+            "pool_ns_per_shot": pool_game(size, args.seed),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("ns per shot, by tenth of the game")
+        for board, row in results.items():
+            for name in ("legacy_ns_per_shot", "pool_ns_per_shot"):
+                cells = " ".join(f"{ns:>9,}" for ns in row[name])
+                print(f"{board:>8} {name.split('_')[0]:>6}: {cells}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
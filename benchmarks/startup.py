@@ -0,0 +1,110 @@
+"""
+Cold-start latency: each case runs in a fresh interpreter and is timed from
+process launch to exit.
+
+    python -m benchmarks.startup [--repeats 10] [--only menu] [--out run.json]
+
+Cases:
+    interpreter   `python -c pass`, the floor for everything else
+    core          import board, ship, player, AI, game_logic, pvp_handler
+    headless      one medium-vs-medium game through simulate.py
+    pvp_child     what a spawned PvP window process imports before run_pvp
+    menu          import main and open the menu through run_menu() (SDL dummy
+                  video driver)
+
+Output uses the `benchmarks.suite run` format, so two runs can be checked
+with `python -m benchmarks.suite compare`. Each case also records whether
+pygame and numpy ended up imported.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_REPORT = "import json, sys; print(json.dumps({m: m in sys.modules for m in ('pygame', 'numpy')}))"
+
+CASES = {
+    "interpreter": "pass",
+    "core": "import board, ship, player, AI, game_logic, pvp_handler",
+    "headless": "import simulate; simulate.play_game(0, ('medium', 'medium'))",
+    # Under spawn the child runs the parent's main module as __mp_main__,
+    # then unpickles the target, which imports its module
+    "pvp_child": "import runpy; runpy.run_path('main.py', run_name='__mp_main__'); import pvp_window",
+    # Goes through run_menu() like main() does; the queued RETURN picks the
+    # first entry as soon as the menu has been drawn
+    "menu": ("import main, menu_window, pygame; pygame.init(); "
+             "pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN)); "
+             "assert menu_window.run_menu() == 'pvp'"),
+}
+
+
+def run_case(code):
+    # Returns (seconds, {module: imported}) for one fresh interpreter
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", f"{code}\n{_REPORT}"], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if proc.returncode:
+        raise RuntimeError(f"Startup case failed:\n{proc.stderr}")
+    return seconds, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_startup(repeats=10, only=None, log=None):
+    results = {}
+    for name, code in CASES.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        samples = []
+        for _ in range(repeats):
+            seconds, modules = run_case(code)
+            samples.append(seconds * 1e9)
+        key = f"startup.{name}"
+        results[key] = {
+            "ns_per_op": round(min(samples), 1),
+            "median_ns_per_op": round(statistics.median(samples), 1),
+            "ops": 1,
+            "repeats": repeats,
+            "imports": modules,
+        }
+        if log:
+            loaded = ", ".join(m for m, imported in modules.items() if imported) or "-"
+            print(f"{key:<24} {min(samples) / 1e6:>9.1f} ms  (loads {loaded})", file=log)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--only", action="append", help="run cases whose name contains this")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    output = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": run_startup(args.repeats, args.only, log=sys.stderr),
+    }
+    text = json.dumps(output, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
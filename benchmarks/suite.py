@@ -0,0 +1,295 @@
+"""
+Micro and macro benchmarks for the game core.
+
+    python -m benchmarks.suite run [--sizes 10,32,100] [--repeats 5] [--only take_shot] [--out run.json]
+    python -m benchmarks.suite compare base.json new.json [--threshold 0.10]
+
+Every case is seeded, so two runs on the same machine do the same work.
+`run` writes JSON (to stdout or --out); `compare` prints the per-case change
+and exits with status 1 if any case slowed down by more than the threshold.
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from AI import AI
+from board import Board
+from game_logic import DEFAULT_SHIPS, GameLogic
+from player import Player
+from ship import Ship
+from pvp_shared import fire_shared, init_shared_state, place_ship_shared
+from pvp_shm import SharedPvPState
+
+DEFAULT_SIZES = (10, 32, 100)
+
+# Cases that only make sense on small boards (the Manager backend pickles
+# whole grids per call)
+SMALL_ONLY = {"pvp_shared.fire_shared"}
+SMALL_LIMIT = 32
+
+
+def _fleet():
+    return [Ship(name, size) for name, size in DEFAULT_SHIPS]
+
+
+def _placed_player(size, rng, name="P"):
+    player = Player(name, Board(size, size))
+    for ship in _fleet():
+        while not player.add_ship(ship, (rng.randrange(size), rng.randrange(size)), rng.choice("HV")):
+            pass
+    return player
+
+
+def _cells(size, rng):
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+    return cells
+
+
+# Each case takes (size, seed) and returns (operations, seconds spent in the
+# code under test). Setup is excluded from the timing.
+
+def bench_take_shot(size, seed):
+    rng = random.Random(seed)
+    board = _placed_player(size, rng).board
+    cells = _cells(size, rng)
+    start = time.perf_counter()
+    for r, c in cells:
+        board.take_shot(r, c)
+    return len(cells), time.perf_counter() - start
+
+
+def bench_can_place(size, seed):
+    rng = random.Random(seed)
+    board = _placed_player(size, rng).board
+    ship = Ship("Cruiser", 3)
+    attempts = [((rng.randrange(size), rng.randrange(size)), rng.choice("HV")) for _ in range(5000)]
+    start = time.perf_counter()
+    for pos, direction in attempts:
+        board.can_place(ship, pos, direction)
+    return len(attempts), time.perf_counter() - start
+
+
+def bench_place_ships(size, seed):
+    random.seed(seed)
+    fleets = 200
+    players = [Player("P", Board(size, size)) for _ in range(fleets)]
+    ais = [AI(player) for player in players]
+    ships = [_fleet() for _ in range(fleets)]
+    start = time.perf_counter()
+    for ai, fleet in zip(ais, ships):
+        ai.place_ships(fleet)
+    return fleets, time.perf_counter() - start
+
+
+def _bench_choose_shot(difficulty):
+    def bench(size, seed):
+        rng = random.Random(seed)
+        random.seed(seed)
+        board = _placed_player(size, rng).board
+        ai = AI(Player("CPU", Board(size, size)), difficulty)
+        ops = 0
+        elapsed = 0.0
+        while not board.all_ships_sunk():
+            start = time.perf_counter()
+            coord = ai.choose_shot(board)
+            elapsed += time.perf_counter() - start
+            ai.record_result(coord, board.take_shot(*coord))
+            ops += 1
+        return ops, elapsed
+    return bench
+
+
+def bench_game_fire(size, seed):
+    rng = random.Random(seed)
+    game = GameLogic(_placed_player(size, rng, "P1"), _placed_player(size, rng, "P2"))
+    targets = [_cells(size, rng), _cells(size, rng)]
+    ops = 0
+    start = time.perf_counter()
+    while True:
+        r, c = targets[game.current_turn].pop()
+        ops += 1
+        if game.fire(r, c) == ("win", None):
+            break
+    return ops, time.perf_counter() - start
+
+
+_manager = None
+
+
+def bench_fire_shared(size, seed):
+    # Goes through a real multiprocessing.Manager dict proxy, as in PvP
+    global _manager
+    if _manager is None:
+        _manager = multiprocessing.Manager()
+    rng = random.Random(seed)
+    state = _manager.dict(init_shared_state(size, size))
+    for idx in (0, 1):
+        for name, ship_size in DEFAULT_SHIPS:
+            while not place_ship_shared(state, idx, name, ship_size,
+                                        (rng.randrange(size), rng.randrange(size)), rng.choice("HV")):
+                pass
+    cells = _cells(size, rng)[:200]
+    start = time.perf_counter()
+    for r, c in cells:
+        fire_shared(state, 0, r, c)
+    return len(cells), time.perf_counter() - start
+
+
+def bench_fire_shm(size, seed):
+    # Same shots as bench_fire_shared, against the shared memory backend
+    rng = random.Random(seed)
+    state = SharedPvPState.create(size, size)
+    try:
+        for idx in (0, 1):
+            for name, ship_size in DEFAULT_SHIPS:
+                while not place_ship_shared(state, idx, name, ship_size,
+                                            (rng.randrange(size), rng.randrange(size)), rng.choice("HV")):
+                    pass
+        cells = _cells(size, rng)[:200]
+        start = time.perf_counter()
+        for r, c in cells:
+            fire_shared(state, 0, r, c)
+        return len(cells), time.perf_counter() - start
+    finally:
+        state.close()
+        state.unlink()
+
+
+def _bench_full_game(difficulty):
+    def bench(size, seed):
+        from simulate import play_game
+        start = time.perf_counter()
+        play_game(seed, (difficulty, difficulty), size, size)
+        return 1, time.perf_counter() - start
+    return bench
+
+
+CASES = {
+    "board.take_shot": bench_take_shot,
+    "board.can_place": bench_can_place,
+    "ai.place_ships": bench_place_ships,
+    "ai.choose_shot.easy": _bench_choose_shot("easy"),
+    "ai.choose_shot.medium": _bench_choose_shot("medium"),
+    "ai.choose_shot.hard": _bench_choose_shot("hard"),
+    "game_logic.fire": bench_game_fire,
+    "pvp_shared.fire_shared": bench_fire_shared,
+    "pvp_shm.fire": bench_fire_shm,
+    "game.easy": _bench_full_game("easy"),
+    "game.medium": _bench_full_game("medium"),
+    "game.hard": _bench_full_game("hard"),
+}
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeats=5, seed=1, only=None, log=None):
+    results = {}
+    for name, bench in CASES.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        for size in sizes:
+            if name in SMALL_ONLY and size > SMALL_LIMIT:
+                continue
+            samples = []
+            ops = 0
+            for i in range(repeats):
+                ops, seconds = bench(size, seed + i)
+                samples.append(seconds * 1e9 / ops)
+            key = f"{name}[{size}x{size}]"
+            results[key] = {
+                "ns_per_op": round(min(samples), 1),
+                "median_ns_per_op": round(statistics.median(samples), 1),
+                "ops": ops,
+                "repeats": repeats,
+            }
+            if log:
+                print(f"{key:<36} {results[key]['ns_per_op']:>14,.0f} ns/op", file=log)
+
+    global _manager
+    if _manager is not None:
+        _manager.shutdown()
+        _manager = None
+    return results
+
+
+def compare(base, new, threshold=0.10):
+    """
+    Compare two `run` outputs by best ns/op. Returns a list of rows
+    (case, base ns, new ns, ratio, flag) for cases present in both.
+    """
+    rows = []
+    for key in sorted(set(base["results"]) & set(new["results"])):
+        old_ns = base["results"][key]["ns_per_op"]
+        new_ns = new["results"][key]["ns_per_op"]
+        ratio = new_ns / old_ns if old_ns else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "SLOWER"
+        elif ratio < 1 - threshold:
+            flag = "faster"
+        rows.append((key, old_ns, new_ns, ratio, flag))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Battleship core benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run the benchmarks")
+    run_p.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                       help="comma separated board sizes (square boards)")
+    run_p.add_argument("--repeats", type=int, default=5)
+    run_p.add_argument("--seed", type=int, default=1)
+    run_p.add_argument("--only", action="append", help="run cases whose name contains this")
+    run_p.add_argument("--out", help="write JSON here instead of stdout")
+
+    cmp_p = sub.add_parser("compare", help="compare two runs")
+    cmp_p.add_argument("base")
+    cmp_p.add_argument("new")
+    cmp_p.add_argument("--threshold", type=float, default=0.10,
+                       help="relative change that counts as a slowdown (default 0.10)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        sizes = [int(s) for s in args.sizes.split(",")]
+        output = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "seed": args.seed,
+                "sizes": sizes,
+            },
+            "results": run_suite(sizes, args.repeats, args.seed, args.only, log=sys.stderr),
+        }
+        text = json.dumps(output, indent=2)
+        if args.out:
+            with open(args.out, "w") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return 0
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    rows = compare(base, new, args.threshold)
+    for key, old_ns, new_ns, ratio, flag in rows:
+        print(f"{key:<36} {old_ns:>14,.0f} {new_ns:>14,.0f} ns/op  {ratio:6.2f}x  {flag}")
+    slower = [row for row in rows if row[4] == "SLOWER"]
+    if slower:
+        print(f"{len(slower)} case(s) slower by more than {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
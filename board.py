@@ -3,71 +3,131 @@
 # Date: 11/17/2025
 # Purpose: Define the Board class for the Battleship game. Handles ship placement,
 # shot tracking, checking hits/misses/sunk ships, and determining if all ships are sunk.
+# The rules themselves live in rules.py; Board is their in-process storage.
+
+from array import array
+import rules
+
 
 class Board:
+    __slots__ = ("rows", "cols", "ships", "ship_mask", "shot_mask", "hit_mask",
+                 "ship_masks", "cell_ship", "_grid")
+
     def __init__(self, rows=10, cols=10):
         self.rows = rows
         self.cols = cols
         self.ships = []
-        self.shots_taken = set()  # Tracks coordinates already shot
 
-        self.grid = [["~" for _ in range(cols)] for _ in range(rows)]
+        # Bitboards: bit (r * cols + c) represents cell (r, c)
+        self.ship_mask = 0      # Cells occupied by any ship
+        self.shot_mask = 0      # Cells already shot at
+        self.hit_mask = 0       # Cells shot at that contained a ship
+        self.ship_masks = []    # One mask per ship, parallel to self.ships
+
+        # Flat cell -> ship index (into self.ships), -1 where there is no ship
+        self.cell_ship = array('h', [-1]) * (rows * cols)
+
+        self._grid = None       # Lazily rebuilt view for the renderers
 
     def in_bounds(self, r, c) -> bool:
         return 0 <= r < self.rows and 0 <= c < self.cols
 
     def can_place(self, ship, start, direction) -> bool:
-        r, c = start
-
-        # Generate position coordinates
-        for i in range(ship.size):
-            nr = r + (i if direction == 'V' else 0)
-            nc = c + (i if direction == 'H' else 0)
+        return rules.placement_mask(self, ship.size, start, direction) != 0
 
-            if not self.in_bounds(nr, nc):
-                return False
+    def place_ship(self, ship, start, direction) -> bool:
+        return rules.place(self, ship, start, direction)
 
-            for s in self.ships:
-                if (nr, nc) in s.positions:
-                    return False
+    def take_shot(self, row, col):
+        """
+        Process an attack at (row, col).
+        Returns:
+            "hit", "miss", or ("sunk", ship)
+        """
+        return rules.shoot(self, row, col)
 
-        return True
+    # Storage for the rules engine (see rules.py)
 
-    def place_ship(self, ship, start, direction) -> bool:
-        if not self.can_place(ship, start, direction):
-            return False
+    def occupied(self, mask) -> bool:
+        return bool(mask & self.ship_mask)
 
+    def add_ship(self, ship, start, direction, mask):
         ship.place(start, direction)
+        ship_id = len(self.ships)
         self.ships.append(ship)
+        self.ship_masks.append(mask)
+        self.ship_mask |= mask
+        self._grid = None
 
-        # Update grid 
         for (r, c) in ship.positions:
-            self.grid[r][c] = "S"
-
+            self.cell_ship[r * self.cols + c] = ship_id
         return True
 
-    def take_shot(self, row, col):
-        """
-        Process an attack at (row, col).
-        Returns:
-            "hit", "miss", or ("sunk", ship)
-        """
-        cell = self.grid[row][col]
+    def mark_shot(self, cell) -> int:
+        bit = 1 << cell
+        if self.shot_mask & bit:
+            return rules.REPEAT
+        self.shot_mask |= bit
+        self._grid = None
+        return self.cell_ship[cell]
 
-        # Already hit
-        if cell in ["X", "O"]:
-            return "miss"
+    def add_hit(self, ship_id, cell) -> bool:
+        self.hit_mask |= 1 << cell
+        self.ships[ship_id].register_hit(divmod(cell, self.cols))
+        return not self.ship_masks[ship_id] & ~self.hit_mask
 
-        for ship in self.ships:
-            if (row, col) in ship.positions:
-                ship.register_hit((row, col))
-                self.grid[row][col] = "X"
-                if ship.is_sunk():
-                    return ("sunk", ship)
-                return "hit"
+    def ship(self, ship_id):
+        return self.ships[ship_id]
 
-        self.grid[row][col] = "O"
-        return "miss"
+    def restore_shots(self, shot_mask):
+        """
+        Mark exactly the cells in shot_mask as shot (for loading saved state).
+        Hits and every ship's hit counter are derived from the placed ships.
+        """
+        self.shot_mask = shot_mask
+        self.hit_mask = shot_mask & self.ship_mask
+        self._grid = None
+
+        for ship, mask in zip(self.ships, self.ship_masks):
+            hits = self.hit_mask & mask
+            cell = ship.row * self.cols + ship.col
+            if ship.direction == 'H':
+                ship.hit_bits = hits >> cell
+            else:
+                ship.hit_bits = 0
+                while hits:
+                    low = hits & -hits
+                    hits ^= low
+                    ship.hit_bits |= 1 << ((low.bit_length() - 1 - cell) // self.cols)
+            ship.hit_count = bin(ship.hit_bits).count("1")
 
     def all_ships_sunk(self) -> bool:
-        return all(ship.is_sunk() for ship in self.ships)
\ No newline at end of file
+        return not self.ship_mask & ~self.hit_mask
+
+    @property
+    def shots_taken(self):
+        # Tracks coordinates already shot
+        return {divmod(i, self.cols) for i in _bits(self.shot_mask)}
+
+    @property
+    def grid(self):
+        # Character grid ("~", "S", "X", "O") derived from the bitboards.
+        # Rebuilt only after a placement or shot changed the board.
+        if self._grid is None:
+            grid = [["~"] * self.cols for _ in range(self.rows)]
+            for i in _bits(self.ship_mask & ~self.shot_mask):
+                grid[i // self.cols][i % self.cols] = "S"
+            for i in _bits(self.hit_mask):
+                grid[i // self.cols][i % self.cols] = "X"
+            for i in _bits(self.shot_mask & ~self.hit_mask):
+                grid[i // self.cols][i % self.cols] = "O"
+            self._grid = grid
+        return self._grid
+
+
+def _bits(mask):
+    # Yield the index of every set bit in mask, lowest first
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -0,0 +1,46 @@
+# Title: Cell Pool
+# Author: Nathan Vallad
+# Date: 12/11/2025
+# Purpose: Keep the set of board cells that have not been shot yet so the AI
+# can draw a random one in O(1). Cells live in a flat array; removing a cell
+# swaps the last cell into its slot, and a reverse index finds any cell's slot.
+
+import random
+from array import array
+
+
+class CellPool:
+    __slots__ = ("cols", "cells", "slot")
+
+    def __init__(self, rows, cols, cells=None):
+        # cells: flat indices (row * cols + col) to start with, default all
+        self.cols = cols
+        self.cells = array('i', range(rows * cols) if cells is None else cells)
+        self.slot = array('i', [-1]) * (rows * cols)
+        for i, cell in enumerate(self.cells):
+            self.slot[cell] = i
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.slot[cell] >= 0
+
+    def remove(self, cell):
+        # Drop cell from the pool; a no-op if it is not there
+        i = self.slot[cell]
+        if i < 0:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.slot[last] = i
+        self.slot[cell] = -1
+
+    def draw(self, rng=random):
+        # Remove and return a uniformly random cell, or None if empty
+        if not self.cells:
+            return None
+        cell = self.cells[rng.randrange(len(self.cells))]
+        self.remove(cell)
+        return cell
@@ -0,0 +1,159 @@
+# Title: Probability Density Targeting
+# Author: Nathan Vallad
+# Date: 12/08/2025
+# Purpose: Count, for every cell, how many legal placements of each remaining
+# enemy ship cover it, given the hits, misses and sunk ships seen so far.
+# Used by the AI on hard difficulty. All placements of a ship size are held in
+# NumPy arrays and the counts are updated incrementally after each shot.
+
+import random
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def placement_cells(rows, cols, size):
+    """
+    All placements of a ship of `size` on a rows x cols board.
+    Returns (cells, cover_ptr, cover_idx):
+        cells      (P, size) flat cell index of every cell of every placement
+        cover_ptr  (rows*cols + 1,) offsets into cover_idx per cell
+        cover_idx  placements covering each cell, grouped by cell
+    Cached per board geometry; the arrays are read-only.
+    """
+    steps = np.arange(size)
+    parts = []
+    if size <= cols:
+        r, c = np.meshgrid(np.arange(rows), np.arange(cols - size + 1), indexing="ij")
+        parts.append((r * cols + c).reshape(-1, 1) + steps)
+    if size <= rows and size > 1:
+        r, c = np.meshgrid(np.arange(rows - size + 1), np.arange(cols), indexing="ij")
+        parts.append((r * cols + c).reshape(-1, 1) + steps * cols)
+    if parts:
+        cells = np.concatenate(parts).astype(np.int32)
+    else:
+        cells = np.empty((0, size), dtype=np.int32)
+
+    flat = cells.ravel()
+    order = np.argsort(flat, kind="stable")
+    cover_idx = (order // size).astype(np.int32)
+    cover_ptr = np.zeros(rows * cols + 1, dtype=np.int64)
+    np.cumsum(np.bincount(flat, minlength=rows * cols), out=cover_ptr[1:])
+
+    for arr in (cells, cover_ptr, cover_idx):
+        arr.setflags(write=False)
+    return cells, cover_ptr, cover_idx
+
+
+class _PlacementGroup:
+    # Every placement of one ship size, with per-cell coverage counts.
+    #   density[cell]: valid placements covering cell
+    #   target[cell]:  valid placements covering cell, weighted by the number
+    #                  of unresolved hits each placement covers
+    def __init__(self, rows, cols, size):
+        self.size = size
+        self.cells, self.cover_ptr, self.cover_idx = placement_cells(rows, cols, size)
+        count = len(self.cells)
+        self.valid = np.ones(count, dtype=bool)
+        self.hit_cover = np.zeros(count, dtype=np.int32)
+        self.density = np.bincount(self.cells.ravel(), minlength=rows * cols).astype(np.int64)
+        self.target = np.zeros(rows * cols, dtype=np.int64)
+
+    def _covering(self, cell):
+        placements = self.cover_idx[self.cover_ptr[cell]:self.cover_ptr[cell + 1]]
+        return placements[self.valid[placements]]
+
+    def block(self, cell):
+        # No ship of this size can cover a missed or sunk cell
+        placements = self._covering(cell)
+        if placements.size:
+            self.valid[placements] = False
+            flat = self.cells[placements].ravel()
+            np.subtract.at(self.density, flat, 1)
+            np.subtract.at(self.target, flat, np.repeat(self.hit_cover[placements], self.size))
+
+    def hit(self, cell):
+        placements = self._covering(cell)
+        if placements.size:
+            self.hit_cover[placements] += 1
+            np.add.at(self.target, self.cells[placements].ravel(), 1)
+
+
+class DensityTargeter:
+    def __init__(self, rows, cols, ship_sizes, rng=None):
+        self.rows = rows
+        self.cols = cols
+        self.rng = rng or random
+        self.remaining = Counter(ship_sizes)   # size -> ships of that size afloat
+        self.groups = {size: _PlacementGroup(rows, cols, size) for size in self.remaining}
+        self.shot = np.zeros(rows * cols, dtype=bool)
+        self.unresolved = set()                # hit cells not yet part of a sunk ship
+        self.sunk = set()                      # Ship objects already accounted for
+
+    def observe(self, coord, result):
+        """
+        Feed the result of a shot at coord, as returned by Board.take_shot:
+        "hit", "miss" or ("sunk", ship).
+        Observing the same shot again is a no-op.
+        """
+        cell = coord[0] * self.cols + coord[1]
+        if not self.shot[cell]:
+            self.shot[cell] = True
+            if result == "miss":
+                for group in self.groups.values():
+                    group.block(cell)
+                return
+
+            self.unresolved.add(cell)
+            for group in self.groups.values():
+                group.hit(cell)
+
+        if isinstance(result, tuple) and result[0] == "sunk":
+            self._sink(result[1])
+
+    def _sink(self, ship):
+        if ship in self.sunk:
+            return
+        self.sunk.add(ship)
+
+        cells = [r * self.cols + c for r, c in ship.positions]
+        self.unresolved.difference_update(cells)
+
+        if self.remaining[ship.size] > 0:
+            self.remaining[ship.size] -= 1
+            if self.remaining[ship.size] == 0:
+                del self.groups[ship.size]
+
+        # The sunk ship's cells can't hold any other ship
+        for group in self.groups.values():
+            for cell in cells:
+                group.block(cell)
+
+    def scores(self):
+        """
+        Per-cell score as a flat array: target-mode weights while there are
+        unresolved hits, hunt-mode densities otherwise. Shot cells score -1.
+        """
+        if self.unresolved:
+            score = self._combine("target")
+            score[self.shot] = -1
+            if score.max() > 0:
+                return score
+        score = self._combine("density")
+        score[self.shot] = -1
+        return score
+
+    def _combine(self, field):
+        score = np.zeros(self.rows * self.cols, dtype=np.int64)
+        for size, group in self.groups.items():
+            score += self.remaining[size] * getattr(group, field)
+        return score
+
+    def best_cell(self):
+        # Highest scoring unshot cell, ties broken at random
+        score = self.scores()
+        candidates = np.flatnonzero(score == score.max())
+        cell = int(candidates[self.rng.randrange(len(candidates))])
+        return divmod(cell, self.cols)
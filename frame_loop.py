@@ -0,0 +1,106 @@
+# frame_loop.py
+"""
+Idle-aware frame loop shared by the menu and both game windows.
+Instead of spinning at clock.tick(60), a window that has nothing to animate
+blocks in pygame.event.wait() until there is input, so an idle window uses
+almost no CPU. For PvP, watch() starts a helper thread that turns a
+StateChannel version change into a STATE_CHANGED event, so the waiting
+window also wakes up when the opponent moves.
+
+Frame-time and CPU counters are kept in stats(); set BATTLESHIP_STATS=1 to
+print them when a window closes.
+"""
+
+import os
+import threading
+import time
+
+import pygame
+
+STATE_CHANGED = pygame.USEREVENT + 1
+STATS_ENV = "BATTLESHIP_STATS"
+
+
+class FrameLoop:
+    def __init__(self, fps=60, idle_timeout=1000, name="window"):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.idle_timeout = idle_timeout   # ms, so a stuck wait still comes back
+        self.name = name
+
+        # Counters
+        self.frames = 0
+        self.idle_waits = 0
+        self.frame_time = 0.0     # Seconds spent handling frames (not waiting)
+        self.max_frame_time = 0.0
+        self._frame_start = None
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def events(self, busy=False):
+        """
+        Finish the previous frame and return the events for the next one.
+        With busy=True this behaves like clock.tick(fps) + event.get();
+        otherwise it blocks until at least one event arrives (or the idle
+        timeout passes, which returns an empty list).
+        """
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            elapsed = now - self._frame_start
+            self.frames += 1
+            self.frame_time += elapsed
+            self.max_frame_time = max(self.max_frame_time, elapsed)
+
+        self.clock.tick(self.fps)   # Never faster than fps, even under a flood of input
+        if busy:
+            events = pygame.event.get()
+        else:
+            self.idle_waits += 1
+            first = pygame.event.wait(self.idle_timeout)
+            events = [] if first.type == pygame.NOEVENT else [first]
+            events += pygame.event.get()
+
+        self._frame_start = time.perf_counter()
+        return events
+
+    def watch(self, channel):
+        # Post STATE_CHANGED whenever the channel version moves
+        def run():
+            seen = channel.version
+            while not self._stop.is_set():
+                version = channel.wait(seen, timeout=0.25)
+                if version == seen:
+                    continue
+                seen = version
+                try:
+                    pygame.event.post(pygame.event.Event(STATE_CHANGED))
+                except pygame.error:
+                    return   # Display already shut down
+
+        self._watcher = threading.Thread(target=run, name=f"{self.name}-state-watch", daemon=True)
+        self._watcher.start()
+
+    def stats(self):
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        return {
+            "frames": self.frames,
+            "idle_waits": self.idle_waits,
+            "avg_frame_ms": round(self.frame_time * 1000 / self.frames, 3) if self.frames else 0.0,
+            "max_frame_ms": round(self.max_frame_time * 1000, 3),
+            "fps": round(self.frames / wall, 1) if wall else 0.0,
+            "cpu_seconds": round(cpu, 3),
+            "cpu_percent": round(100 * cpu / wall, 1) if wall else 0.0,
+        }
+
+    def close(self):
+        # Stop the watcher; call before pygame.quit()
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(1.0)
+            self._watcher = None
+        if os.environ.get(STATS_ENV):
+            print(f"{self.name} frame stats:", self.stats())
@@ -0,0 +1,114 @@
+# Title: Hunt/Target Frontier
+# Author: Nathan Vallad
+# Date: 12/09/2025
+# Purpose: Hunt-and-target shot selection for the AI on medium difficulty.
+# Hunt mode fires at random cells of one checkerboard colour (every ship of
+# size 2+ covers at least one of them). After a hit, the neighbouring cells
+# become candidates; once two hits line up, cells extending the line are tried
+# first. All state is updated from shot results, never by rescanning the board.
+
+import random
+from collections import deque
+
+from cell_pool import CellPool
+
+
+class HuntTargetFrontier:
+    def __init__(self, rows, cols, rng=None):
+        self.rows = rows
+        self.cols = cols
+        self.rng = rng or random
+        self.shot = bytearray(rows * cols)   # 1 where a result has been observed
+        self.hits = set()                    # Unresolved hits (not part of a sunk ship)
+
+        # Candidate stacks; stale entries are skipped when popped
+        self.line = deque()     # Cells extending a line of two or more hits
+        self.around = deque()   # Cells next to an unresolved hit
+
+        # Hunt pools: parity cells, and the other colour only as a fallback
+        cells = range(rows * cols)
+        self.hunt = CellPool(rows, cols, [i for i in cells if (i // cols + i % cols) % 2 == 0])
+        self.fallback = CellPool(rows, cols, [i for i in cells if (i // cols + i % cols) % 2 == 1])
+
+    def observe(self, coord, result):
+        """
+        Feed the result of a shot at coord, as returned by Board.take_shot:
+        "hit", "miss" or ("sunk", ship). Observing the same shot again is a no-op.
+        """
+        cell = coord[0] * self.cols + coord[1]
+        if not self.shot[cell]:
+            self.shot[cell] = 1
+            self.hunt.remove(cell)
+            self.fallback.remove(cell)
+            if result == "miss":
+                return
+            self.hits.add(cell)
+            self._push_neighbours(cell)
+            self._extend_line(cell)
+
+        if isinstance(result, tuple) and result[0] == "sunk":
+            for r, c in result[1].positions:
+                self.hits.discard(r * self.cols + c)
+            self.line.clear()
+            if not self.hits:
+                # Back to hunting
+                self.around.clear()
+
+    def next_shot(self):
+        # Best candidate cell as (row, col)
+        while self.line:
+            cell = self.line.pop()
+            if not self.shot[cell] and self._next_to_hit(cell):
+                return divmod(cell, self.cols)
+        while self.around:
+            cell = self.around.pop()
+            if not self.shot[cell] and self._next_to_hit(cell):
+                return divmod(cell, self.cols)
+        cell = self.hunt.draw(self.rng)
+        if cell is None:
+            cell = self.fallback.draw(self.rng)
+        if cell is None:
+            return None
+        return divmod(cell, self.cols)
+
+    def _neighbours(self, cell):
+        r, c = divmod(cell, self.cols)
+        if r > 0:
+            yield cell - self.cols
+        if r < self.rows - 1:
+            yield cell + self.cols
+        if c > 0:
+            yield cell - 1
+        if c < self.cols - 1:
+            yield cell + 1
+
+    def _next_to_hit(self, cell):
+        return any(n in self.hits for n in self._neighbours(cell))
+
+    def _push_neighbours(self, cell):
+        for n in self._neighbours(cell):
+            if not self.shot[n]:
+                self.around.append(n)
+
+    def _extend_line(self, cell):
+        # If the new hit lines up with an unresolved neighbour, queue the
+        # first unshot cell past each end of the run along that axis.
+        r, c = divmod(cell, self.cols)
+        for step, length, pos in ((1, self.cols, c), (self.cols, self.rows, r)):
+            before = cell - step if pos > 0 else None
+            after = cell + step if pos < length - 1 else None
+            if before not in self.hits and after not in self.hits:
+                continue
+
+            for direction in (-1, 1):
+                current, index = cell, pos
+                while True:
+                    index += direction
+                    if not 0 <= index < length:
+                        break
+                    current += direction * step
+                    if current in self.hits:
+                        continue
+                    if not self.shot[current]:
+                        self.line.append(current)
+                    break
@@ -6,6 +6,7 @@
 # Works with Player and AI objects while keeping graphics and 
 # user input separated in main.py.
 
+import rules
 from ship import Ship
 
 DEFAULT_SHIPS = [
@@ -16,6 +17,13 @@ DEFAULT_SHIPS = [
     ("Destroyer", 2)
 ]
 
+
+def default_ship_name(index, size):
+    """Name of the default fleet's ship at `index` if it has this size, else None."""
+    if index < len(DEFAULT_SHIPS) and DEFAULT_SHIPS[index][1] == size:
+        return DEFAULT_SHIPS[index][0]
+    return None
+
 class GameLogic:
     def __init__(self, player1, player2):
         """
@@ -24,6 +32,7 @@ class GameLogic:
         """
         self.players = [player1, player2]
         self.current_turn = 0  # 0 = player1, 1 = player2
+        self.replay = None     # Optional replay.GameRecorder logging every shot
 
     # Access the active player
     def get_current_player(self):
@@ -33,6 +42,18 @@ class GameLogic:
     def get_opponent(self):
         return self.players[(self.current_turn + 1) % 2]
 
+    # Game storage for the rules engine (see rules.py)
+    def board(self, idx):
+        return self.players[idx].board
+
+    def end_game(self, winner):
+        # Nothing to store (is_game_over() reads the boards), but AI players
+        # learn from where they were shot
+        for player in self.players:
+            ai = getattr(player, "ai", None)
+            if ai is not None:
+                ai.record_game()
+
     # Automatically place ships for AI players
     def auto_place_ships_if_ai(self):
         """
@@ -55,32 +76,30 @@ class GameLogic:
             ("sunk", ship)
             ("win", None)
         """
-        attacker = self.get_current_player()
-        defender = self.get_opponent()
+        attacker_idx = self.current_turn
+        attacker = self.players[attacker_idx]
 
-        result = defender.board.take_shot(row, col)
+        # Resolves the shot and passes the turn unless the game is over
+        result, game_over = rules.fire(self, attacker_idx, row, col)
 
-        # Check win condition
-        if self.is_game_over():
-            return ("win", None)
+        if self.replay is not None:
+            self.replay.shot(attacker_idx, row, col, result)
 
-        # Switch turn if miss
-        if result == "miss":
-            self.end_turn()
-        
-        elif result == "hit":
-            self.end_turn()
-            
-        else:  # sunk
-            self.end_turn()
+        # Let an AI attacker update its targeting memory
+        if getattr(attacker, "ai", None) is not None:
+            attacker.ai.record_result((row, col), result)
 
+        if game_over:
+            return ("win", None)
         return result
 
     # Execute the AI's move (if the active player is an AI)
-    def ai_take_turn(self):
+    def ai_take_turn(self, budget=None):
         """
         Returns same result types as fire(): 
         ("hit", ship), ("miss", None), ("sunk", ship), ("win", None)
+        budget: seconds the AI may think (see AI.choose_shot); how much it
+        searched is left in its last_search.
         """
         current = self.get_current_player()
 
@@ -88,7 +107,7 @@ class GameLogic:
         if not hasattr(current, "is_ai") or not current.is_ai:
             return None
 
-        row, col = current.ai.choose_shot(self.get_opponent().board)
+        row, col = current.ai.choose_shot(self.get_opponent().board, budget)
         return self.fire(row, col)
 
     # Switch turn to the other player
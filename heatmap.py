@@ -0,0 +1,174 @@
+# Title: Opponent Shot Heatmap
+# Author: Nathan Vallad
+# Date: 12/23/2025
+# Purpose: Count, across games, how often opponents shoot each cell of the
+# AI's board, and place the AI's ships where opponents rarely look. The
+# counts live in a small memory-mapped file; recording a game adds its shots
+# (no rescans), and placement weights are rebuilt once per game from the
+# fixed-size counts, so the cost per game doesn't grow with the history.
+#
+# A placement's weight is the product, over its cells, of the chance the cell
+# went unshot in a game (Laplace smoothed), raised to `strength`: 0 places
+# uniformly, larger values avoid well-covered cells harder.
+#
+# Layout (little endian; the counters are used in place, so in native order,
+# which is little endian on every platform pygame ships for):
+#   "HEAT" version:u8 pad:u8 rows:u16 cols:u16 pad:6 games:u64 count:u64 per cell
+
+import mmap
+import os
+import random
+import struct
+from functools import lru_cache
+
+from placements import placement_table
+
+VERSION = 1
+HEADER = struct.Struct("<4sBxHH6x")
+HEATMAP_DIR = os.environ.get("BATTLESHIP_HEATMAPS",
+                             os.path.join(os.path.expanduser("~"), ".battleship"))
+
+
+def heatmap_path(rows, cols):
+    return os.path.join(HEATMAP_DIR, f"heatmap_{rows}x{cols}.bin")
+
+
+class _AliasTable:
+    # Walker's alias method: O(n) to build, O(1) per weighted draw
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+
+    def draw(self, rng):
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class ShotHeatmap:
+    def __init__(self, path, rows=10, cols=10):
+        size = HEADER.size + 8 * (1 + rows * cols)
+        if not os.path.exists(path):
+            # Written aside and renamed, so a crash never leaves a short file
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(b"HEAT", VERSION, rows, cols))
+                f.write(bytes(size - HEADER.size))
+            os.replace(tmp, path)
+
+        self._mmap = None
+        self._file = open(path, "r+b")
+        file_size = os.fstat(self._file.fileno()).st_size
+        if file_size < HEADER.size:
+            self.close()
+            raise ValueError(f"Not a version {VERSION} shot heatmap: {path}")
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        magic, version, file_rows, file_cols = HEADER.unpack_from(self._mmap, 0)
+        if magic != b"HEAT" or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a version {VERSION} shot heatmap: {path}")
+        if (file_rows, file_cols) != (rows, cols):
+            self.close()
+            raise ValueError(f"{path} is for a {file_rows}x{file_cols} board, not {rows}x{cols}")
+        if file_size != size:
+            self.close()
+            raise ValueError(f"Truncated or corrupt shot heatmap: {path}")
+
+        self.rows = rows
+        self.cols = cols
+        # counts[0] is the number of games, counts[1 + cell] the shots at a cell
+        self._views = [memoryview(self._mmap)]
+        self._views.append(self._views[0][HEADER.size:])
+        self.counts = self._views[1].cast("Q")
+        self._tables = {}    # (size, strength) -> (weights, _AliasTable), for self._tables_games
+        self._tables_games = -1
+
+    @property
+    def games(self):
+        return self.counts[0]
+
+    def record(self, shot_mask):
+        """Add one finished game in which the opponent shot the cells of shot_mask."""
+        counts = self.counts
+        counts[0] += 1
+        while shot_mask:
+            low = shot_mask & -shot_mask
+            counts[low.bit_length()] += 1     # 1 + cell index
+            shot_mask ^= low
+        self._mmap.flush()
+
+    def frequencies(self):
+        # Fraction of games in which each cell was shot, flat by cell
+        games = self.counts[0]
+        return [count / games if games else 0.0 for count in self.counts[1:]]
+
+    def _table(self, size, strength):
+        # (placement weights, alias table) for a ship size, rebuilt once per game
+        if self._tables_games != self.counts[0]:
+            self._tables = {}
+            self._tables_games = self.counts[0]
+        key = (size, strength)
+        if key not in self._tables:
+            games = self.counts[0]
+            unshot = [((games - count + 1) / (games + 2)) ** strength for count in self.counts[1:]]
+            weights = []
+            for mask in placement_table(self.rows, self.cols, size).masks:
+                weight = 1.0
+                while mask:
+                    low = mask & -mask
+                    weight *= unshot[low.bit_length() - 1]
+                    mask ^= low
+                weights.append(weight)
+            self._tables[key] = (weights, _AliasTable(weights) if weights else None)
+        return self._tables[key]
+
+    def draw(self, size, occupied, rng=random, strength=1.0, tries=16):
+        """
+        Index into placement_table(rows, cols, size) of a placement that
+        doesn't overlap `occupied`, drawn by heatmap weight, or None if none
+        fits. Like PlacementTable.draw, direct draws are tried first and the
+        free placements are filtered only if they keep overlapping; both
+        follow the same weights.
+        """
+        masks = placement_table(self.rows, self.cols, size).masks
+        weights, alias = self._table(size, strength)
+        if alias is None:
+            return None
+        for _ in range(tries):
+            i = alias.draw(rng)
+            if not masks[i] & occupied:
+                return i
+        free = [i for i, mask in enumerate(masks) if not mask & occupied]
+        if not free:
+            return None
+        return rng.choices(free, [weights[i] for i in free])[0]
+
+    def close(self):
+        # The views on the map have to go before the map can be closed
+        if getattr(self, "counts", None) is not None:
+            for view in [self.counts] + self._views[::-1]:
+                view.release()
+            self.counts = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+
+@lru_cache(maxsize=None)
+def get_heatmap(rows, cols):
+    """The shared ShotHeatmap for this board size, created on first use."""
+    return ShotHeatmap(heatmap_path(rows, cols), rows, cols)
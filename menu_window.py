@@ -0,0 +1,79 @@
+# menu_window.py
+import pygame
+import sys
+from assets import get_font, render_text
+from frame_loop import FrameLoop
+
+# CONFIG 
+SCREEN_WIDTH = 400
+SCREEN_HEIGHT = 400
+BLACK = (20, 20, 20)
+WHITE = (240, 240, 240)
+GREEN = (60, 200, 80)
+YELLOW = (230, 200, 40)
+
+screen = None
+font = None
+
+
+def init_menu():
+    """Initialize pygame and menu display."""
+    global screen, font
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Battleship Menu")
+    font = get_font(32)
+    return screen, font
+
+
+def draw_menu(selected):
+    screen.fill(BLACK)
+    title = render_text("BATTLESHIP", 32, YELLOW)
+    screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 50))
+
+    options = ["Player vs Player", "Player vs Computer", "Quit"]
+    for i, text in enumerate(options):
+        color = GREEN if i == selected else WHITE
+        surf = render_text(text, 32, color)
+        screen.blit(surf, (SCREEN_WIDTH//2 - surf.get_width()//2, 150 + i*60))
+
+    pygame.display.flip()
+
+
+def run_menu():
+    # (Re)create the menu display on first use, after a game quit pygame or
+    # after a game window took the display over (set_mode() hands back the
+    # same Surface object, so compare sizes rather than identity)
+    surface = pygame.display.get_surface()
+    if screen is None or surface is None or surface.get_size() != (SCREEN_WIDTH, SCREEN_HEIGHT):
+        init_menu()
+
+    selected = 0
+    drawn = None
+    loop = FrameLoop(name="menu")
+    while True:
+        # Redraw only when the selection moved; otherwise sleep until input
+        if selected != drawn:
+            draw_menu(selected)
+            drawn = selected
+        for event in loop.events():
+            if event.type == pygame.QUIT:
+                loop.close()
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                drawn = None
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    selected = (selected - 1) % 3
+                elif event.key == pygame.K_DOWN:
+                    selected = (selected + 1) % 3
+                elif event.key == pygame.K_RETURN:
+                    loop.close()
+                    return ["pvp", "ai", "quit"][selected]
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                mx, my = event.pos
+                for i in range(3):
+                    if 150 + i*60 <= my <= 150 + i*60 + 32:
+                        loop.close()
+                        return ["pvp", "ai", "quit"][i]
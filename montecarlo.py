@@ -0,0 +1,287 @@
+# Title: Monte Carlo Fleet Sampling
+# Author: Nathan Vallad
+# Date: 12/20/2025
+# Purpose: Sample complete enemy fleet layouts that agree with every hit, miss
+# and sunk ship seen so far, and fire at the unshot cell occupied in the most
+# samples. Used by the AI on expert difficulty. Samples are drawn in a process
+# pool within a per-move time budget, and kept between moves: a new result
+# only discards the samples it contradicts.
+#
+# A sample is a tuple of placement bitmasks (bit r * cols + c, as in Board),
+# one per ship still afloat, in the order of `sizes`.
+
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, as_completed
+
+from placements import placement_table
+
+MOVE_BUDGET = 0.05      # Seconds of sampling per move
+TARGET_SAMPLES = 2000   # Samples to hold after topping up
+GRACE = 0.01            # Extra wait for workers to hand their samples back
+BATCH = 250             # Samples drawn or counted between refinements
+
+_executor = None
+_executor_workers = 0
+
+
+def _pool(workers):
+    # Shared worker pool, or None to sample in this process. Daemonic
+    # processes (e.g. simulate.py's pool workers) can't start children.
+    global _executor, _executor_workers
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        return None
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ProcessPoolExecutor(workers)
+        _executor_workers = workers
+    return _executor
+
+
+def draw_samples(rows, cols, sizes, blocked, hits, shot, count, budget, seed):
+    """
+    Up to `count` fleet layouts for the ships in `sizes`, drawn for at most
+    `budget` seconds. Ships avoid `blocked` (misses and sunk ships), the
+    unresolved `hits` are all covered, and no ship lies entirely on `shot`
+    cells (it would have been reported sunk). Returns (samples, attempts).
+    """
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + budget
+    free = {size: [m for m in placement_table(rows, cols, size).masks if not m & blocked]
+            for size in set(sizes)}
+    covering = {}   # (size, hit bit) -> placements covering that hit
+    samples = []
+    attempts = 0
+    order = list(range(len(sizes)))
+
+    while len(samples) < count and time.perf_counter() < deadline:
+        attempts += 1
+        chosen = [0] * len(sizes)
+        unplaced = order[:]
+        occupied = 0
+        uncovered = hits
+
+        # Cover every unresolved hit first, lowest cell first
+        while uncovered:
+            bit = uncovered & -uncovered
+            options = []
+            for i in unplaced:
+                key = (sizes[i], bit)
+                if key not in covering:
+                    covering[key] = [m for m in free[sizes[i]] if m & bit]
+                options.extend((i, m) for m in covering[key] if not m & occupied)
+            if not options:
+                break
+            i, mask = rng.choice(options)
+            chosen[i] = mask
+            unplaced.remove(i)
+            occupied |= mask
+            uncovered &= ~mask
+        if uncovered:
+            continue
+
+        # Then the rest of the fleet anywhere it fits
+        rng.shuffle(unplaced)
+        for i in unplaced:
+            masks = free[sizes[i]]
+            for _ in range(8):
+                mask = masks[rng.randrange(len(masks))] if masks else 0
+                if mask and not mask & occupied:
+                    break
+            else:
+                fits = [m for m in masks if not m & occupied]
+                if not fits:
+                    break
+                mask = rng.choice(fits)
+            chosen[i] = mask
+            occupied |= mask
+        else:
+            if all(mask & ~shot for mask in chosen):
+                samples.append(tuple(chosen))
+    return samples, attempts
+
+
+def _draw_job(args):
+    return draw_samples(*args)
+
+
+class MonteCarloTargeter:
+    def __init__(self, rows, cols, ship_sizes, rng=None, budget=MOVE_BUDGET,
+                 target=TARGET_SAMPLES, workers=None):
+        self.rows = rows
+        self.cols = cols
+        self.rng = rng or random
+        self.budget = budget
+        self.target = target
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.sizes = sorted(ship_sizes, reverse=True)   # Ships still afloat
+        self.shot = 0          # Cells shot at
+        self.blocked = 0       # Misses and sunk ships: no afloat ship there
+        self.hits = 0          # Hits not yet part of a sunk ship
+        self.sunk = set()      # Ship objects already accounted for
+        self.samples = []
+
+        # Counters
+        self.counted = 0       # Samples counted for the current move
+        self.complete = True   # Whether that move counted a full set of samples
+        self.moves = 0
+        self.drawn = 0
+        self.reused = 0
+        self.sample_time = 0.0
+        self.latencies = []
+
+    def observe(self, coord, result):
+        """
+        Feed the result of a shot at coord, as returned by Board.take_shot:
+        "hit", "miss" or ("sunk", ship).
+        Samples that disagree with it are dropped. Observing the same shot
+        again is a no-op.
+        """
+        bit = 1 << (coord[0] * self.cols + coord[1])
+        sunk = isinstance(result, tuple) and result[0] == "sunk"
+        if not self.shot & bit:
+            self.shot |= bit
+            if result == "miss":
+                self.blocked |= bit
+                self.samples = [s for s in self.samples if not any(m & bit for m in s)]
+            else:
+                self.hits |= bit
+                shot = self.shot
+                # Keep samples with a ship here that still has an unshot cell
+                # (unless the shot sank it; _sink() checks that case)
+                self.samples = [s for s in self.samples
+                                if any(m & bit and (sunk or m & ~shot) for m in s)]
+        if sunk:
+            self._sink(result[1])
+
+    def _sink(self, ship):
+        if ship in self.sunk:
+            return
+        self.sunk.add(ship)
+        mask = 0
+        for r, c in ship.positions:
+            mask |= 1 << (r * self.cols + c)
+        self.hits &= ~mask
+        self.blocked |= mask
+
+        if ship.size not in self.sizes:
+            # Not part of the expected fleet; nothing known to drop
+            self.samples = []
+            return
+        index = self.sizes.index(ship.size)
+        del self.sizes[index]
+        kept = []
+        for sample in self.samples:
+            if mask in sample:
+                i = sample.index(mask)
+                kept.append(sample[:i] + sample[i + 1:])
+        self.samples = kept
+
+    def _top_up(self, deadline):
+        # Draw samples until there are `target` of them or the deadline
+        # passes, yielding each new batch as it arrives
+        need = self.target - len(self.samples)
+        if need <= 0 or not self.sizes:
+            return
+        start = time.perf_counter()
+        args = (self.rows, self.cols, self.sizes, self.blocked, self.hits, self.shot)
+        pool = _pool(self.workers)
+        try:
+            if pool is None:
+                while need > 0:
+                    left = deadline - time.perf_counter()
+                    if left <= 0:
+                        break
+                    batch, _ = draw_samples(*args, min(need, BATCH), left, self.rng.getrandbits(64))
+                    need -= len(batch)
+                    yield batch
+            else:
+                share = -(-need // self.workers)
+                budget = max(0.0, deadline - time.perf_counter())
+                futures = [pool.submit(_draw_job, args + (share, budget, self.rng.getrandbits(64)))
+                           for _ in range(self.workers)]
+                try:
+                    for future in as_completed(futures, timeout=budget + GRACE):
+                        yield future.result()[0]
+                except TimeoutError:
+                    pass
+        finally:
+            self.sample_time += time.perf_counter() - start
+
+    def refine(self, deadline=None):
+        """
+        Anytime best_cell(): yields the best cell found so far after every
+        batch of samples is counted, until the target number of samples is
+        reached or `deadline` (a time.perf_counter() value, by default the
+        sampler's budget from now) passes. The first cell comes right away.
+        The move's counters are reset as soon as refine() is called, even if
+        no cell is ever taken from it.
+        """
+        start = time.perf_counter()
+        if deadline is None:
+            deadline = start + self.budget
+        self.moves += 1
+        self.reused += len(self.samples)
+        self.counted = 0
+        self.complete = False
+        return self._refine(start, deadline)
+
+    def _refine(self, start, deadline):
+        counts = [0] * (self.rows * self.cols)
+        unshot = [i for i in range(self.rows * self.cols) if not self.shot >> i & 1]
+        try:
+            # Samples kept from earlier moves, then freshly drawn ones
+            kept = self.samples
+            for i in range(0, max(len(kept), 1), BATCH):
+                self._count(kept[i:i + BATCH], counts)
+                yield self._pick(counts, unshot)
+            for batch in self._top_up(deadline):
+                self.samples += batch
+                self.drawn += len(batch)
+                self._count(batch, counts)
+                yield self._pick(counts, unshot)
+        finally:
+            self.complete = self.counted == len(self.samples) and (
+                len(self.samples) >= self.target or not self.sizes)
+            self.latencies.append(time.perf_counter() - start)
+
+    def best_cell(self):
+        # Unshot cell occupied in the most samples, ties broken at random
+        cell = None
+        for cell in self.refine():
+            pass
+        return cell
+
+    def _count(self, samples, counts):
+        # Add how often each unshot cell is occupied in `samples`
+        unshot = ~self.shot
+        for sample in samples:
+            union = 0
+            for mask in sample:
+                union |= mask
+            union &= unshot
+            while union:
+                low = union & -union
+                counts[low.bit_length() - 1] += 1
+                union ^= low
+        self.counted += len(samples)
+
+    def _pick(self, counts, unshot):
+        best = max((counts[i] for i in unshot), default=0)
+        # With no samples every unshot cell ties, so this is a random shot
+        candidates = [i for i in unshot if counts[i] == best]
+        return divmod(candidates[self.rng.randrange(len(candidates))], self.cols)
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        return {
+            "moves": self.moves,
+            "samples_drawn": self.drawn,
+            "samples_reused": self.reused,
+            "samples_per_second": round(self.drawn / self.sample_time, 1) if self.sample_time else 0.0,
+            "move_ms_mean": round(1e3 * sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "move_ms_max": round(1e3 * latencies[-1], 2) if latencies else 0.0,
+        }
@@ -0,0 +1,232 @@
+# Title: Opening Book
+# Author: Nathan Vallad
+# Date: 12/22/2025
+# Purpose: Precomputed first shots of the hard AI (probability density, see
+# density.py) for a board size and fleet. Every position reachable in the
+# first `depth` shots (any hit/miss outcome, every tied best cell) is stored
+# with its best cells, so hard and expert AIs can open without searching.
+# Positions that are mirror images or rotations of each other are stored
+# once. Books are built with this module's CLI and memory-mapped on first use:
+#
+#   python opening_book.py [--rows 10 --cols 10] [--fleet 5,4,3,3,2] [--depth 8]
+#
+# A position is the shot and hit masks of the opponent's board (bit
+# r * cols + c, as in Board) while no ship has been sunk; after the first
+# sinking the AI always searches.
+#
+# Layout (little endian):
+#   header  "BOOK" version:u8 rows:u16 cols:u16 depth:u8 ships:u8 count:u32
+#           size:u8 per ship
+#   record  shot_mask hit_mask cells:u8 offset:u32   (sorted by the masks)
+#           masks are ceil(rows*cols / 8) bytes each
+#   cells   u16 cell indices; a record's best cells start at its offset
+
+import argparse
+import mmap
+import os
+import struct
+from functools import lru_cache
+
+from game_logic import DEFAULT_SHIPS
+
+VERSION = 1
+DEPTH = 8
+BOOK_DIR = os.environ.get("BATTLESHIP_BOOKS",
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), "books"))
+
+HEADER = struct.Struct("<4sBHHBBI")
+RECORD_TAIL = struct.Struct("<BI")
+CELL = struct.Struct("<H")
+
+
+def book_path(rows, cols, sizes):
+    fleet = "-".join(str(size) for size in sorted(sizes, reverse=True))
+    return os.path.join(BOOK_DIR, f"{rows}x{cols}_{fleet}.book")
+
+
+def _symmetries(rows, cols):
+    # Cell permutations mapping the board onto itself: flips and the
+    # 180 degree turn, plus transposes and quarter turns on square boards
+    maps = [lambda r, c: (r, c),
+            lambda r, c: (rows - 1 - r, c),
+            lambda r, c: (r, cols - 1 - c),
+            lambda r, c: (rows - 1 - r, cols - 1 - c)]
+    if rows == cols:
+        maps += [lambda r, c: (c, r),
+                 lambda r, c: (cols - 1 - c, r),
+                 lambda r, c: (c, rows - 1 - r),
+                 lambda r, c: (cols - 1 - c, rows - 1 - r)]
+    perms = []
+    for f in maps:
+        perm = [0] * (rows * cols)
+        for cell in range(rows * cols):
+            r, c = f(*divmod(cell, cols))
+            perm[cell] = r * cols + c
+        perms.append(perm)
+    return perms
+
+
+def _map_mask(perm, mask):
+    out = 0
+    while mask:
+        low = mask & -mask
+        out |= 1 << perm[low.bit_length() - 1]
+        mask ^= low
+    return out
+
+
+def _canonical(perms, size, shot_mask, hit_mask):
+    # (key, perm index) of the smallest key among the position's symmetric images
+    best = None
+    for index, perm in enumerate(perms):
+        key = (_map_mask(perm, shot_mask).to_bytes(size, "little")
+               + _map_mask(perm, hit_mask).to_bytes(size, "little"))
+        if best is None or key < best[0]:
+            best = (key, index)
+    return best
+
+
+class OpeningBook:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.rows, self.cols, self.depth, ships, self.count = \
+            HEADER.unpack_from(self._mmap, 0)
+        if magic != b"BOOK" or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"Not a version {VERSION} opening book: {path}")
+        self.sizes = tuple(self._mmap[HEADER.size:HEADER.size + ships])
+        self._mask_bytes = (self.rows * self.cols + 7) // 8
+        self._key_size = 2 * self._mask_bytes
+        self._record_size = self._key_size + RECORD_TAIL.size
+        self._records = HEADER.size + ships
+        self._cells = self._records + self.count * self._record_size
+        self._perms = _symmetries(self.rows, self.cols)
+        self._inverse = []
+        for perm in self._perms:
+            inverse = [0] * len(perm)
+            for cell, image in enumerate(perm):
+                inverse[image] = cell
+            self._inverse.append(inverse)
+
+    def lookup(self, shot_mask, hit_mask):
+        """
+        Best cells [(row, col), ...] for the position, or None if it is not
+        in the book. Any of them is the hard AI's choice there.
+        """
+        if bin(shot_mask).count("1") >= self.depth:
+            return None
+        key, index = _canonical(self._perms, self._mask_bytes, shot_mask, hit_mask)
+
+        # Binary search over the sorted records
+        data = self._mmap
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._records + mid * self._record_size
+            probe = data[start:start + self._key_size]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                count, offset = RECORD_TAIL.unpack_from(data, start + self._key_size)
+                inverse = self._inverse[index]
+                base = self._cells + offset * CELL.size
+                return [divmod(inverse[CELL.unpack_from(data, base + i * CELL.size)[0]], self.cols)
+                        for i in range(count)]
+        return None
+
+    def close(self):
+        self._mmap.close()
+
+
+@lru_cache(maxsize=None)
+def get_book(rows, cols, sizes):
+    """The OpeningBook for this board and fleet (sizes as a tuple), or None if none was built."""
+    path = book_path(rows, cols, sizes)
+    if not os.path.exists(path):
+        return None
+    return OpeningBook(path)
+
+
+def build(rows=10, cols=10, sizes=None, depth=DEPTH):
+    """
+    Best cells of the hard AI for every position reachable in its first
+    `depth` shots. Returns {canonical key: [cell, ...]}.
+    """
+    import numpy as np
+    from density import DensityTargeter
+
+    sizes = sorted(sizes or [size for _, size in DEFAULT_SHIPS], reverse=True)
+    perms = _symmetries(rows, cols)
+    mask_bytes = (rows * cols + 7) // 8
+    book = {}
+    level = {_canonical(perms, mask_bytes, 0, 0)[0]: (0, 0)}
+    for _ in range(depth):
+        following = {}
+        for key, (shot_mask, hit_mask) in level.items():
+            targeter = DensityTargeter(rows, cols, sizes)
+            cells = shot_mask
+            while cells:
+                low = cells & -cells
+                cells ^= low
+                cell = low.bit_length() - 1
+                targeter.observe(divmod(cell, cols), "hit" if hit_mask & low else "miss")
+            score = targeter.scores()
+            best = [int(cell) for cell in np.flatnonzero(score == score.max())]
+            if len(best) > 255:
+                continue
+            book[key] = best
+
+            for cell in best:
+                for hit in (0, 1 << cell):
+                    shot, hits = shot_mask | 1 << cell, hit_mask | hit
+                    child, index = _canonical(perms, mask_bytes, shot, hits)
+                    if child not in book and child not in following:
+                        following[child] = (_map_mask(perms[index], shot), _map_mask(perms[index], hits))
+        level = following
+    return book
+
+
+def write(path, rows, cols, sizes, depth, book):
+    sizes = sorted(sizes, reverse=True)
+    out = bytearray(HEADER.pack(b"BOOK", VERSION, rows, cols, depth, len(sizes), len(book)))
+    out += bytes(sizes)
+    cells = bytearray()
+    offset = 0
+    for key in sorted(book):
+        best = book[key]
+        out += key + RECORD_TAIL.pack(len(best), offset)
+        for cell in best:
+            cells += CELL.pack(cell)
+        offset += len(best)
+    out += cells
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(out)
+    os.replace(tmp, path)
+    return len(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the opening book for a board and fleet")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--fleet", default=",".join(str(size) for _, size in DEFAULT_SHIPS),
+                        help="comma separated ship sizes")
+    parser.add_argument("--depth", type=int, default=DEPTH, help="opening shots to cover")
+    parser.add_argument("--out", help="book file (default: the path the AI looks in)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.fleet.split(",")]
+    path = args.out or book_path(args.rows, args.cols, sizes)
+    book = build(args.rows, args.cols, sizes, args.depth)
+    size = write(path, args.rows, args.cols, sizes, args.depth, book)
+    print(f"{path}: {len(book)} positions, {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Title: Placement Tables
+# Author: Nathan Vallad
+# Date: 12/12/2025
+# Purpose: Precompute every legal placement of a ship size on a board as a
+# bitmask (bit r * cols + c is cell (r, c), matching Board). Tables are cached
+# per (rows, cols, size), so repeated games reuse them for free.
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def line_mask(size, stride):
+    # Bit pattern for `size` cells spaced `stride` bits apart, anchored at bit 0.
+    # stride 1 is a horizontal run, stride == cols is a vertical run.
+    mask = 0
+    for i in range(size):
+        mask |= 1 << (i * stride)
+    return mask
+
+
+class PlacementTable:
+    __slots__ = ("masks", "placements", "lookup")
+
+    def __init__(self, rows, cols, size):
+        self.masks = []        # Bitmask of each legal placement
+        self.placements = []   # ((row, col), direction), parallel to masks
+        self.lookup = {}       # (row, col, direction) -> mask, legal placements only
+
+        for direction, stride, max_r, max_c in (('H', 1, rows, cols - size + 1),
+                                                ('V', cols, rows - size + 1, cols)):
+            pattern = line_mask(size, stride)
+            for r in range(max_r):
+                for c in range(max_c):
+                    mask = pattern << (r * cols + c)
+                    self.masks.append(mask)
+                    self.placements.append(((r, c), direction))
+                    self.lookup[(r, c, direction)] = mask
+
+        self.masks = tuple(self.masks)
+        self.placements = tuple(self.placements)
+
+    def mask(self, start, direction) -> int:
+        # Bitmask of the placement, or 0 if it would leave the board
+        return self.lookup.get((start[0], start[1], direction), 0)
+
+    def free(self, occupied):
+        # Indices of the placements that don't overlap the occupied mask
+        return [i for i, mask in enumerate(self.masks) if not mask & occupied]
+
+    def draw(self, occupied, rng, tries=8):
+        """
+        Index of a uniformly random placement that doesn't overlap `occupied`,
+        or None if there is none. A few direct draws are tried first (on a
+        sparse board they almost always fit), then the table is filtered.
+        Both give the same uniform distribution over the free placements.
+        """
+        masks = self.masks
+        if not masks:
+            return None
+        for _ in range(tries):
+            i = rng.randrange(len(masks))
+            if not masks[i] & occupied:
+                return i
+        free = self.free(occupied)
+        return rng.choice(free) if free else None
+
+
+@lru_cache(maxsize=None)
+def placement_table(rows, cols, size) -> PlacementTable:
+    return PlacementTable(rows, cols, size)
@@ -9,25 +9,29 @@ from board import Board
 from ship import Ship
 
 class Player:
+    __slots__ = ("name", "is_ai", "board", "ai")
+
     def __init__(self, name: str, board: Board, is_ai=False):
         # Initialize a player with a name and their board.
         self.name = name
         self.is_ai = is_ai      # Indicates if this player is controlled by AI
         self.board = board
-        self.ships = []
+        self.ai = None          # AI controller, set by the caller for AI players
+
+    @property
+    def ships(self):
+        # The board already owns the placed ships; don't keep a second list.
+        return self.board.ships
 
     def add_ship(self, ship: Ship, start: tuple, direction: str) -> bool:
         # Request the board to place a ship.
         # Returns True if placement succeeds, False if invalid.
-        if self.board.place_ship(ship, start, direction):
-            self.ships.append(ship)
-            return True
-        return False
+        return self.board.place_ship(ship, start, direction)
 
-    def fire_at(self, opponent_board: Board, coord: tuple) -> str:
+    def fire_at(self, opponent_board: Board, coord: tuple):
         # Fire a shot at an opponent’s board.
-        # Returns 'hit', 'miss', 'repeat', 'invalid', or 'sunk:<ship name>'.
-        return opponent_board.take_shot(coord)
+        # Returns "hit", "miss", or ("sunk", ship), like Board.take_shot().
+        return opponent_board.take_shot(*coord)
 
     def has_lost(self) -> bool:
         # Returns True if all the player's ships are sunk.
@@ -1,8 +1,11 @@
+import rules
+
+
 class PvPHandler:
     """
     Pure controller for PvP mode.
     Main.py supplies Player objects & Boards.
-    This file does NOT import anything from the project.
+    The rules come from rules.py; this class only tracks the game.
     """
 
     def __init__(self, player1, player2):
@@ -10,6 +13,7 @@ class PvPHandler:
         self.current_turn = 0  # index of current player
         self.game_over = False
         self.winner = None
+        self.replay = None  # Optional recorder with shot(attacker, row, col, result)
 
     def get_current_player(self):
         return self.players[self.current_turn]
@@ -19,18 +23,17 @@ class PvPHandler:
 
     def fire(self, row, col):
         """Current player fires at the opponent."""
-        attacker = self.get_current_player()
-        defender = self.get_opponent()
+        attacker_idx = self.current_turn
+        result, game_over = rules.fire(self, attacker_idx, row, col)
 
-        # defender.board MUST implement take_shot()
-        result = defender.board.take_shot(row, col)
+        if self.replay is not None:
+            self.replay.shot(attacker_idx, row, col, result)
+        return result, game_over  # hit/miss/sunk, game over
 
-        # Check for loss (Board must track remaining ships)
-        if defender.board.all_ships_sunk():
-            self.game_over = True
-            self.winner = attacker
-            return result, True  # hit/miss, game_over
+    # Game storage for the rules engine (see rules.py)
+    def board(self, idx):
+        return self.players[idx].board
 
-        # Switch turns only on valid result
-        self.current_turn = 1 - self.current_turn
-        return result, False  # hit/miss, not game over
+    def end_game(self, winner):
+        self.game_over = True
+        self.winner = self.players[winner]
@@ -0,0 +1,280 @@
+# Title: PvP Network Server
+# Author: Nathan Vallad
+# Date: 12/14/2025
+# Purpose: Host many PvP games over TCP in one asyncio process. Each game is a
+# PvPHandler with two Players, so the rules are the same as local PvP. No
+# pygame is imported.
+#
+# Example:
+#   python pvp_server.py --port 8765 [--replay games.replay]
+#
+# Protocol: one ASCII line per message, fields separated by single spaces.
+#   client -> server
+#     JOIN [room]          pair with the next waiting client (or the same room)
+#     PLACE row col H|V    place the next ship of the fleet
+#     FIRE row col         shoot at the opponent (on your turn)
+#     STATE                snapshot of the game as you see it, e.g. to resync
+#     QUIT
+#   server -> client
+#     WAIT                 queued until an opponent joins
+#     START idx rows cols sizes  paired: your player index, board size and
+#                          fleet sizes like 5,4,3,3,2
+#     OK                   placement accepted
+#     GO turn              both fleets placed, index of the player to move
+#     R row col code [ship]  result of your shot
+#     O row col code [ship]  the opponent's shot at you
+#     END winner           game over, winner index
+#     STATE turn board shots hits  your board as serialization.dumps() bytes
+#                          (your ships and the shots taken at them), then your
+#                          shot and hit masks on the opponent board, all in hex
+#     BYE                  the opponent left
+#     ERR reason
+#   code is H (hit), M (miss), S (sunk, followed by the ship name) or W (win).
+
+import argparse
+import asyncio
+import itertools
+
+from board import Board
+from game_logic import DEFAULT_SHIPS
+from player import Player
+from pvp_handler import PvPHandler
+from serialization import dumps
+from ship import Ship
+
+DEFAULT_PORT = 8765
+
+
+def result_code(result, game_over):
+    # PvPHandler result -> (code, ship name or None)
+    if game_over:
+        return "W", result[1].name if isinstance(result, tuple) else None
+    if isinstance(result, tuple):
+        return "S", result[1].name
+    return ("H" if result == "hit" else "M"), None
+
+
+def format_shot(prefix, row, col, code, name):
+    if name:
+        return f"{prefix} {row} {col} {code} {name}\n"
+    return f"{prefix} {row} {col} {code}\n"
+
+
+class PvPSession:
+    """One game: a PvPHandler plus the two connections playing it."""
+
+    __slots__ = ("id", "handler", "writers", "fleets", "placed", "started")
+
+    def __init__(self, session_id, rows, cols, fleet):
+        self.id = session_id
+        players = [Player(f"Player {i + 1}", Board(rows, cols)) for i in (0, 1)]
+        self.handler = PvPHandler(players[0], players[1])
+        self.writers = [None, None]
+        self.fleets = [[Ship(name, size) for name, size in fleet] for _ in (0, 1)]
+        self.placed = [0, 0]
+        self.started = False   # Both fleets placed
+
+    def send(self, idx, line):
+        writer = self.writers[idx]
+        if writer is not None and not writer.is_closing():
+            writer.write(line.encode())
+
+    def place(self, idx, row, col, direction):
+        if self.placed[idx] >= len(self.fleets[idx]):
+            return "ERR placed"
+        ship = self.fleets[idx][self.placed[idx]]
+        if not self.handler.players[idx].add_ship(ship, (row, col), direction):
+            return "ERR placement"
+        self.placed[idx] += 1
+        if all(count == len(fleet) for count, fleet in zip(self.placed, self.fleets)):
+            self.started = True
+            go = f"GO {self.handler.current_turn}\n"
+            self.send(1 - idx, go)
+            return "OK\n" + go.rstrip("\n")
+        return "OK"
+
+    def fire(self, idx, row, col):
+        handler = self.handler
+        if not self.started or handler.game_over:
+            return "ERR state"
+        if handler.current_turn != idx:
+            return "ERR turn"
+        board = handler.get_opponent().board
+        if not board.in_bounds(row, col):
+            return "ERR bounds"
+
+        result, game_over = handler.fire(row, col)
+        code, name = result_code(result, game_over)
+        self.send(1 - idx, format_shot("O", row, col, code, name))
+        reply = format_shot("R", row, col, code, name).rstrip("\n")
+        if game_over:
+            self.send(1 - idx, f"END {idx}\n")
+            reply += f"\nEND {idx}"
+        return reply
+
+    def state(self, idx):
+        # Only what this player may know: its own board in full, and where it
+        # has shot and hit on the opponent's (not the opponent's ships)
+        players = self.handler.players
+        opponent = players[1 - idx].board
+        return (f"STATE {self.handler.current_turn} {dumps(players[idx].board).hex()} "
+                f"{opponent.shot_mask:x} {opponent.hit_mask:x}")
+
+
+class PvPServer:
+    def __init__(self, rows=10, cols=10, fleet=DEFAULT_SHIPS, replay=None):
+        self.rows = rows
+        self.cols = cols
+        self.fleet = tuple(fleet)
+        self.replay = replay    # Optional replay.ReplayWriter recording every game
+        self.sessions = {}      # id -> PvPSession
+        self.waiting = {}       # room -> (session, writer) waiting for a second player
+        self._ids = itertools.count(1)
+
+        # Counters
+        self.connections = 0
+        self.games_started = 0
+        self.games_finished = 0
+        self.shots = 0
+
+    def _join(self, room, writer):
+        # Returns (session, player index)
+        pending = self.waiting.pop(room, None)
+        if pending is not None and not pending[1].is_closing():
+            session = pending[0]
+            session.writers[1] = writer
+            self.games_started += 1
+            return session, 1
+        session = PvPSession(next(self._ids), self.rows, self.cols, self.fleet)
+        session.writers[0] = writer
+        if self.replay is not None:
+            self.replay.attach(session.handler)
+        self.sessions[session.id] = session
+        self.waiting[room] = (session, writer)
+        return session, 0
+
+    def _start_line(self, session, idx):
+        sizes = ",".join(str(size) for _, size in self.fleet)
+        return f"START {idx} {self.rows} {self.cols} {sizes}\n"
+
+    def _leave(self, session, idx, room):
+        if session is None:
+            return
+        session.writers[idx] = None
+        if self.waiting.get(room, (None,))[0] is session:
+            del self.waiting[room]
+        if session.id in self.sessions:
+            del self.sessions[session.id]
+            if session.handler.replay is not None:
+                session.handler.replay.finish()
+            if session.handler.game_over:
+                self.games_finished += 1
+            else:
+                session.send(1 - idx, "BYE\n")
+
+    async def handle(self, reader, writer):
+        """Serve one connection until it quits or disconnects."""
+        self.connections += 1
+        session = None
+        idx = 0
+        room = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.split()
+                if not parts:
+                    continue
+                command = parts[0]
+                reply = None
+
+                try:
+                    if command == b"FIRE" and session is not None and len(parts) == 3:
+                        reply = session.fire(idx, int(parts[1]), int(parts[2]))
+                        if not reply.startswith("ERR"):
+                            self.shots += 1
+                    elif command == b"STATE" and session is not None and len(parts) == 1:
+                        reply = session.state(idx)
+                    elif command == b"PLACE" and session is not None and len(parts) == 4:
+                        direction = parts[3].decode()
+                        if direction not in ("H", "V"):
+                            reply = "ERR direction"
+                        else:
+                            reply = session.place(idx, int(parts[1]), int(parts[2]), direction)
+                    elif command == b"JOIN" and session is None:
+                        room = parts[1].decode() if len(parts) > 1 else ""
+                        session, idx = self._join(room, writer)
+                        if idx == 0:
+                            reply = "WAIT"
+                        else:
+                            session.send(0, self._start_line(session, 0))
+                            reply = self._start_line(session, 1).rstrip("\n")
+                    elif command == b"QUIT":
+                        break
+                    else:
+                        reply = "ERR command"
+                except ValueError:
+                    reply = "ERR syntax"
+
+                if reply:
+                    writer.write(reply.encode() + b"\n")
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._leave(session, idx, room)
+            if not writer.is_closing():
+                writer.close()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, backlog=4096):
+        return await asyncio.start_server(self.handle, host, port, backlog=backlog)
+
+    def stats(self):
+        return {
+            "connections": self.connections,
+            "live_sessions": len(self.sessions),
+            "games_started": self.games_started,
+            "games_finished": self.games_finished,
+            "shots": self.shots,
+        }
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, rows=10, cols=10, ready=None,
+                replay_path=None):
+    """Run a server until cancelled. `ready` (optional) is set once listening."""
+    replay = None
+    if replay_path is not None:
+        from replay import ReplayWriter
+        replay = ReplayWriter(replay_path)
+    server = PvPServer(rows, cols, replay=replay)
+    listener = await server.start(host, port)
+    if ready is not None:
+        ready.set()
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        if replay is not None:
+            replay.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Battleship PvP server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--replay", metavar="PATH", help="append every game to a replay log")
+    args = parser.parse_args(argv)
+
+    print(f"Listening on {args.host}:{args.port}")
+    try:
+        asyncio.run(serve(args.host, args.port, args.rows, args.cols, replay_path=args.replay))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    main()
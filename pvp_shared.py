@@ -2,20 +2,36 @@
 """
 Shared state for multi-window PvP.
 Both windows read/write to the same dicts managed by multiprocessing.Manager.
+fire_shared / place_ship_shared also accept a pvp_shm.SharedPvPState, which
+keeps the same state in a shared memory block instead. Either way the
+rules come from rules.py.
+
+Writers bump a StateChannel version after every change; each window keeps a
+StateMirror that copies the shared state only when that version moves.
 """
 
-def init_shared_state():
+import multiprocessing
+
+import rules
+from pvp_shm import SharedPvPState
+from ship import Ship
+
+def init_shared_state(rows=10, cols=10):
     """
     Returns a dict of shared state that will be managed by multiprocessing.Manager.
     Structure:
     {
         'player1_name': str,
         'player2_name': str,
+        'rows': int,
+        'cols': int,
         'current_turn': int (0 or 1),
         'game_over': bool,
         'winner': str or None,
         'player1_board_grid': list of lists,
         'player2_board_grid': list of lists,
+        'player1_cell_index': flat list (rows*cols) of ship indices, -1 if empty,
+        'player2_cell_index': flat list (rows*cols) of ship indices, -1 if empty,
         'player1_ships': list of dicts,
         'player2_ships': list of dicts,
         'player1_placement_done': bool,
@@ -25,11 +41,15 @@ def init_shared_state():
     return {
         'player1_name': 'Player 1',
         'player2_name': 'Player 2',
+        'rows': rows,
+        'cols': cols,
         'current_turn': 0,
         'game_over': False,
         'winner': None,
-        'player1_board_grid': [["~" for _ in range(10)] for _ in range(10)],
-        'player2_board_grid': [["~" for _ in range(10)] for _ in range(10)],
+        'player1_board_grid': [["~" for _ in range(cols)] for _ in range(rows)],
+        'player2_board_grid': [["~" for _ in range(cols)] for _ in range(rows)],
+        'player1_cell_index': [-1] * (rows * cols),
+        'player2_cell_index': [-1] * (rows * cols),
         'player1_ships': [],
         'player2_ships': [],
         'player1_placement_done': False,
@@ -37,55 +57,123 @@ def init_shared_state():
     }
 
 
+class _ManagerBoard:
+    """
+    One player's board from a Manager dict, as board storage for rules.py.
+    Every read of the dict is an IPC round-trip returning a copy, so the
+    lists are fetched once, changed locally and written back by commit().
+    """
+
+    def __init__(self, shared_state, player_idx):
+        prefix = f'player{player_idx + 1}_'
+        self.grid_key = prefix + 'board_grid'
+        self.ships_key = prefix + 'ships'
+        self.index_key = prefix + 'cell_index'
+        self.grid = shared_state[self.grid_key]
+        self.ship_list = shared_state[self.ships_key]
+        self.cell_index = shared_state[self.index_key]
+        self.rows = len(self.grid)
+        self.cols = len(self.grid[0]) if self.grid else 0
+        self.placed = False
+
+    def occupied(self, mask):
+        while mask:
+            low = mask & -mask
+            if self.cell_index[low.bit_length() - 1] != -1:
+                return True
+            mask ^= low
+        return False
+
+    def add_ship(self, ship, start, direction, mask):
+        ship.place(start, direction)
+        ship_id = len(self.ship_list)
+        self.ship_list.append({
+            'name': ship.name,
+            'size': ship.size,
+            'positions': ship.positions,
+            'hits': [],
+        })
+        for r, c in ship.positions:
+            self.grid[r][c] = "S"
+            self.cell_index[r * self.cols + c] = ship_id
+        self.placed = True
+        return True
+
+    def mark_shot(self, cell):
+        r, c = divmod(cell, self.cols)
+        if self.grid[r][c] in ("X", "O"):
+            return rules.REPEAT
+        ship_id = self.cell_index[cell]
+        self.grid[r][c] = "X" if ship_id >= 0 else "O"
+        return ship_id
+
+    def add_hit(self, ship_id, cell):
+        ship = self.ship_list[ship_id]
+        ship['hits'].append(divmod(cell, self.cols))
+        return len(ship['hits']) == ship['size']
+
+    def ship(self, ship_id):
+        data = self.ship_list[ship_id]
+        positions = data['positions']
+        vertical = len(positions) > 1 and positions[1][0] != positions[0][0]
+        ship = Ship(data['name'], data['size'])
+        ship.place(positions[0], 'V' if vertical else 'H')
+        for pos in data['hits']:
+            ship.register_hit(pos)
+        return ship
+
+    def all_ships_sunk(self):
+        return all(len(s['hits']) == s['size'] for s in self.ship_list)
+
+    def commit(self, shared_state):
+        # CRITICAL: Reassign to trigger Manager sync (nested list changes don't auto-sync)
+        shared_state[self.grid_key] = self.grid
+        shared_state[self.ships_key] = self.ship_list
+        if self.placed:
+            shared_state[self.index_key] = self.cell_index
+
+
+class _ManagerGame:
+    # Game storage for rules.fire() over a Manager dict; commit() writes it back
+    def __init__(self, shared_state, defender_idx):
+        self.shared_state = shared_state
+        self.defender = _ManagerBoard(shared_state, defender_idx)
+        self.updates = {}
+
+    def board(self, idx):
+        return self.defender
+
+    @property
+    def current_turn(self):
+        return self.updates.get('current_turn', self.shared_state['current_turn'])
+
+    @current_turn.setter
+    def current_turn(self, idx):
+        self.updates['current_turn'] = idx
+
+    def end_game(self, winner):
+        self.updates['game_over'] = True
+        self.updates['winner'] = self.shared_state[f'player{winner + 1}_name']
+
+    def commit(self):
+        self.defender.commit(self.shared_state)
+        for key, value in self.updates.items():
+            self.shared_state[key] = value
+
+
 def fire_shared(shared_state, attacker_idx, row, col):
     """
-    Simulate a shot in shared state.
+    Simulate a shot in shared state (same rules as Board, see rules.py).
     attacker_idx: 0 for Player 1, 1 for Player 2.
-    Returns: ("hit" | "miss" | "sunk:<name>", game_over)
+    Returns: ("hit" | "miss" | ("sunk", ship), game_over)
     """
-    defender_idx = 1 - attacker_idx
-    defender_board_key = f'player{defender_idx + 1}_board_grid'
-    defender_ships_key = f'player{defender_idx + 1}_ships'
-    defender_board = shared_state[defender_board_key]
-    defender_ships = shared_state[defender_ships_key]
-    
-    cell = defender_board[row][col]
-    # Already hit
-    if cell in ["X", "O"]:
-        # Reassign before returning (might be unnecessary but safe)
-        shared_state[defender_board_key] = defender_board
-        shared_state[defender_ships_key] = defender_ships
-        return "miss", False
-    # Check for ship hit
-    for ship in defender_ships:
-        if (row, col) in ship['positions']:
-            ship['hits'].append((row, col))
-            defender_board[row][col] = "X"
-            # End turn on hit
-            shared_state['current_turn'] = defender_idx
-            if len(ship['hits']) == ship['size']:
-                # Sunk
-                all_sunk = all(len(s['hits']) == s['size'] for s in defender_ships)
-                if all_sunk:
-                    shared_state['game_over'] = True
-                    shared_state['winner'] = shared_state[f'player{attacker_idx + 1}_name']
-                    shared_state[defender_board_key] = defender_board
-                    shared_state[defender_ships_key] = defender_ships
-                    return (f"sunk", ship['name']), True
-                else:
-                    shared_state[defender_board_key] = defender_board
-                    shared_state[defender_ships_key] = defender_ships
-                    return (f"sunk", ship['name']), False
-            # Persist changes and return hit
-            shared_state[defender_board_key] = defender_board
-            shared_state[defender_ships_key] = defender_ships
-            return "hit", False
-    # Miss
-    defender_board[row][col] = "O"
-    shared_state['current_turn'] = defender_idx
-    shared_state[defender_board_key] = defender_board
-    shared_state[defender_ships_key] = defender_ships
-    return "miss", False
+    if isinstance(shared_state, SharedPvPState):
+        return shared_state.fire(attacker_idx, row, col)
+
+    game = _ManagerGame(shared_state, 1 - attacker_idx)
+    result = rules.fire(game, attacker_idx, row, col)
+    game.commit()
+    return result
 
 
 def place_ship_shared(shared_state, player_idx, ship_name, size, start, direction):
@@ -93,40 +181,73 @@ def place_ship_shared(shared_state, player_idx, ship_name, size, start, directio
     Place a ship in shared state.
     Returns: True if successful, False if invalid.
     """
-    row, col = start
-    board_key = f'player{player_idx + 1}_board_grid'
-    ships_key = f'player{player_idx + 1}_ships'
-    board = shared_state[board_key]
-    ships = shared_state[ships_key]
-    
-    # Generate positions
-    positions = []
-    for i in range(size):
-        r = row + (i if direction == 'V' else 0)
-        c = col + (i if direction == 'H' else 0)
-        if r >= 10 or c >= 10:
-            return False
-        positions.append((r, c))
-    # Check collision
-    for r, c in positions:
-        if board[r][c] != "~":
-            return False
-        for other_ship in ships:
-            if (r, c) in other_ship['positions']:
-                return False
-    # Place ship
-    ship = {
-        'name': ship_name,
-        'size': size,
-        'positions': positions,
-        'hits': [],
-    }
-    ships.append(ship)
-    for r, c in positions:
-        board[r][c] = "S"
-    
-    # CRITICAL: Reassign to trigger Manager sync (nested list changes don't auto-sync)
-    shared_state[board_key] = board
-    shared_state[ships_key] = ships
-    
+    if isinstance(shared_state, SharedPvPState):
+        return shared_state.place_ship(player_idx, ship_name, size, start, direction)
+
+    board = _ManagerBoard(shared_state, player_idx)
+    if not rules.place(board, Ship(ship_name, size), start, direction):
+        return False
+    board.commit(shared_state)
     return True
+
+
+class StateChannel:
+    """
+    Monotonically increasing state version plus a Condition to wait on it.
+    The version lives in shared memory, so checking it costs no IPC.
+    Create it in the parent and pass it to the window processes.
+    """
+
+    def __init__(self, ctx=multiprocessing):
+        self._version = ctx.Value('Q', 0, lock=False)
+        self._changed = ctx.Condition()
+
+    @property
+    def version(self):
+        return self._version.value
+
+    def publish(self):
+        # Call after every write to the shared state
+        with self._changed:
+            self._version.value += 1
+            self._changed.notify_all()
+
+    def wait(self, seen, timeout=None):
+        """
+        Block until the version differs from `seen` or timeout expires.
+        Returns the current version.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._version.value != seen, timeout)
+            return self._version.value
+
+
+class StateMirror:
+    """
+    Process-local copy of the shared state (Manager dict or SharedPvPState).
+    refresh() re-reads it only when the channel version has changed, so an
+    idle frame makes no shared state calls at all.
+    """
+
+    def __init__(self, shared_state, channel):
+        self.shared_state = shared_state
+        self.channel = channel
+        self.version = None
+        self.data = {}
+
+    def refresh(self):
+        # Returns True if the local copy was updated
+        version = self.channel.version
+        if version == self.version:
+            return False
+        self.data = dict(self.shared_state.copy())
+        self.version = version
+        return True
+
+    def publish(self):
+        # Announce a local write to the other window and pick it up here
+        self.channel.publish()
+        self.refresh()
+
+    def __getitem__(self, key):
+        return self.data[key]
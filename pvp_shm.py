@@ -0,0 +1,301 @@
+# pvp_shm.py
+"""
+Shared-memory backend for multi-window PvP.
+Both grids, the cell -> ship indices and the ship hit counters live in one
+multiprocessing.shared_memory block. Each window process maps the same block:
+reads go straight to the buffer and a shot writes single bytes in place, so
+nothing is pickled or sent through a Manager.
+
+SharedPvPState can be used wherever pvp_shared's Manager dict is used:
+it supports the same keys through [] and pvp_shared.fire_shared /
+place_ship_shared dispatch to its fire() / place_ship() methods. The rules
+themselves come from rules.py; this module is only their storage.
+
+Layout (bytes):
+    header    16
+    per player, twice:
+        grid       rows*cols   ASCII "~", "S", "X" or "O"
+        cell_ship  rows*cols   ship index, 0xFF where there is no ship
+        ships      MAX_SHIPS * SHIP_RECORD.size
+"""
+
+import struct
+from multiprocessing import shared_memory
+
+import rules
+from ship import Ship
+
+MAX_SHIPS = 16
+NAME_LEN = 16
+NO_SHIP = 0xFF
+
+# size, hits, direction, row, col, name
+SHIP_RECORD = struct.Struct(f"<BBcxHH{NAME_LEN}s")
+HITS_OFFSET = 1
+
+# Header byte offsets
+HEADER_SIZE = 16
+HEADER = struct.Struct("<HH")   # rows, cols
+TURN = 4
+GAME_OVER = 5
+WINNER = 6                      # 0 = none, otherwise winner index + 1
+PLACEMENT_DONE = (7, 8)
+SHIP_COUNT = (9, 10)
+
+EMPTY, SHIP, HIT, MISS = ord("~"), ord("S"), ord("X"), ord("O")
+
+
+def _block_size(rows, cols):
+    return 2 * rows * cols + MAX_SHIPS * SHIP_RECORD.size
+
+
+class _Row:
+    # One grid row, read in place from the buffer
+    __slots__ = ("buf", "offset")
+
+    def __init__(self, buf, offset):
+        self.buf = buf
+        self.offset = offset
+
+    def __getitem__(self, c):
+        return chr(self.buf[self.offset + c])
+
+
+class _GridView:
+    # Read-only grid[r][c] view over one player's grid bytes (no copies)
+    __slots__ = ("rows",)
+
+    def __init__(self, buf, offset, rows, cols):
+        self.rows = [_Row(buf, offset + r * cols) for r in range(rows)]
+
+    def __getitem__(self, r):
+        return self.rows[r]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class _SharedBoard:
+    # One player's part of the block, as board storage for rules.py
+    __slots__ = ("buf", "idx", "rows", "cols", "grid", "index", "ships")
+
+    def __init__(self, buf, idx, rows, cols, offset):
+        self.buf = buf
+        self.idx = idx
+        self.rows = rows
+        self.cols = cols
+        self.grid = offset
+        self.index = offset + rows * cols
+        self.ships = offset + 2 * rows * cols
+
+    def occupied(self, mask):
+        buf, index = self.buf, self.index
+        while mask:
+            low = mask & -mask
+            if buf[index + low.bit_length() - 1] != NO_SHIP:
+                return True
+            mask ^= low
+        return False
+
+    def add_ship(self, ship, start, direction, mask):
+        buf = self.buf
+        count = buf[SHIP_COUNT[self.idx]]
+        if count >= MAX_SHIPS:
+            return False
+        SHIP_RECORD.pack_into(buf, self.ships + count * SHIP_RECORD.size,
+                              ship.size, 0, direction.encode(), start[0], start[1],
+                              ship.name.encode()[:NAME_LEN])
+        while mask:
+            low = mask & -mask
+            cell = low.bit_length() - 1
+            buf[self.index + cell] = count
+            buf[self.grid + cell] = SHIP
+            mask ^= low
+        buf[SHIP_COUNT[self.idx]] = count + 1
+        return True
+
+    def mark_shot(self, cell):
+        buf = self.buf
+        grid = self.grid + cell
+        if buf[grid] in (HIT, MISS):
+            return rules.REPEAT
+        ship_id = buf[self.index + cell]
+        if ship_id == NO_SHIP:
+            buf[grid] = MISS
+            return rules.NO_SHIP
+        buf[grid] = HIT
+        return ship_id
+
+    def add_hit(self, ship_id, cell):
+        record = self.ships + ship_id * SHIP_RECORD.size
+        hits = self.buf[record + HITS_OFFSET] + 1
+        self.buf[record + HITS_OFFSET] = hits
+        return hits >= self.buf[record]
+
+    def ship(self, ship_id):
+        size, _, direction, row, col, name = SHIP_RECORD.unpack_from(
+            self.buf, self.ships + ship_id * SHIP_RECORD.size)
+        ship = Ship(name.rstrip(b"\0").decode(), size)
+        ship.place((row, col), direction.decode())
+        for r, c in ship.positions:
+            if self.buf[self.grid + r * self.cols + c] == HIT:
+                ship.register_hit((r, c))
+        return ship
+
+    def all_ships_sunk(self):
+        buf, ships = self.buf, self.ships
+        return all(buf[ships + i * SHIP_RECORD.size + HITS_OFFSET] == buf[ships + i * SHIP_RECORD.size]
+                   for i in range(buf[SHIP_COUNT[self.idx]]))
+
+
+class SharedPvPState:
+    def __init__(self, shm, names=("Player 1", "Player 2")):
+        self.shm = shm
+        self.buf = shm.buf
+        self.names = tuple(names)
+        self.rows, self.cols = HEADER.unpack_from(self.buf, 0)
+        cells = self.rows * self.cols
+        block = _block_size(self.rows, self.cols)
+        self.grid_offset = [HEADER_SIZE + p * block for p in (0, 1)]
+        self.index_offset = [off + cells for off in self.grid_offset]
+        self.ships_offset = [off + 2 * cells for off in self.grid_offset]
+        self.grids = [_GridView(self.buf, off, self.rows, self.cols) for off in self.grid_offset]
+        self.boards = [_SharedBoard(self.buf, p, self.rows, self.cols, self.grid_offset[p])
+                       for p in (0, 1)]
+
+    @classmethod
+    def create(cls, rows=10, cols=10, names=("Player 1", "Player 2")):
+        """Allocate and initialise a new block. The creator should unlink() it."""
+        size = HEADER_SIZE + 2 * _block_size(rows, cols)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        buf = shm.buf
+        buf[:size] = bytes(size)
+        HEADER.pack_into(buf, 0, rows, cols)
+        for p in (0, 1):
+            start = HEADER_SIZE + p * _block_size(rows, cols)
+            buf[start:start + rows * cols] = bytes([EMPTY]) * (rows * cols)
+            buf[start + rows * cols:start + 2 * rows * cols] = bytes([NO_SHIP]) * (rows * cols)
+        return cls(shm, names)
+
+    @classmethod
+    def attach(cls, name, names=("Player 1", "Player 2")):
+        return cls(shared_memory.SharedMemory(name=name), names)
+
+    def __reduce__(self):
+        # Child processes re-attach to the same block by name
+        return (SharedPvPState.attach, (self.shm.name, self.names))
+
+    def close(self):
+        self.grids = None
+        self.boards = None
+        self.buf = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+    # Dict-style access, same keys as pvp_shared.init_shared_state()
+    def __getitem__(self, key):
+        buf = self.buf
+        if key == 'rows':
+            return self.rows
+        if key == 'cols':
+            return self.cols
+        if key == 'current_turn':
+            return buf[TURN]
+        if key == 'game_over':
+            return bool(buf[GAME_OVER])
+        if key == 'winner':
+            return self.names[buf[WINNER] - 1] if buf[WINNER] else None
+        if key.startswith('player') and '_' in key:
+            p = int(key[6]) - 1
+            field = key[8:]
+            if field == 'name':
+                return self.names[p]
+            if field == 'board_grid':
+                return self.grids[p]
+            if field == 'placement_done':
+                return bool(buf[PLACEMENT_DONE[p]])
+            if field == 'cell_index':
+                start = self.index_offset[p]
+                return [-1 if i == NO_SHIP else i for i in buf[start:start + self.rows * self.cols]]
+            if field == 'ships':
+                return self.ships(p)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        buf = self.buf
+        if key == 'current_turn':
+            buf[TURN] = value
+        elif key == 'game_over':
+            buf[GAME_OVER] = 1 if value else 0
+        elif key == 'winner':
+            buf[WINNER] = 0 if value is None else self.names.index(value) + 1
+        elif key.startswith('player') and key.endswith('_placement_done'):
+            buf[PLACEMENT_DONE[int(key[6]) - 1]] = 1 if value else 0
+        else:
+            raise KeyError(key)
+
+    def copy(self):
+        # Plain dict snapshot of every key, grids copied into lists
+        data = {key: self[key] for key in ('rows', 'cols', 'current_turn', 'game_over', 'winner')}
+        for p in (0, 1):
+            prefix = f'player{p + 1}_'
+            start = self.grid_offset[p]
+            row_bytes = [bytes(self.buf[start + r * self.cols:start + (r + 1) * self.cols])
+                         for r in range(self.rows)]
+            data[prefix + 'name'] = self.names[p]
+            data[prefix + 'board_grid'] = [list(row.decode()) for row in row_bytes]
+            data[prefix + 'placement_done'] = bool(self.buf[PLACEMENT_DONE[p]])
+            data[prefix + 'cell_index'] = self[prefix + 'cell_index']
+            data[prefix + 'ships'] = self.ships(p)
+        return data
+
+    def ships(self, player_idx):
+        # Ship dicts in the same shape as the Manager backend (a copy)
+        ships = []
+        for i in range(self.buf[SHIP_COUNT[player_idx]]):
+            size, hits, direction, row, col, name = SHIP_RECORD.unpack_from(
+                self.buf, self.ships_offset[player_idx] + i * SHIP_RECORD.size)
+            step = (1, 0) if direction == b"V" else (0, 1)
+            positions = [(row + k * step[0], col + k * step[1]) for k in range(size)]
+            grid = self.grids[player_idx]
+            ships.append({
+                'name': name.rstrip(b"\0").decode(),
+                'size': size,
+                'positions': positions,
+                'hits': [(r, c) for r, c in positions if grid[r][c] == "X"],
+            })
+        return ships
+
+    # Game storage for the rules engine (see rules.py)
+    def board(self, idx):
+        return self.boards[idx]
+
+    @property
+    def current_turn(self):
+        return self.buf[TURN]
+
+    @current_turn.setter
+    def current_turn(self, idx):
+        self.buf[TURN] = idx
+
+    def end_game(self, winner):
+        self.buf[GAME_OVER] = 1
+        self.buf[WINNER] = winner + 1
+
+    def place_ship(self, player_idx, ship_name, size, start, direction):
+        """
+        Place a ship for player_idx. Returns True if successful, False if invalid.
+        """
+        return rules.place(self.boards[player_idx], Ship(ship_name, size), start, direction)
+
+    def fire(self, attacker_idx, row, col):
+        """
+        Shot by attacker_idx at (row, col), written in place.
+        Returns: ("hit" | "miss" | ("sunk", ship), game_over)
+        """
+        return rules.fire(self, attacker_idx, row, col)
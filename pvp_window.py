@@ -1,6 +1,10 @@
 # pvp_window.py
 import pygame
-from pvp_shared import place_ship_shared, fire_shared
+from pvp_shared import place_ship_shared, fire_shared, StateChannel, StateMirror
+from placements import placement_table
+from render import BoardRenderer
+from assets import draw_popup, popup_button_rects, render_text
+from frame_loop import FrameLoop
 
 ROWS, COLS = 10, 10
 CELL_SIZE = 40
@@ -24,58 +28,21 @@ SHIP_DEFS = [
     ("Destroyer", 2),
 ]
 
-POPUP_WIDTH = 300
-POPUP_HEIGHT = 150
-BUTTON_WIDTH = 120
-BUTTON_HEIGHT = 40
-BUTTON_SPACING = 20
-
-def draw_popup(screen, message, button_rects):
-    """Draw a popup dialog with message and buttons."""
-    popup_x = (SCREEN_WIDTH - POPUP_WIDTH) // 2
-    popup_y = (SCREEN_HEIGHT - POPUP_HEIGHT) // 2
-    
-    # Draw semi-transparent overlay
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 200))
-    screen.blit(overlay, (0, 0))
-    
-    # Draw popup background
-    popup_rect = pygame.Rect(popup_x, popup_y, POPUP_WIDTH, POPUP_HEIGHT)
-    pygame.draw.rect(screen, WHITE, popup_rect)
-    pygame.draw.rect(screen, GRAY, popup_rect, 2)
-    
-    # Draw message
-    font_large = pygame.font.SysFont(None, 28)
-    msg_surf = font_large.render(message, True, BLACK)
-    msg_rect = msg_surf.get_rect(center=(SCREEN_WIDTH // 2, popup_y + 40))
-    screen.blit(msg_surf, msg_rect)
-    
-    # Draw buttons
-    font_button = pygame.font.SysFont(None, 24)
-    for i, (label, color) in enumerate([("Play Again", GREEN), ("Quit", RED)]):
-        btn_x = popup_x + 35 + i * (BUTTON_WIDTH + BUTTON_SPACING)
-        btn_y = popup_y + POPUP_HEIGHT - 60
-        btn_rect = pygame.Rect(btn_x, btn_y, BUTTON_WIDTH, BUTTON_HEIGHT)
-        button_rects[label] = btn_rect
-        
-        pygame.draw.rect(screen, color, btn_rect)
-        pygame.draw.rect(screen, BLACK, btn_rect, 2)
-        
-        btn_surf = font_button.render(label, True, BLACK)
-        btn_text_rect = btn_surf.get_rect(center=btn_rect.center)
-        screen.blit(btn_surf, btn_text_rect)
-
 
 def _make_ships():
     return [{"name": name, "size": size} for name, size in SHIP_DEFS]
 
 
-def run_pvp(player_number=None, shared_state=None):
+def run_pvp(player_number=None, shared_state=None, channel=None):
     if shared_state is None:
         # Fallback: single-window standalone mode (not used in multi-window PvP)
         from pvp_shared import init_shared_state
         shared_state = init_shared_state()
+    if channel is None:
+        channel = StateChannel()
+
+    # Local copy of the shared state, re-read only when its version changes
+    state = StateMirror(shared_state, channel)
 
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -83,8 +50,9 @@ def run_pvp(player_number=None, shared_state=None):
     if player_number is not None:
         title = f"Local PvP — Player {player_number}"
     pygame.display.set_caption(title)
-    font = pygame.font.SysFont(None, 24)
-    clock = pygame.time.Clock()
+    # Sleeps until input or until the other window publishes a change
+    loop = FrameLoop(name=f"pvp_window{player_number or ''}")
+    loop.watch(channel)
 
     # State local to this window
     player_idx = (player_number - 1) if player_number else 0
@@ -95,6 +63,7 @@ def run_pvp(player_number=None, shared_state=None):
     highlight = None
     game_won = False
     winner = None
+    occupied = 0  # Bitmask of this player's placed ships, kept locally for the preview
 
     message = f"Player {player_number or 1}: place your ships"
     message_timer = 0
@@ -110,27 +79,30 @@ def run_pvp(player_number=None, shared_state=None):
         row = (y - PADDING) // CELL_SIZE
         return row, col
 
-    def draw_board(board_grid, offset_x, reveal_ships=False):
-        for r in range(ROWS):
-            for c in range(COLS):
-                rect = pygame.Rect(offset_x + c * CELL_SIZE, PADDING + r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                cell = board_grid[r][c]
-                color = BLUE
-                if cell == "S" and reveal_ships:
-                    color = GRAY
-                elif cell == "X":
-                    color = RED
-                elif cell == "O":
-                    color = WHITE
-                pygame.draw.rect(screen, color, rect)
-                pygame.draw.rect(screen, BLACK, rect, 1)
+    # Cached board surfaces; only changed cells are redrawn each frame
+    colors = {"~": BLUE, "S": GRAY, "X": RED, "O": WHITE, "grid": BLACK}
+    own_view = BoardRenderer(ROWS, COLS, CELL_SIZE, (board_offset(left=True), PADDING), colors, reveal_ships=True)
+    opponent_view = BoardRenderer(ROWS, COLS, CELL_SIZE, (board_offset(left=False), PADDING), colors, reveal_ships=False)
+    preview_surf = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+    text_rect = pygame.Rect(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40)
+    drawn_version = None   # Mirror version the board surfaces reflect
+    shown_preview = None   # (coords, valid) currently drawn on screen
+    shown_status = None    # Status line currently drawn on screen
+    popup_shown = False
+    first_frame = True
 
     running = True
     while running:
-        screen.fill(BLACK)
+        events = loop.events(busy=first_frame)
         mouse_pos = pygame.mouse.get_pos()
+        state.refresh()
+
+        # The opponent may have fired the winning shot
+        if state['game_over'] and not game_won:
+            game_won = True
+            winner = state['winner']
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
@@ -141,19 +113,11 @@ def run_pvp(player_number=None, shared_state=None):
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 # Handle popup clicks
                 if game_won:
-                    button_rects = {}
-                    popup_x = (SCREEN_WIDTH - POPUP_WIDTH) // 2
-                    popup_y = (SCREEN_HEIGHT - POPUP_HEIGHT) // 2
-                    
-                    for i, label in enumerate(["Play Again", "Quit"]):
-                        btn_x = popup_x + 35 + i * (BUTTON_WIDTH + BUTTON_SPACING)
-                        btn_y = popup_y + POPUP_HEIGHT - 60
-                        btn_rect = pygame.Rect(btn_x, btn_y, BUTTON_WIDTH, BUTTON_HEIGHT)
-                        button_rects[label] = btn_rect
-                    
-                    if button_rects.get("Play Again", pygame.Rect(0, 0, 0, 0)).collidepoint(event.pos):
+                    button_rects = popup_button_rects(SCREEN_WIDTH, SCREEN_HEIGHT)
+                    if button_rects["Play Again"].collidepoint(event.pos):
                         running = False  # Exit game loop to restart
-                    elif button_rects.get("Quit", pygame.Rect(0, 0, 0, 0)).collidepoint(event.pos):
+                    elif button_rects["Quit"].collidepoint(event.pos):
+                        loop.close()
                         pygame.quit()
                         import sys
                         sys.exit()
@@ -167,37 +131,44 @@ def run_pvp(player_number=None, shared_state=None):
                         ship_def = SHIP_DEFS[current_ship_index]
                         success = place_ship_shared(shared_state, player_idx, ship_def[0], ship_def[1], (row, col), orientation)
                         if success:
+                            state.publish()
+                            occupied |= placement_table(ROWS, COLS, ship_def[1]).mask((row, col), orientation)
                             current_ship_index += 1
                             if current_ship_index >= len(SHIP_DEFS):
                                 # This player is done placing
                                 shared_state[f'player{player_idx + 1}_placement_done'] = True
+                                state.publish()
                                 placing = False
                                 message = f"Player {player_number or 1} ready. Waiting for opponent..."
                                 message_timer = pygame.time.get_ticks()
                 else:
                     # Game phase: only allow this player to fire when it's their turn and both placed
-                    if not (shared_state['player1_placement_done'] and shared_state['player2_placement_done']):
+                    if not (state['player1_placement_done'] and state['player2_placement_done']):
                         continue  # Not ready yet
-                    if shared_state['current_turn'] != player_idx:
+                    if state['current_turn'] != player_idx:
                         continue
                     
                     offset = board_offset(left=False)
                     row, col = get_tile(event.pos, offset)
                     if 0 <= row < ROWS and 0 <= col < COLS:
+                        # A repeat shot would pass the turn (see rules.fire),
+                        # so clicks on cells already shot are ignored
+                        if state[f'player{opponent_idx + 1}_board_grid'][row][col] in ("X", "O"):
+                            continue
                         result, _ = fire_shared(shared_state, player_idx, row, col)
+                        state.publish()
                         
                         # Check if game is over
-                        if shared_state['game_over']:
+                        if state['game_over']:
                             game_won = True
-                            winner = shared_state['winner']
+                            winner = state['winner']
                         # Interpret result for message display
                         elif result == "miss":
-                            message = f"Missed at ({row},{col}). {shared_state[f'player{opponent_idx+1}_name']}'s turn."
-                            shared_state['current_turn'] = opponent_idx
+                            message = f"Missed at ({row},{col}). {state[f'player{opponent_idx+1}_name']}'s turn."
                         elif result == "hit":
-                            message = f"Hit at ({row},{col})! {shared_state[f'player{opponent_idx+1}_name']}'s turn."
+                            message = f"Hit at ({row},{col})! {state[f'player{opponent_idx+1}_name']}'s turn."
                         elif isinstance(result, tuple) and result[0] == "sunk":
-                            message = f"Sunk {result[1]}! {shared_state[f'player{opponent_idx+1}_name']}'s turn."
+                            message = f"Sunk {result[1].name}! {state[f'player{opponent_idx+1}_name']}'s turn."
                         else:
                             message = f"Result: {result}"
                         message_timer = pygame.time.get_ticks()
@@ -207,67 +178,88 @@ def run_pvp(player_number=None, shared_state=None):
             pr, pc = get_tile(mouse_pos, board_offset(left=True))
             ship_def = SHIP_DEFS[current_ship_index]
             coords = []
-            valid = True
             for i in range(ship_def[1]):
                 rr = pr + (i if orientation == "V" else 0)
                 cc = pc + (i if orientation == "H" else 0)
                 coords.append((rr, cc))
-                if rr < 0 or cc < 0 or rr >= ROWS or cc >= COLS:
-                    valid = False
-                else:
-                    # Check collision in shared state (only if in bounds)
-                    own_board = shared_state[f'player{player_idx + 1}_board_grid']
-                    if own_board[rr][cc] != "~":
-                        valid = False
+            # Single table lookup against the locally tracked ships (no shared state reads)
+            mask = placement_table(ROWS, COLS, ship_def[1]).mask((pr, pc), orientation)
+            valid = mask != 0 and not mask & occupied
             highlight = {"coords": coords, "valid": valid}
 
         # Get board grids and determine view
-        own_board = shared_state[f'player{player_idx + 1}_board_grid']
-        opponent_board = shared_state[f'player{opponent_idx + 1}_board_grid']
+        own_board = state[f'player{player_idx + 1}_board_grid']
+        opponent_board = state[f'player{opponent_idx + 1}_board_grid']
 
         # Check if both players are done placing
-        if not placing and shared_state['player1_placement_done'] and shared_state['player2_placement_done']:
+        if not placing and state['player1_placement_done'] and state['player2_placement_done']:
             placing = False  # Ensure we stay in game phase
-        elif not placing and (not shared_state['player1_placement_done'] or not shared_state['player2_placement_done']):
+        elif not placing and (not state['player1_placement_done'] or not state['player2_placement_done']):
             # One player is done, but the other isn't — stay in waiting mode
             pass
 
-        draw_board(own_board, board_offset(left=True), reveal_ships=True)
-        draw_board(opponent_board, board_offset(left=False), reveal_ships=False)
+        dirty = []
+        if first_frame:
+            screen.fill(BLACK)
+        if state.version != drawn_version:
+            own_changed = own_view.sync_grid(own_board)
+            opponent_changed = opponent_view.sync_grid(opponent_board)
+            drawn_version = state.version
+            if not first_frame:
+                dirty += own_view.blit_cells(screen, own_changed)
+                dirty += opponent_view.blit_cells(screen, opponent_changed)
+        if first_frame:
+            dirty.append(own_view.blit_all(screen))
+            dirty.append(opponent_view.blit_all(screen))
 
-        # Draw preview squares
-        if placing and highlight:
-            s = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-            color = (GREEN[0], GREEN[1], GREEN[2], PREVIEW_ALPHA) if highlight["valid"] else (255, 80, 80, PREVIEW_ALPHA)
-            s.fill(color)
-            for (r, c) in highlight["coords"]:
-                if 0 <= r < ROWS and 0 <= c < COLS:
-                    rect = pygame.Rect(PADDING + c * CELL_SIZE, PADDING + r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                    screen.blit(s, (rect.x, rect.y))
+        # Draw preview squares, restoring the previously previewed cells
+        preview = (tuple(highlight["coords"]), highlight["valid"]) if placing and highlight else None
+        if not popup_shown and (preview != shown_preview or dirty):
+            if shown_preview:
+                dirty += own_view.blit_cells(screen, shown_preview[0])
+            if preview:
+                color = (GREEN[0], GREEN[1], GREEN[2], PREVIEW_ALPHA) if preview[1] else (255, 80, 80, PREVIEW_ALPHA)
+                preview_surf.fill(color)
+                for (r, c) in preview[0]:
+                    if 0 <= r < ROWS and 0 <= c < COLS:
+                        rect = own_view.cell_rect(r, c)
+                        screen.blit(preview_surf, rect)
+                        dirty.append(rect)
+            shown_preview = preview
 
-        # UI text
+        # UI text: [(text, x)], redrawn only when it changes
+        status = []
         if placing:
-            txt = font.render(message, True, WHITE)
-            screen.blit(txt, (PADDING, SCREEN_HEIGHT - 30))
+            status.append((message, PADDING))
         else:
             # Check if both are ready before showing game phase
-            if shared_state['player1_placement_done'] and shared_state['player2_placement_done']:
+            if state['player1_placement_done'] and state['player2_placement_done']:
                 if not game_won:
-                    current_player_num = shared_state['current_turn'] + 1
-                    turn_txt = font.render(f"Turn: Player {current_player_num}", True, WHITE)
-                    screen.blit(turn_txt, (PADDING, SCREEN_HEIGHT - 30))
+                    current_player_num = state['current_turn'] + 1
+                    status.append((f"Turn: Player {current_player_num}", PADDING))
                     if message:
-                        msg_surf = font.render(message, True, WHITE)
-                        screen.blit(msg_surf, (PADDING + 200, SCREEN_HEIGHT - 30))
+                        status.append((message, PADDING + 200))
             else:
                 # Still waiting for opponent
-                txt = font.render(message, True, WHITE)
-                screen.blit(txt, (PADDING, SCREEN_HEIGHT - 30))
+                status.append((message, PADDING))
+        if status != shown_status and not popup_shown:
+            screen.fill(BLACK, text_rect)
+            for text, x in status:
+                screen.blit(render_text(text, 24, WHITE), (x, SCREEN_HEIGHT - 30))
+            dirty.append(text_rect)
+            shown_status = status
 
         # Draw popup if game is won
-        if game_won:
+        if game_won and not popup_shown:
             button_rects = {}
             draw_popup(screen, f"{winner} WINS!", button_rects)
+            popup_shown = True
+            dirty = [screen.get_rect()]
+
+        if first_frame:
+            pygame.display.flip()
+            first_frame = False
+        elif dirty:
+            pygame.display.update(dirty)
 
-        pygame.display.flip()
-        clock.tick(60)
+    loop.close()
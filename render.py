@@ -0,0 +1,100 @@
+# render.py
+"""
+Cached board rendering for the pygame windows.
+Each BoardRenderer keeps a pre-rendered surface of one board and redraws
+only the cells that changed since the last sync. The window then re-blits
+just those cells to the screen and passes their rects to
+pygame.display.update(), so frame cost follows the number of changes
+instead of the board area.
+"""
+
+import pygame
+
+
+class BoardRenderer:
+    def __init__(self, rows, cols, cell_size, origin, colors, reveal_ships=True):
+        # colors: {"~": water, "S": ship, "X": hit, "O": miss, "grid": cell border}
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.origin = origin
+        self.colors = colors
+        self.reveal_ships = reveal_ships
+        self.surface = pygame.Surface((cols * cell_size, rows * cell_size))
+        self.cells = [None] * (rows * cols)   # Cell code last drawn on the surface
+
+        # Last bitboards seen by sync_board()
+        self.masks = (0, 0, 0)
+
+    def cell_rect(self, r, c):
+        # Screen rect of cell (r, c)
+        x, y = self.origin
+        return pygame.Rect(x + c * self.cell_size, y + r * self.cell_size, self.cell_size, self.cell_size)
+
+    def rect(self):
+        x, y = self.origin
+        return pygame.Rect(x, y, self.cols * self.cell_size, self.rows * self.cell_size)
+
+    def _draw_cell(self, r, c, code):
+        if code == "S" and not self.reveal_ships:
+            code = "~"
+        if self.cells[r * self.cols + c] == code:
+            return False
+        self.cells[r * self.cols + c] = code
+        rect = pygame.Rect(c * self.cell_size, r * self.cell_size, self.cell_size, self.cell_size)
+        pygame.draw.rect(self.surface, self.colors[code], rect)
+        pygame.draw.rect(self.surface, self.colors["grid"], rect, 1)
+        return True
+
+    def sync_grid(self, grid):
+        """
+        Bring the surface up to date with a grid[r][c] of "~"/"S"/"X"/"O".
+        Returns the changed cells as [(r, c)]. Call it when the grid is
+        known to have changed; it compares every cell.
+        """
+        changed = []
+        for r in range(self.rows):
+            row = grid[r]
+            for c in range(self.cols):
+                if self._draw_cell(r, c, row[c]):
+                    changed.append((r, c))
+        return changed
+
+    def sync_board(self, board):
+        """
+        Same as sync_grid() for a Board, but only visits the cells whose
+        bits changed since the last call, so an unchanged board costs nothing.
+        """
+        masks = (board.ship_mask, board.shot_mask, board.hit_mask)
+        if self.cells[0] is None:
+            diff = (1 << (self.rows * self.cols)) - 1   # Nothing drawn yet
+        else:
+            diff = (masks[0] ^ self.masks[0]) | (masks[1] ^ self.masks[1]) | (masks[2] ^ self.masks[2])
+            if not diff:
+                return []
+        self.masks = masks
+
+        grid = board.grid
+        changed = []
+        while diff:
+            low = diff & -diff
+            diff ^= low
+            r, c = divmod(low.bit_length() - 1, self.cols)
+            if self._draw_cell(r, c, grid[r][c]):
+                changed.append((r, c))
+        return changed
+
+    def blit_all(self, screen):
+        screen.blit(self.surface, self.origin)
+        return self.rect()
+
+    def blit_cells(self, screen, cells):
+        # Copy the given cells from the cached surface to the screen; returns their rects
+        rects = []
+        for r, c in cells:
+            if 0 <= r < self.rows and 0 <= c < self.cols:
+                area = pygame.Rect(c * self.cell_size, r * self.cell_size, self.cell_size, self.cell_size)
+                rect = self.cell_rect(r, c)
+                screen.blit(self.surface, rect, area)
+                rects.append(rect)
+        return rects
@@ -0,0 +1,313 @@
+# Title: Replay Log
+# Author: Nathan Vallad
+# Date: 12/17/2025
+# Purpose: Append-only log of every game's placements and shots in fixed
+# 16 byte records, read back through mmap. Any turn of any game is rebuilt
+# in one pass: a board's state only depends on which of its cells have been
+# shot (hits follow from the ships), so the shots up to that turn become
+# each board's shot mask in a single NumPy step instead of being replayed
+# one by one, and the log needs no keyframes.
+#
+# Usage:
+#   with ReplayWriter("games.replay") as log:
+#       log.attach(game)            # GameLogic or PvPHandler, before the first shot
+#       ...play...
+#   with ReplayLog("games.replay") as log:
+#       game = log.state(log.games[0], turn=40)
+#
+# Layout (little endian): a 16 byte file header ("BSRP" version:u8
+# record_size:u8), then records of
+#   game:u32 turn:u32 kind:u8 player:u8 payload (6 bytes)
+#   BOARD  rows:u16 cols:u16 ships:u8 flags:u8   (flags bits 0-1 as in
+#                                                serialization, bits 2-7 difficulty)
+#   PLACE  row:u16 col:u16 size:u8 flags:u8      (flags bit 0 = vertical; a
+#                                                player's ships in fleet order)
+#   SHOT   row:u16 col:u16 result:u8             (player = attacker)
+# `turn` is the number of shots fired so far (0 for BOARD and PLACE).
+# A game's records are buffered and written together when it ends or on
+# flush(), so a game is a few contiguous runs of the file, not scattered
+# records. Ship names other than the default fleet's are not kept.
+
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from AI import DIFFICULTIES
+from board import Board
+from game_logic import GameLogic, default_ship_name
+from player import Player
+from serialization import HAS_AI, IS_AI
+from ship import Ship
+
+VERSION = 2
+MAGIC = b"BSRP"
+WRITE_BUFFER = 1 << 20
+
+FILE_HEADER = struct.Struct("<4sBB10x")
+BOARD_RECORD = struct.Struct("<IIBBHHBB")
+PLACE_RECORD = struct.Struct("<IIBBHHBB")
+SHOT_RECORD = struct.Struct("<IIBBHHBx")
+RECORD_SIZE = 16
+
+# Record kinds
+BOARD, PLACE, SHOT = range(3)
+
+# Shot results
+MISS, HIT, SUNK, WIN = range(4)
+RESULT_NAMES = ("miss", "hit", "sunk", "win")
+
+VERTICAL = 1
+DIFFICULTY_SHIFT = 2    # BOARD flags bits 2-7
+
+# The same records viewed as a NumPy array; a..d are the payload fields above
+RECORD_DTYPE = np.dtype([
+    ("game", "<u4"), ("turn", "<u4"), ("kind", "u1"), ("player", "u1"),
+    ("a", "<u2"), ("b", "<u2"), ("c", "u1"), ("d", "u1"),
+])
+
+
+def _result_code(result, defender_board):
+    if isinstance(result, tuple):
+        return WIN if defender_board.all_ships_sunk() else SUNK
+    return HIT if result == "hit" else MISS
+
+
+class GameRecorder:
+    """
+    Records one game. GameLogic.fire and PvPHandler.fire call shot() through
+    their `replay` attribute; ReplayWriter.attach() sets it.
+    """
+
+    __slots__ = ("writer", "game_id", "players", "shots", "buffer", "finished")
+
+    def __init__(self, writer, game_id, players):
+        self.writer = writer
+        self.game_id = game_id
+        self.players = players
+        self.shots = 0
+        self.buffer = bytearray()
+        self.finished = False
+
+    def _start(self):
+        # Boards and fleets, written on the first shot once both are placed
+        out = self.buffer
+        for idx, player in enumerate(self.players):
+            board = player.board
+            ai = getattr(player, "ai", None)
+            flags = (IS_AI if player.is_ai else 0) | (HAS_AI if ai is not None else 0)
+            if ai is not None:
+                flags |= DIFFICULTIES.index(ai.difficulty) << DIFFICULTY_SHIFT
+            out += BOARD_RECORD.pack(self.game_id, 0, BOARD, idx, board.rows, board.cols,
+                                     len(board.ships), flags)
+            for ship in board.ships:
+                out += PLACE_RECORD.pack(self.game_id, 0, PLACE, idx, ship.row, ship.col,
+                                         ship.size, VERTICAL if ship.direction == 'V' else 0)
+
+    def shot(self, attacker, row, col, result):
+        """Record a shot by player index `attacker` and the board's result."""
+        if self.finished:
+            return
+        if not self.shots:
+            self._start()
+        self.shots += 1
+        code = _result_code(result, self.players[1 - attacker].board)
+        self.buffer += SHOT_RECORD.pack(self.game_id, self.shots, SHOT, attacker, row, col, code)
+        if code == WIN:
+            self.finish()
+
+    def flush(self):
+        if self.buffer:
+            self.writer._write(self.buffer)
+            self.buffer = bytearray()
+
+    def finish(self):
+        """Write out the game; later shots (e.g. after an abandoned game) are ignored."""
+        self.flush()
+        self.finished = True
+        self.writer.live.pop(self.game_id, None)
+
+
+class ReplayWriter:
+    """Appends games to a replay file, creating it if needed."""
+
+    def __init__(self, path):
+        self.path = path
+        self.live = {}          # game id -> GameRecorder not finished yet
+        self._pending = bytearray()
+
+        self.file = open(path, "a+b")
+        self.file.seek(0, os.SEEK_END)
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+            self.next_id = 0
+        else:
+            # Continue after the highest game id, dropping a torn last record
+            with ReplayLog(path) as log:
+                count = len(log)
+                self.next_id = int(log.records["game"].max()) + 1 if count else 0
+            self.file.truncate(FILE_HEADER.size + count * RECORD_SIZE)
+            self.file.seek(0, os.SEEK_END)
+
+    def attach(self, game):
+        """Start recording a GameLogic or PvPHandler (anything with .players and .replay)."""
+        recorder = GameRecorder(self, self.next_id, game.players)
+        self.next_id += 1
+        self.live[recorder.game_id] = recorder
+        game.replay = recorder
+        return recorder
+
+    def _write(self, data):
+        self._pending += data
+        if len(self._pending) >= WRITE_BUFFER:
+            self.file.write(self._pending)
+            self._pending = bytearray()
+
+    def flush(self):
+        """Write every buffered record, including those of unfinished games."""
+        for recorder in self.live.values():
+            recorder.flush()
+        self.file.write(self._pending)
+        self._pending = bytearray()
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayLog:
+    """
+    Read-only view of a replay file. Records stay in the page cache and are
+    scanned with NumPy; only the games asked for are turned into objects.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(FILE_HEADER.size)
+            if len(header) < FILE_HEADER.size:
+                raise ValueError("Not a replay file")
+            magic, version, record_size = FILE_HEADER.unpack(header)
+            if magic != MAGIC or record_size != RECORD_SIZE:
+                raise ValueError("Not a replay file")
+            if version != VERSION:
+                raise ValueError(f"Unsupported replay version {version}")
+            size = os.fstat(f.fileno()).st_size
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        count = (size - FILE_HEADER.size) // RECORD_SIZE
+        self.records = np.frombuffer(self._mmap, RECORD_DTYPE, count, FILE_HEADER.size)
+        self._index = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def _runs(self):
+        # game id -> [(start, end), ...] of its contiguous runs of records
+        if self._index is None:
+            games = self.records["game"]
+            starts = np.flatnonzero(games[1:] != games[:-1]) + 1
+            starts = np.concatenate(([0], starts)) if len(games) else starts
+            ends = np.append(starts[1:], len(games))
+            index = {}
+            for game, start, end in zip(games[starts].tolist(), starts.tolist(), ends.tolist()):
+                index.setdefault(game, []).append((start, end))
+            self._index = index
+        return self._index
+
+    @property
+    def games(self):
+        """Ids of every recorded game, in the order they were first written."""
+        return list(self._runs())
+
+    def _game_records(self, game_id):
+        runs = self._runs().get(game_id)
+        if runs is None:
+            raise KeyError(f"No game {game_id} in the replay log")
+        if len(runs) == 1:
+            start, end = runs[0]
+            return self.records[start:end]
+        return np.concatenate([self.records[start:end] for start, end in runs])
+
+    def turns(self, game_id):
+        """Number of shots recorded for a game."""
+        recs = self._game_records(game_id)
+        return int(recs["turn"].max()) if len(recs) else 0
+
+    def shots(self, game_id):
+        """[(turn, attacker, row, col, result name), ...] for a game."""
+        recs = self._game_records(game_id)
+        shots = recs[recs["kind"] == SHOT]
+        return [(turn, player, row, col, RESULT_NAMES[code]) for turn, player, row, col, code
+                in zip(*(shots[field].tolist() for field in ("turn", "player", "a", "b", "c")))]
+
+    def state(self, game_id, turn=None):
+        """Rebuild a game as a GameLogic after `turn` shots (default: all of them)."""
+        recs = self._game_records(game_id)
+        kinds = recs["kind"]
+
+        players = []
+        for rec in recs[kinds == BOARD].tolist():
+            _, _, _, idx, rows, cols, _, flags = rec
+            player = Player(f"Player {idx + 1}", Board(rows, cols), is_ai=bool(flags & IS_AI))
+            if flags & HAS_AI:
+                from AI import AI
+                player.ai = AI(player, DIFFICULTIES[flags >> DIFFICULTY_SHIFT])
+            players.append(player)
+        if len(players) != 2:
+            raise ValueError(f"Game {game_id} has no recorded start")
+
+        placed = [0, 0]
+        for rec in recs[kinds == PLACE].tolist():
+            _, _, _, idx, row, col, size, flags = rec
+            index = placed[idx]
+            placed[idx] += 1
+            name = default_ship_name(index, size) or f"Ship {index + 1}"
+            direction = 'V' if flags & VERTICAL else 'H'
+            if not players[idx].board.place_ship(Ship(name, size), (row, col), direction):
+                raise ValueError(f"Recorded ship {name!r} does not fit on the board")
+
+        shots = recs[kinds == SHOT]
+        total = int(shots["turn"][-1]) if len(shots) else 0
+        turn = total if turn is None else max(0, min(turn, total))
+        fired = shots[:int(np.searchsorted(shots["turn"], turn, side="right"))]
+
+        # Each board's shot mask straight from the shots fired at it
+        for idx, player in enumerate(players):
+            board = player.board
+            at = fired[fired["player"] == 1 - idx]
+            rows, cols = at["a"], at["b"]
+            if len(at) and (rows.max() >= board.rows or cols.max() >= board.cols):
+                raise ValueError(f"Recorded shot outside the board in game {game_id}")
+            marks = np.zeros(board.rows * board.cols, dtype=bool)
+            marks[rows.astype(np.intp) * board.cols + cols] = True
+            board.restore_shots(int.from_bytes(np.packbits(marks, bitorder="little").tobytes(),
+                                               "little"))
+
+        game = GameLogic(players[0], players[1])
+        if len(fired):
+            last = fired[-1]
+            attacker = int(last["player"])
+            game.current_turn = attacker if last["c"] == WIN else 1 - attacker
+        elif len(shots):
+            game.current_turn = int(shots[0]["player"])
+        return game
+
+    def close(self):
+        self.records = None
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
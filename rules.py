@@ -0,0 +1,127 @@
+# Title: Rules Engine
+# Author: Nathan Vallad
+# Date: 12/19/2025
+# Purpose: The single implementation of Battleship's placement, shot and turn
+# rules. Every mode goes through it: Board (in-process objects, used by
+# GameLogic and PvPHandler), pvp_shm.SharedPvPState (shared memory), the
+# Manager dict of pvp_shared (state pickled through a Manager on each access)
+# and session_host.SessionHost, whose batched turns use fire_many(). Each
+# backend only stores state, through the small protocols below.
+#
+# Board storage (one player's board):
+#   rows, cols
+#   occupied(mask) -> bool          any ship on the cells of a placement mask
+#   add_ship(ship, start, direction, mask) -> bool
+#                                   False if the storage has no room for it
+#   mark_shot(cell) -> int          mark cell (row * cols + col) as shot; returns
+#                                   the ship index there, NO_SHIP or REPEAT
+#   add_hit(ship_id, cell) -> bool  count a hit; True if that sank the ship
+#   ship(ship_id) -> Ship           the ship reported in ("sunk", ship)
+#   all_ships_sunk() -> bool
+#
+# Game storage (two boards and whose turn it is):
+#   board(idx) -> board storage
+#   current_turn                    readable and settable
+#   end_game(winner_idx)
+#
+# Batched storage (many games in NumPy arrays, first axis the game; fleet
+# ships are numbered by their position in one fleet shared by all games):
+#   shot[game, player, cell]        bool, shots received
+#   cell_ship[game, player, cell]   ship index or -1
+#   ship_hits[game, player, ship]   hits taken per ship
+#   ship_sizes[ship]
+#   ships_left[game, player]        ships afloat
+#   turn[game], winner[game]        player to move; winner or -1
+
+from placements import placement_table
+
+NO_SHIP = -1
+REPEAT = -2
+MISS, HIT, SUNK, WIN = 0, 1, 2, 3   # fire_many() result codes
+
+
+def placement_mask(store, size, start, direction) -> int:
+    """
+    Bitmask of a ship of `size` at `start`, or 0 if it would leave the
+    board or overlap a placed ship.
+    """
+    mask = placement_table(store.rows, store.cols, size).mask(start, direction)
+    if not mask or store.occupied(mask):
+        return 0
+    return mask
+
+
+def place(store, ship, start, direction) -> bool:
+    """Place `ship` on the board. Returns False if it doesn't fit."""
+    mask = placement_mask(store, ship.size, start, direction)
+    if not mask:
+        return False
+    return store.add_ship(ship, start, direction, mask)
+
+
+def shoot(store, row, col):
+    """
+    Resolve a shot at (row, col).
+    Returns "hit", "miss" (also for a cell already shot) or ("sunk", ship).
+    """
+    if not (0 <= row < store.rows and 0 <= col < store.cols):
+        raise IndexError("Shot out of bounds")
+    cell = row * store.cols + col
+    ship_id = store.mark_shot(cell)
+    if ship_id < 0:
+        return "miss"
+    if store.add_hit(ship_id, cell):
+        return ("sunk", store.ship(ship_id))
+    return "hit"
+
+
+def fire(game, attacker, row, col):
+    """
+    Player `attacker` shoots at the other board. The turn passes after
+    every shot unless it sank the last ship, which ends the game.
+    Returns (shoot() result, game_over).
+    """
+    defender = game.board(1 - attacker)
+    result = shoot(defender, row, col)
+    # Only a sinking shot can end the game
+    if result.__class__ is tuple and defender.all_ships_sunk():
+        game.end_game(attacker)
+        return result, True
+    game.current_turn = 1 - attacker
+    return result, False
+
+
+def fire_many(store, games, cells):
+    """
+    fire() for many games at once: the current player of each game in
+    `games` (distinct indices into the batched storage) shoots at `cells`
+    (flat, one per game). Returns an array of MISS/HIT/SUNK/WIN per game;
+    WIN games have their winner set and keep the turn.
+    """
+    import numpy as np
+
+    attacker = store.turn[games].astype(np.intp)
+    defender = 1 - attacker
+    # A cell already shot is a miss, as in shoot()
+    repeat = store.shot[games, defender, cells]
+    store.shot[games, defender, cells] = True
+
+    ship = store.cell_ship[games, defender, cells].astype(np.intp)
+    hit = (ship >= 0) & ~repeat
+    codes = np.where(hit, HIT, MISS).astype(np.int8)
+
+    hg, hd, hship = games[hit], defender[hit], ship[hit]
+    store.ship_hits[hg, hd, hship] += 1
+    sunk = store.ship_hits[hg, hd, hship] == store.ship_sizes[hship]
+    sg, sd = hg[sunk], hd[sunk]
+    store.ships_left[sg, sd] -= 1
+    # Only a sinking shot can end the game
+    won = store.ships_left[sg, sd] == 0
+
+    hit_codes = codes[hit]
+    hit_codes[sunk] = np.where(won, WIN, SUNK)
+    codes[hit] = hit_codes
+
+    store.winner[sg[won]] = 1 - sd[won]
+    store.turn[games[codes != WIN]] ^= 1
+    return codes
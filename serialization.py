@@ -0,0 +1,320 @@
+# Title: Binary Serialization
+# Author: Nathan Vallad
+# Date: 12/16/2025
+# Purpose: Compact binary encoding of Board, Player and GameLogic state for
+# save files, snapshots and network messages. A board is its shot and hit
+# bitmasks plus one 4 byte record per ship (size, row, col, flags), so a
+# 10x10 board with the default fleet takes 52 bytes and a whole two-player
+# game about 130 (pickle: ~2 KB). Decoders accept bytes, bytearray or
+# memoryview and never copy the input.
+#
+# Layout (little endian):
+#   board   "B" rows:u16 cols:u16 ships:u8 shot_mask hit_mask ship*
+#           masks are ceil(rows*cols / 8) bytes each
+#   ship    size row col flags   (u8 each; u16 row/col if a side is > 255)
+#           flags bit 0 = vertical, bit 1 = custom name (u8 length + UTF-8)
+#   player  "P" flags:u8 difficulty:u8 name_len:u8 name board
+#           flags bit 0 = is_ai, bit 1 = has an AI controller
+#   game    "G" version:u8 current_turn:u8 player player
+
+import struct
+from array import array
+from functools import lru_cache
+
+from AI import DIFFICULTIES
+from board import Board
+from game_logic import GameLogic, default_ship_name
+from placements import placement_table
+from player import Player
+from ship import Ship
+
+VERSION = 1
+
+BOARD_HEADER = struct.Struct("<cHHB")
+PLAYER_HEADER = struct.Struct("<cBBB")
+GAME_HEADER = struct.Struct("<cBB")
+SMALL_SHIP = struct.Struct("<BBBB")
+LARGE_SHIP = struct.Struct("<BHHB")
+
+VERTICAL = 1
+CUSTOM_NAME = 2
+IS_AI = 1
+HAS_AI = 2
+
+
+def _mask_bytes(rows, cols):
+    return (rows * cols + 7) // 8
+
+
+def _ship_struct(rows, cols):
+    return SMALL_SHIP if rows <= 256 and cols <= 256 else LARGE_SHIP
+
+
+def _pack_name(out, name):
+    data = name.encode()
+    if len(data) > 255:
+        raise ValueError(f"Name too long to encode: {name!r}")
+    out.append(len(data))
+    out += data
+
+
+def _take(buf, offset, length):
+    # Slice that must be complete (slicing alone would silently come up short)
+    end = offset + length
+    if end > len(buf):
+        raise ValueError("Truncated data")
+    return buf[offset:end], end
+
+
+def _unpack_name(buf, offset):
+    data, end = _take(buf, offset + 1, buf[offset])
+    return bytes(data).decode(), end
+
+
+# Encoders append to a bytearray
+
+def _encode_board(out, board):
+    if len(board.ships) > 255:
+        raise ValueError("Too many ships to encode")
+    out += BOARD_HEADER.pack(b"B", board.rows, board.cols, len(board.ships))
+    size = _mask_bytes(board.rows, board.cols)
+    out += board.shot_mask.to_bytes(size, "little")
+    out += board.hit_mask.to_bytes(size, "little")
+
+    record = _ship_struct(board.rows, board.cols)
+    for index, ship in enumerate(board.ships):
+        flags = VERTICAL if ship.direction == 'V' else 0
+        # The default fleet's names are implied by position and not stored
+        custom = ship.name != default_ship_name(index, ship.size)
+        if custom:
+            flags |= CUSTOM_NAME
+        out += record.pack(ship.size, ship.row, ship.col, flags)
+        if custom:
+            _pack_name(out, ship.name)
+
+
+def _encode_player(out, player):
+    ai = getattr(player, "ai", None)
+    flags = (IS_AI if player.is_ai else 0) | (HAS_AI if ai is not None else 0)
+    difficulty = DIFFICULTIES.index(ai.difficulty) if ai is not None else 0
+    name = player.name.encode()
+    if len(name) > 255:
+        raise ValueError(f"Name too long to encode: {player.name!r}")
+    out += PLAYER_HEADER.pack(b"P", flags, difficulty, len(name))
+    out += name
+    _encode_board(out, player.board)
+
+
+def _encode_game(out, game):
+    out += GAME_HEADER.pack(b"G", VERSION, game.current_turn)
+    for player in game.players:
+        _encode_player(out, player)
+
+
+# Decoders take (buffer, offset) and return (object, offset after it)
+
+def _decode_board(buf, offset):
+    tag, rows, cols, count = BOARD_HEADER.unpack_from(buf, offset)
+    if tag != b"B":
+        raise ValueError("Not an encoded Board")
+    offset += BOARD_HEADER.size
+    size = _mask_bytes(rows, cols)
+    data, offset = _take(buf, offset, 2 * size)
+    shot_mask = int.from_bytes(data[:size], "little")
+    hit_mask = int.from_bytes(data[size:], "little")
+    if shot_mask >> (rows * cols):
+        raise ValueError("Encoded shots outside the board")
+    records, offset = _ship_records(buf, offset, count, _ship_struct(rows, cols))
+
+    # Build the ships, masks and cell -> ship index straight from the records
+    # rather than through place_ship()/restore_shots(), which would redo the
+    # checks and the hit bookkeeping per cell; the result is the same Board.
+    board = Board(rows, cols)
+    ships = board.ships
+    ship_masks = board.ship_masks
+    cell_ship = board.cell_ship
+    ship_mask = 0
+    for index, (name, ship_size, row, col, flags) in enumerate(records):
+        cell = row * cols + col
+        if flags & VERTICAL:
+            direction = 'V'
+            stride = cols
+            fits = row + ship_size <= rows and col < cols
+            mask = _column(cols, ship_size) << cell
+        else:
+            direction = 'H'
+            stride = 1
+            fits = row < rows and col + ship_size <= cols
+            mask = ((1 << ship_size) - 1) << cell
+        if not fits or mask & ship_mask:
+            raise ValueError(f"Encoded ship {name!r} does not fit on the board")
+        ship_mask |= mask
+
+        ship = Ship(name, ship_size)
+        ship.row = row
+        ship.col = col
+        ship.direction = direction
+        hits = hit_mask & mask
+        if hits:
+            hits >>= cell
+            if stride != 1:
+                hits = _column_hits(hits, cols, ship_size)
+            ship.hit_bits = hits
+            ship.hit_count = hits.bit_count()
+        cell_ship[cell:cell + ship_size * stride:stride] = _fill(index, ship_size)
+        ships.append(ship)
+        ship_masks.append(mask)
+
+    # Hits must be exactly the shots that landed on a ship
+    if shot_mask & ship_mask != hit_mask:
+        raise ValueError("Encoded hits do not match the ships")
+    board.ship_mask = ship_mask
+    board.shot_mask = shot_mask
+    board.hit_mask = hit_mask
+    return board, offset
+
+
+@lru_cache(maxsize=None)
+def _column(cols, size):
+    # Mask of a vertical ship of `size` at cell 0
+    return sum(1 << (i * cols) for i in range(size))
+
+
+@lru_cache(maxsize=None)
+def _column_patterns(cols, size):
+    # Hits on a vertical ship as column bits (bit i * cols) -> ship bits (bit i)
+    return {_spread(bits, cols): bits for bits in range(1 << size)}
+
+
+def _spread(bits, cols):
+    return sum(1 << (i * cols) for i in range(bits.bit_length()) if bits >> i & 1)
+
+
+def _column_hits(hits, cols, size):
+    if size <= 8:
+        return _column_patterns(cols, size)[hits]
+    bits = 0
+    while hits:
+        low = hits & -hits
+        bits |= 1 << ((low.bit_length() - 1) // cols)
+        hits ^= low
+    return bits
+
+
+@lru_cache(maxsize=None)
+def _fill(index, size):
+    # cell_ship values for the cells of ship `index`
+    return array('h', [index]) * size
+
+
+@lru_cache(maxsize=None)
+def _records_struct(count, record):
+    # `count` ship records back to back, unpacked in one call
+    return struct.Struct("<" + record.format.lstrip("<") * count)
+
+
+@lru_cache(maxsize=None)
+def _default_names(sizes):
+    return tuple(default_ship_name(index, size) or f"Ship {index + 1}"
+                 for index, size in enumerate(sizes))
+
+
+def _ship_records(buf, offset, count, record):
+    # [(name, size, row, col, flags)] for the ship records at offset, and the
+    # offset after them. Fleets without custom names (the usual case) have
+    # fixed-size records and are read in one unpack.
+    if not count:
+        return [], offset
+    batch = _records_struct(count, record)
+    fields = batch.unpack_from(buf, offset)
+    flags = fields[3::4]
+    if not any(flag & CUSTOM_NAME for flag in flags):
+        sizes = fields[0::4]
+        return zip(_default_names(sizes), sizes, fields[1::4], fields[2::4], flags), offset + batch.size
+
+    records = []
+    for index in range(count):
+        ship_size, row, col, flag = record.unpack_from(buf, offset)
+        offset += record.size
+        if flag & CUSTOM_NAME:
+            name, offset = _unpack_name(buf, offset)
+        else:
+            name = default_ship_name(index, ship_size) or f"Ship {index + 1}"
+        records.append((name, ship_size, row, col, flag))
+    return records, offset
+
+
+def _decode_player(buf, offset):
+    tag, flags, difficulty, name_len = PLAYER_HEADER.unpack_from(buf, offset)
+    if tag != b"P":
+        raise ValueError("Not an encoded Player")
+    data, offset = _take(buf, offset + PLAYER_HEADER.size, name_len)
+    name = bytes(data).decode()
+    board, offset = _decode_board(buf, offset)
+    player = Player(name, board, is_ai=bool(flags & IS_AI))
+    if flags & HAS_AI:
+        # The AI rebuilds its targeting memory from the opponent board on its first shot
+        from AI import AI
+        player.ai = AI(player, DIFFICULTIES[difficulty])
+    return player, offset
+
+
+def _decode_game(buf, offset):
+    tag, version, current_turn = GAME_HEADER.unpack_from(buf, offset)
+    if tag != b"G":
+        raise ValueError("Not an encoded GameLogic")
+    if version != VERSION:
+        raise ValueError(f"Unsupported game encoding version {version}")
+    offset += GAME_HEADER.size
+    player1, offset = _decode_player(buf, offset)
+    player2, offset = _decode_player(buf, offset)
+    game = GameLogic(player1, player2)
+    game.current_turn = current_turn
+    return game, offset
+
+
+_ENCODERS = ((GameLogic, _encode_game), (Player, _encode_player), (Board, _encode_board))
+_DECODERS = {b"G": _decode_game, b"P": _decode_player, b"B": _decode_board}
+
+
+def dumps(obj) -> bytes:
+    """Encode a Board, Player or GameLogic."""
+    out = bytearray()
+    dump_into(obj, out)
+    return bytes(out)
+
+
+def dump_into(obj, out: bytearray):
+    # Append the encoding of obj to `out` (e.g. a message being built)
+    for cls, encode in _ENCODERS:
+        if isinstance(obj, cls):
+            encode(out, obj)
+            return out
+    raise TypeError(f"Cannot encode {type(obj).__name__}")
+
+
+def loads(data, offset=0):
+    """Decode whatever dumps() produced. data may be bytes, bytearray or memoryview."""
+    return load_from(data, offset)[0]
+
+
+def load_from(data, offset=0):
+    """Like loads(), but also returns the offset just past the object."""
+    buf = memoryview(data)
+    decode = _DECODERS.get(bytes(buf[offset:offset + 1]))
+    if decode is None:
+        raise ValueError("Unknown encoded object")
+    try:
+        return decode(buf, offset)
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"Truncated or corrupt data: {e}") from None
+
+
+def save(obj, path):
+    with open(path, "wb") as f:
+        f.write(dumps(obj))
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,476 @@
+# Title: Session Host
+# Author: Nathan Vallad
+# Date: 12/15/2025
+# Purpose: Run thousands of games in one process without a GameLogic ->
+# Player -> Board -> Ship object graph per game. Every game lives in one slot
+# of a few shared NumPy arrays (cell -> ship index, shots received, ship hit
+# counters, turn, winner), so a live 10x10 game costs a few hundred bytes.
+# tick() plays the turn of every game whose current player is an AI in one
+# vectorized batch, and finished games are evicted automatically.
+#
+# fire() and fleet placement go through rules.py, with a game slot as the
+# storage (_SlotBoard/_SlotGame below), so they behave exactly like
+# GameLogic. tick() and fire_many() resolve a batch of shots across games with
+# rules.fire_many(), the pool arrays being its batched storage. Results are
+# the same as GameLogic.fire: "hit", "miss", ("sunk", Ship) or ("win", None).
+#
+# The AIs are batched heuristics of the host's own, cheaper than and not
+# move-for-move equal to AI.py's difficulties, so they have their own names:
+#   "random":  a uniformly random unshot cell.
+#   "parity":  cells next to any unresolved hit, then parity cells. Unlike
+#              HuntTargetFrontier it doesn't extend lines of hits first.
+#   "density": one blended placement density, each placement weighted by
+#              1 + 50 x the unresolved hits it covers. DensityTargeter instead
+#              switches between separate target and hunt scores.
+
+import itertools
+import random
+import time
+
+import numpy as np
+
+import rules
+from density import placement_cells
+from game_logic import DEFAULT_SHIPS
+from placements import placement_table
+from rules import HIT, MISS, SUNK, WIN      # last_result codes
+from ship import Ship
+
+LEVELS = ("random", "parity", "density")   # AIs tick() can play, see above
+HUMAN = -1
+DENSE_LIMIT = 16 << 20                      # Largest dense placement matrix (bytes), "density" AI
+
+
+def _signed(largest):
+    # Smallest signed integer dtype holding -1..largest
+    for dtype in (np.int8, np.int16, np.int32):
+        if largest <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _unsigned(largest):
+    # Smallest unsigned integer dtype holding 0..largest
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if largest <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+
+class SessionHost:
+    def __init__(self, rows=10, cols=10, fleet=DEFAULT_SHIPS, capacity=1024, linger=1, seed=None):
+        """
+        linger: ticks a finished game is kept (so its players can read the
+        result) before its slot is reused.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.cells = rows * cols
+        self.fleet = tuple(fleet)
+        self.ship_names = [name for name, _ in self.fleet]
+        self.ship_sizes = np.array([size for _, size in self.fleet],
+                                   dtype=_unsigned(max((size for _, size in self.fleet), default=0)))
+        self.linger = linger
+        self.rng = np.random.default_rng(seed)
+        self.py_rng = random.Random(seed)
+
+        self.capacity = 0
+        self.slots = {}       # session id -> slot
+        self.free = []        # Free slots, reused before the pool grows
+        self._ids = itertools.count(1)
+        self._allocate(capacity)
+
+        self._placement_mats = {}   # size -> dense matrix or None, see _placement_mat()
+        r, c = np.divmod(np.arange(self.cells), cols)
+        self._parity = ((r + c) % 2 == 0)
+
+        # Counters
+        self.tick_count = 0
+        self.turns = 0          # AI turns played by tick()
+        self.tick_seconds = 0.0
+        self.created = 0
+        self.evicted = 0
+
+    # Storage
+    def _allocate(self, capacity):
+        # Grow every per-slot array to `capacity` slots
+        old = self.capacity
+        fleet = len(self.fleet)
+
+        def grow(name, shape_tail, dtype, fill):
+            arr = np.full((capacity,) + shape_tail, fill, dtype=dtype)
+            if old:
+                arr[:old] = getattr(self, name)
+            setattr(self, name, arr)
+
+        grow("cell_ship", (2, self.cells), _signed(fleet), -1)   # Ship index per cell of each player's board
+        grow("shot", (2, self.cells), np.bool_, False)           # Shots received by each player's board
+        grow("ship_hits", (2, fleet), self.ship_sizes.dtype, 0)
+        grow("ships_left", (2,), _unsigned(fleet), 0)
+        grow("ai", (2,), np.int8, HUMAN)                 # Difficulty index per seat, HUMAN for people
+        grow("turn", (), np.uint8, 0)
+        grow("winner", (), np.int8, -1)
+        grow("live", (), np.bool_, False)
+        grow("finished_tick", (), np.int64, -1)
+        grow("last_cell", (), _signed(self.cells), -1)   # Last shot in each game and its result
+        grow("last_result", (), np.int8, -1)
+        grow("session_id", (), np.int64, 0)
+        self.free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def nbytes(self):
+        # Bytes held by the pooled arrays (all slots, live or not)
+        return sum(getattr(self, name).nbytes for name in (
+            "cell_ship", "shot", "ship_hits", "ships_left", "ai", "turn", "winner", "live",
+            "finished_tick", "last_cell", "last_result", "session_id"))
+
+    # Sessions
+    def create(self, ai=(None, "density"), fleets=None):
+        """
+        Start a game and return its session id.
+        ai: AI level per seat (one of LEVELS), None for a human player.
+        fleets: optional [(start, direction) per fleet ship] for each seat;
+        seats without one get a random fleet.
+        """
+        for level in ai:
+            if level is not None and level not in LEVELS:
+                raise ValueError(f"SessionHost has no {level!r} AI (levels: {', '.join(LEVELS)})")
+        if not self.free:
+            self._allocate(self.capacity * 2)
+        slot = self.free.pop()
+        session_id = next(self._ids)
+
+        self.cell_ship[slot] = -1
+        self.shot[slot] = False
+        self.ship_hits[slot] = 0
+        self.ships_left[slot] = len(self.fleet)
+        self.ai[slot] = [HUMAN if level is None else LEVELS.index(level) for level in ai]
+        self.turn[slot] = 0
+        self.winner[slot] = -1
+        self.finished_tick[slot] = -1
+        self.last_cell[slot] = -1
+        self.last_result[slot] = -1
+        self.session_id[slot] = session_id
+        self.live[slot] = True
+        self.slots[session_id] = slot
+
+        for player in (0, 1):
+            layout = fleets[player] if fleets and fleets[player] else None
+            if not self._place_fleet(slot, player, layout):
+                self.evict(session_id)
+                raise ValueError("Invalid fleet placement")
+        self.created += 1
+        return session_id
+
+    def _place_fleet(self, slot, player, layout):
+        board = _SlotBoard(self, slot, player)
+        occupied = 0
+        for ship_id, (name, size) in enumerate(self.fleet):
+            table = placement_table(self.rows, self.cols, size)
+            if layout is None:
+                i = table.draw(occupied, self.py_rng)
+                if i is None:
+                    return False
+                start, direction = table.placements[i]
+            else:
+                start, direction = layout[ship_id]
+            if not rules.place(board, Ship(name, size), start, direction):
+                return False
+            occupied |= table.mask(start, direction)
+        return True
+
+    def __contains__(self, session_id):
+        return session_id in self.slots
+
+    def __len__(self):
+        return len(self.slots)
+
+    def evict(self, session_id):
+        slot = self.slots.pop(session_id)
+        self.live[slot] = False
+        self.free.append(slot)
+        self.evicted += 1
+
+    def state(self, session_id):
+        """Summary of one session as a dict (KeyError if unknown or evicted)."""
+        slot = self.slots[session_id]
+        winner = int(self.winner[slot])
+        last = int(self.last_cell[slot])
+        return {
+            "id": session_id,
+            "current_turn": int(self.turn[slot]),
+            "game_over": winner >= 0,
+            "winner": winner if winner >= 0 else None,
+            "ships_left": self.ships_left[slot].tolist(),
+            "last_shot": divmod(last, self.cols) if last >= 0 else None,
+            "last_result": self._result(slot, int(self.last_result[slot])) if last >= 0 else None,
+        }
+
+    def grid(self, session_id, player):
+        # grid[r][c] of "~"/"S"/"X"/"O" for one player's board, as in Board.grid
+        slot = self.slots[session_id]
+        codes = np.where(self.cell_ship[slot, player] >= 0, ord("S"), ord("~")).astype(np.uint8)
+        shot = self.shot[slot, player]
+        codes[shot] = np.where(self.cell_ship[slot, player][shot] >= 0, ord("X"), ord("O"))
+        text = codes.tobytes().decode()
+        return [list(text[r * self.cols:(r + 1) * self.cols]) for r in range(self.rows)]
+
+    def _result(self, slot, code):
+        if code == WIN:
+            return ("win", None)
+        if code == SUNK:
+            # The game went on, so the turn has passed to the player who was shot
+            defender = int(self.turn[slot])
+            ship_id = int(self.cell_ship[slot, defender, self.last_cell[slot]])
+            return ("sunk", self._ship(slot, defender, ship_id))
+        return "hit" if code == HIT else "miss"
+
+    def _ship(self, slot, player, ship_id):
+        # Ship object for a fleet ship of one board, with its hits
+        cells = np.flatnonzero(self.cell_ship[slot, player] == ship_id).tolist()
+        name, size = self.fleet[ship_id]
+        ship = Ship(name, size)
+        direction = 'H' if size == 1 or cells[1] - cells[0] == 1 else 'V'
+        ship.place(divmod(cells[0], self.cols), direction)
+        for cell in cells:
+            if self.shot[slot, player, cell]:
+                ship.register_hit(divmod(cell, self.cols))
+        return ship
+
+    # Turns
+    def fire(self, session_id, row, col):
+        """Current player of the session fires at (row, col), like GameLogic.fire."""
+        slot = self.slots[session_id]
+        if self.winner[slot] >= 0:
+            raise ValueError("Game is over")
+        result, game_over = rules.fire(_SlotGame(self, slot), int(self.turn[slot]), row, col)
+        self.last_cell[slot] = row * self.cols + col
+        if game_over:
+            self.last_result[slot] = WIN
+            return ("win", None)
+        self.last_result[slot] = SUNK if result.__class__ is tuple else HIT if result == "hit" else MISS
+        return result
+
+    def fire_many(self, session_ids, cells):
+        """
+        Fire one shot in each of several sessions (distinct) by its current
+        player, cells flat (row * cols + col). Returns the results, as fire().
+        """
+        slots = np.array([self.slots[session_id] for session_id in session_ids], dtype=np.intp)
+        cells = np.asarray(cells, dtype=np.intp)
+        if (self.winner[slots] >= 0).any():
+            raise ValueError("Game is over")
+        if ((cells < 0) | (cells >= self.cells)).any():
+            raise IndexError("Shot out of bounds")
+        codes = self._apply(slots, cells)
+        return [self._result(slot, code) for slot, code in zip(slots.tolist(), codes.tolist())]
+
+    def _apply(self, slots, cells):
+        # rules.fire_many() with the host's bookkeeping; returns the result codes
+        codes = rules.fire_many(self, slots, cells)
+        self.finished_tick[slots[codes == WIN]] = self.tick_count
+        self.last_cell[slots] = cells
+        self.last_result[slots] = codes
+        return codes
+
+    def tick(self):
+        """
+        Play one turn in every live game whose current player is an AI, then
+        evict games finished more than `linger` ticks ago.
+        Returns the number of turns played.
+        """
+        start = time.perf_counter()
+        slots = np.flatnonzero(self.live & (self.winner < 0))
+        if slots.size:
+            slots = slots[self.ai[slots, self.turn[slots]] >= 0]
+        if slots.size:
+            self._apply(slots, self._choose(slots))
+            self.turns += slots.size
+
+        expired = np.flatnonzero(self.live & (self.finished_tick >= 0)
+                                 & (self.finished_tick <= self.tick_count - self.linger))
+        for slot in expired.tolist():
+            self.evict(int(self.session_id[slot]))
+
+        self.tick_count += 1
+        self.tick_seconds += time.perf_counter() - start
+        return int(slots.size)
+
+    def _choose(self, slots):
+        # Cell to shoot for each game in `slots`, by the seat's AI level.
+        # The AI only uses what a player would know: its shots, which of them
+        # hit, and which ships they sank.
+        attacker = self.turn[slots].astype(np.intp)
+        defender = 1 - attacker
+        level = self.ai[slots, attacker]
+        shot = self.shot[slots, defender]
+        ship = self.cell_ship[slots, defender].astype(np.intp)
+        hit = shot & (ship >= 0)
+        sunk_ship = self.ship_hits[slots, defender] == self.ship_sizes
+        sunk = hit & np.take_along_axis(sunk_ship, np.maximum(ship, 0), axis=1)
+        unresolved = hit & ~sunk
+
+        scores = self.rng.random((len(slots), self.cells), dtype=np.float32)
+
+        parity = level == LEVELS.index("parity")
+        if parity.any():
+            # Cells next to an unresolved hit first, then parity cells
+            near = self._neighbours(unresolved[parity])
+            scores[parity] += 4 * near + self._parity
+        dense = level == LEVELS.index("density")
+        if dense.any():
+            scores[dense] += self._density(shot[dense], unresolved[dense],
+                                           sunk_ship[dense] == 0)
+
+        scores[shot] = -1
+        return scores.argmax(axis=1)
+
+    def _neighbours(self, marks):
+        # Cells orthogonally next to a marked cell, per game
+        grid = marks.reshape(-1, self.rows, self.cols)
+        near = np.zeros_like(grid)
+        near[:, 1:, :] |= grid[:, :-1, :]
+        near[:, :-1, :] |= grid[:, 1:, :]
+        near[:, :, 1:] |= grid[:, :, :-1]
+        near[:, :, :-1] |= grid[:, :, 1:]
+        return near.reshape(len(marks), self.cells)
+
+    def _placement_mat(self, size):
+        # Dense (placements, cells) 0/1 matrix for a ship size, built on the
+        # first "density" turn, or None when it would exceed DENSE_LIMIT bytes
+        if size not in self._placement_mats:
+            cells = placement_cells(self.rows, self.cols, size)[0]
+            mat = None
+            if len(cells) * self.cells * 4 <= DENSE_LIMIT:
+                mat = np.zeros((len(cells), self.cells), dtype=np.float32)
+                np.put_along_axis(mat, cells.astype(np.int64), 1.0, axis=1)
+            self._placement_mats[size] = mat
+        return self._placement_mats[size]
+
+    def _density(self, shot, unresolved, afloat):
+        # Placement density of the remaining ships, placements through
+        # unresolved hits weighted up (the "density" AI, see the module header).
+        # Scaled so the tie-break noise only decides between near-equal cells.
+        #
+        # Small boards use dense matrix products, which BLAS makes fast.
+        # Larger ones gather from the sparse placement_cells() index and
+        # scatter back with bincount: O(games x placements x ship size),
+        # and nothing of size placements x cells is built.
+        games = len(shot)
+        blocked = shot & ~unresolved
+        density = np.zeros((games, self.cells), dtype=np.float32)
+        flat = density.reshape(-1)
+        for size in np.unique(self.ship_sizes).tolist():
+            count = afloat[:, self.ship_sizes == size].sum(axis=1).astype(np.float32)
+            cells = placement_cells(self.rows, self.cols, size)[0]
+            if not count.any() or not len(cells):
+                continue
+            mat = self._placement_mat(size)
+            if mat is not None:
+                valid = (blocked.astype(np.float32) @ mat.T) == 0
+                weight = valid * (1 + 50 * (unresolved.astype(np.float32) @ mat.T))
+                density += count[:, None] * (weight @ mat)
+                continue
+            # Bound the (games, placements, size) temporaries
+            chunk = max(1, (1 << 22) // cells.size)
+            for lo in range(0, games, chunk):
+                hi = min(games, lo + chunk)
+                valid = ~blocked[lo:hi][:, cells].any(axis=2)
+                hits = unresolved[lo:hi][:, cells].sum(axis=2)
+                weight = count[lo:hi, None] * valid * (1 + 50 * hits)
+                index = np.arange(hi - lo)[:, None, None] * self.cells + cells
+                flat[lo * self.cells:hi * self.cells] += np.bincount(
+                    index.ravel(), np.repeat(weight.ravel(), size),
+                    minlength=(hi - lo) * self.cells).astype(np.float32)
+        peak = density.max(axis=1, keepdims=True)
+        return 1000 * density / np.maximum(peak, 1)
+
+    # Metrics
+    def stats(self):
+        live = len(self.slots)
+        return {
+            "live_sessions": live,
+            "capacity": self.capacity,
+            "pool_bytes": self.nbytes(),
+            "bytes_per_session": round(self.nbytes() / live) if live else 0,
+            "created": self.created,
+            "evicted": self.evicted,
+            "ticks": self.tick_count,
+            "turns": self.turns,
+            "turns_per_second": round(self.turns / self.tick_seconds) if self.tick_seconds else 0,
+        }
+
+
+class _SlotBoard:
+    # One player's board in a SessionHost slot, as rules.py board storage
+    __slots__ = ("host", "slot", "player", "rows", "cols")
+
+    def __init__(self, host, slot, player):
+        self.host = host
+        self.slot = slot
+        self.player = player
+        self.rows = host.rows
+        self.cols = host.cols
+
+    def _cells(self, mask):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def occupied(self, mask) -> bool:
+        cell_ship = self.host.cell_ship[self.slot, self.player]
+        return any(cell_ship[cell] >= 0 for cell in self._cells(mask))
+
+    def add_ship(self, ship, start, direction, mask):
+        # Fleets are placed in order, so the next ship index is one past the last
+        cell_ship = self.host.cell_ship[self.slot, self.player]
+        ship_id = int(cell_ship.max()) + 1
+        for cell in self._cells(mask):
+            cell_ship[cell] = ship_id
+        return True
+
+    def mark_shot(self, cell) -> int:
+        shot = self.host.shot[self.slot, self.player]
+        if shot[cell]:
+            return rules.REPEAT
+        shot[cell] = True
+        return int(self.host.cell_ship[self.slot, self.player, cell])
+
+    def add_hit(self, ship_id, cell) -> bool:
+        host = self.host
+        host.ship_hits[self.slot, self.player, ship_id] += 1
+        if host.ship_hits[self.slot, self.player, ship_id] != host.ship_sizes[ship_id]:
+            return False
+        host.ships_left[self.slot, self.player] -= 1
+        return True
+
+    def ship(self, ship_id):
+        return self.host._ship(self.slot, self.player, ship_id)
+
+    def all_ships_sunk(self) -> bool:
+        return self.host.ships_left[self.slot, self.player] == 0
+
+
+class _SlotGame:
+    # A SessionHost slot as rules.py game storage
+    __slots__ = ("host", "slot")
+
+    def __init__(self, host, slot):
+        self.host = host
+        self.slot = slot
+
+    def board(self, idx):
+        return _SlotBoard(self.host, self.slot, idx)
+
+    @property
+    def current_turn(self):
+        return int(self.host.turn[self.slot])
+
+    @current_turn.setter
+    def current_turn(self, value):
+        self.host.turn[self.slot] = value
+
+    def end_game(self, winner):
+        self.host.winner[self.slot] = winner
+        self.host.finished_tick[self.slot] = self.host.tick_count
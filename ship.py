@@ -5,30 +5,67 @@
 # hits tracking, placement on the board, registering hits, and checking if the ship is sunk.
 
 class Ship:
+    # Slotted and stored as a start/direction/size triple plus a hit counter,
+    # so a fleet costs a handful of small objects instead of lists of tuples.
+    __slots__ = ("name", "size", "row", "col", "direction", "hit_bits", "hit_count")
+
     def __init__(self, name: str, size: int):
         self.name = name
         self.size = size
-        self.positions = []    # List[(row, col)]
-        self.hits = set()      # Set[(row, col)]
+        self.row = -1          # Row of the first cell once placed
+        self.col = -1          # Column of the first cell once placed
+        self.direction = None  # 'H' or 'V' once placed
+        self.hit_bits = 0      # Bit i set when the i-th cell has been hit
+        self.hit_count = 0
 
     def place(self, start, direction):
         # start: (row, col)
         # direction: 'H' or 'V'
-        
-        r, c = start
-        self.positions = []
-
-        for i in range(self.size):
-            if direction == 'H':
-                self.positions.append((r, c + i))
-            elif direction == 'V':
-                self.positions.append((r + i, c))
-            else:
-                raise ValueError("Direction must be 'H' or 'V'")
+        if direction not in ('H', 'V'):
+            raise ValueError("Direction must be 'H' or 'V'")
+
+        self.row, self.col = start
+        self.direction = direction
+        self.hit_bits = 0
+        self.hit_count = 0
+
+    @property
+    def start(self):
+        return (self.row, self.col) if self.direction else None
+
+    @property
+    def positions(self):
+        # List[(row, col)], derived from the start/direction/size triple
+        if self.direction == 'H':
+            return [(self.row, self.col + i) for i in range(self.size)]
+        if self.direction == 'V':
+            return [(self.row + i, self.col) for i in range(self.size)]
+        return []
+
+    @property
+    def hits(self):
+        # Set[(row, col)] of cells that have been hit
+        positions = self.positions
+        return {positions[i] for i in range(self.size) if self.hit_bits >> i & 1}
+
+    def _offset(self, pos) -> int:
+        # Index of pos along the ship, or -1 if the ship does not cover it
+        r, c = pos
+        if self.direction == 'H':
+            offset = c - self.col
+            if r == self.row and 0 <= offset < self.size:
+                return offset
+        elif self.direction == 'V':
+            offset = r - self.row
+            if c == self.col and 0 <= offset < self.size:
+                return offset
+        return -1
 
     def register_hit(self, pos):
-        if (pos) in self.positions:
-            self.hits.add(pos)
+        offset = self._offset(pos)
+        if offset >= 0 and not self.hit_bits >> offset & 1:
+            self.hit_bits |= 1 << offset
+            self.hit_count += 1
 
     def is_sunk(self) -> bool:
-        return len(self.hits) == self.size
\ No newline at end of file
+        return self.hit_count == self.size
\ No newline at end of file
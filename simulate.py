@@ -0,0 +1,122 @@
+# Title: Headless Simulation
+# Author: Nathan Vallad
+# Date: 12/10/2025
+# Purpose: Play AI-vs-AI games without pygame to tune AI strategies.
+# Games are spread across a process pool and results are streamed one JSON
+# line per game, followed by a throughput summary on stderr.
+#
+# Example:
+#   python simulate.py --games 100000 --p1 hard --p2 medium --workers 8 > results.jsonl
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from AI import AI, DIFFICULTIES
+from board import Board
+from game_logic import GameLogic
+from player import Player
+
+
+def play_game(seed, difficulties=("hard", "hard"), rows=10, cols=10):
+    """
+    Play one AI-vs-AI game. Everything random is driven by `seed`, so a game
+    can be replayed exactly. Returns a dict of per-game results.
+    """
+    random.seed(seed)
+
+    players = []
+    for i, difficulty in enumerate(difficulties):
+        player = Player(f"Player {i + 1}", Board(rows, cols), is_ai=True)
+        player.ai = AI(player, difficulty)
+        players.append(player)
+
+    game = GameLogic(players[0], players[1])
+    game.auto_place_ships_if_ai()
+
+    shots = [0, 0]
+    hits = [0, 0]
+    while True:
+        turn = game.current_turn
+        result = game.ai_take_turn()
+        shots[turn] += 1
+        if result != "miss":
+            hits[turn] += 1
+        if result == ("win", None):
+            break
+
+    return {
+        "seed": seed,
+        "winner": turn,
+        "turns": shots[turn],
+        "shots": shots,
+        "hit_rate": [round(h / s, 4) if s else 0.0 for h, s in zip(hits, shots)],
+    }
+
+
+def _play(job):
+    seed, difficulties, rows, cols = job
+    return play_game(seed, difficulties, rows, cols)
+
+
+def run(games, workers=None, difficulties=("hard", "hard"), rows=10, cols=10, seed=0):
+    """
+    Generator yielding one result dict per game as soon as it finishes
+    (not in seed order). Seeds are seed, seed + 1, ..., seed + games - 1.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = ((seed + i, tuple(difficulties), rows, cols) for i in range(games))
+
+    if workers == 1:
+        for job in jobs:
+            yield _play(job)
+        return
+
+    # Large chunks keep the pool's IPC cost small next to the games themselves
+    chunksize = max(1, min(256, games // (workers * 8)))
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(_play, jobs, chunksize=chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless AI-vs-AI Battleship simulation.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--p1", choices=DIFFICULTIES, default="hard")
+    parser.add_argument("--p2", choices=DIFFICULTIES, default="hard")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    wins = [0, 0]
+    total_turns = 0
+    start = time.perf_counter()
+    for result in run(args.games, args.workers, (args.p1, args.p2), args.rows, args.cols, args.seed):
+        wins[result["winner"]] += 1
+        total_turns += result["turns"]
+        if not args.quiet:
+            sys.stdout.write(json.dumps(result) + "\n")
+    elapsed = time.perf_counter() - start
+
+    rate = args.games / elapsed if elapsed else 0.0
+    summary = {
+        "games": args.games,
+        "workers": args.workers,
+        "seconds": round(elapsed, 3),
+        "games_per_second": round(rate, 1),
+        "games_per_second_per_core": round(rate / args.workers, 1),
+        "wins": wins,
+        "mean_turns_to_win": round(total_turns / args.games, 2) if args.games else 0.0,
+    }
+    print(json.dumps(summary), file=sys.stderr)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+replay.py: every turn of a recorded game rebuilds to what was played, and
+the log survives reopening, torn writes and games longer than 65,535 shots.
+"""
+
+import pytest
+
+from benchmarks.replay import _snapshot, check, play_games
+from board import Board
+from game_logic import GameLogic
+from player import Player
+from replay import FILE_HEADER, RECORD_SIZE, ReplayLog, ReplayWriter
+from ship import Ship
+
+
+@pytest.mark.parametrize("rows, cols", [(10, 10), (6, 17)])
+def test_every_turn_rebuilds(tmp_path, rows, cols):
+    path = str(tmp_path / "games.replay")
+    history = []
+    with ReplayWriter(path) as writer:
+        play_games(10, seed=rows, writer=writer, rows=rows, cols=cols, history=history)
+    check(path, history)
+
+    with ReplayLog(path) as log:
+        game = log.state(log.games[0])
+        assert game.players[1].ai.difficulty == "medium"
+        assert _snapshot(game) == history[0][-1]
+        assert log.turns(log.games[0]) == len(history[0]) - 1
+        assert [shot[4] for shot in log.shots(log.games[0])][-1] == "win"
+
+
+def test_reopen_appends_and_drops_a_torn_record(tmp_path):
+    path = str(tmp_path / "games.replay")
+    history = []
+    with ReplayWriter(path) as writer:
+        play_games(3, seed=1, writer=writer, history=history)
+    with open(path, "ab") as f:
+        f.write(b"\x00" * (RECORD_SIZE // 2))
+
+    with ReplayWriter(path) as writer:
+        play_games(2, seed=2, writer=writer, history=history)
+    with ReplayLog(path) as log:
+        assert log.games == [0, 1, 2, 3, 4]
+    check(path, history)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "games.replay"
+    path.write_bytes(b"BSRP")
+    with pytest.raises(ValueError):
+        ReplayLog(str(path))
+    path.write_bytes(FILE_HEADER.pack(b"BSRP", 1, RECORD_SIZE))
+    with pytest.raises(ValueError):
+        ReplayLog(str(path))
+
+
+def test_turns_past_65535(tmp_path):
+    # Both players sweep a 200x200 board cell by cell; the only ship is
+    # in the last two cells
+    size = 200
+    players = []
+    for name in ("Player 1", "Player 2"):
+        board = Board(size, size)
+        board.place_ship(Ship("Destroyer", 2), (size - 1, size - 2), "H")
+        players.append(Player(name, board))
+    game = GameLogic(*players)
+
+    path = str(tmp_path / "long.replay")
+    with ReplayWriter(path) as writer:
+        writer.attach(game)
+        for cell in range(size * size):
+            game.fire(*divmod(cell, size))
+            if game.is_game_over():
+                break
+            game.fire(*divmod(cell, size))
+    turns = 2 * size * size - 1
+
+    with ReplayLog(path) as log:
+        assert log.turns(0) == turns
+        assert _snapshot(log.state(0)) == _snapshot(game)
+        late = log.state(0, 70001)
+        assert late.current_turn == 1
+        assert late.players[1].board.shot_mask == (1 << 35001) - 1
+        assert late.players[0].board.shot_mask == (1 << 35000) - 1
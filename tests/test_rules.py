@@ -0,0 +1,42 @@
+"""
+Every backend of the rules engine (rules.py) plays the same game; see
+benchmarks/rules_equivalence.py, whose checks these run.
+
+    python -m pytest tests
+"""
+
+import multiprocessing
+
+import pytest
+
+from benchmarks.rules_equivalence import play
+from session_host import SessionHost
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_backends_agree(seed):
+    play(seed)
+
+
+def test_manager_backend_agrees():
+    with multiprocessing.Manager() as manager:
+        for seed in range(2):
+            play(seed, manager)
+
+
+def test_fire_many_resolves_each_game():
+    # Games in one batch end up in different states; one 2 cell ship each,
+    # on cells 0 and 1
+    host = SessionHost(4, 4, fleet=[("Destroyer", 2)], capacity=3)
+    fleets = ([((0, 0), "H")], [((0, 0), "H")])
+    games = [host.create(ai=(None, None), fleets=fleets) for _ in range(3)]
+
+    assert host.fire_many(games, [0, 5, 1]) == ["hit", "miss", "hit"]
+    assert host.fire_many(games, [5, 5, 5]) == ["miss"] * 3
+    # A cell already shot is a miss and passes the turn
+    assert host.fire_many(games, [0, 1, 0]) == ["miss", "hit", ("win", None)]
+    assert host.state(games[2])["winner"] == 0
+    assert host.fire_many(games[:2], [15, 15]) == ["miss"] * 2
+    assert host.fire_many(games[:2], [1, 0]) == [("win", None)] * 2
+    with pytest.raises(ValueError):
+        host.fire_many(games[:1], [2])
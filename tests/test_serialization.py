@@ -0,0 +1,104 @@
+"""
+serialization.py round trips: a decoded Board, Player or GameLogic matches
+the original in every field a game reads, and corrupt input is a ValueError.
+"""
+
+import random
+
+import pytest
+
+from AI import AI, DIFFICULTIES
+from benchmarks.serialize import make_games
+from board import Board
+from game_logic import DEFAULT_SHIPS
+from player import Player
+from ship import Ship
+import serialization
+
+
+def _board_state(board):
+    ships = [(s.name, s.size, s.row, s.col, s.direction, s.hit_bits, s.hit_count)
+             for s in board.ships]
+    return (board.rows, board.cols, ships, board.ship_masks, board.ship_mask,
+            board.shot_mask, board.hit_mask, board.cell_ship.tolist(), board.grid)
+
+
+def _random_board(rows, cols, rng, names=None):
+    board = Board(rows, cols)
+    fleet = names or DEFAULT_SHIPS
+    for name, size in fleet:
+        while not board.place_ship(Ship(name, size), (rng.randrange(rows), rng.randrange(cols)),
+                                   rng.choice("HV")):
+            pass
+    for _ in range(rng.randrange(rows * cols)):
+        board.take_shot(rng.randrange(rows), rng.randrange(cols))
+    return board
+
+
+@pytest.mark.parametrize("rows, cols", [(10, 10), (7, 13), (5, 300), (300, 5)])
+def test_board_round_trip(rows, cols):
+    rng = random.Random(rows * cols)
+    for _ in range(50):
+        board = _random_board(rows, cols, rng)
+        assert _board_state(serialization.loads(serialization.dumps(board))) == _board_state(board)
+
+
+def test_custom_ship_names_round_trip():
+    board = _random_board(10, 10, random.Random(1), [("Flagship", 5), ("Cruiser", 3), ("Ébauche", 2)])
+    assert [s.name for s in serialization.loads(serialization.dumps(board)).ships] == \
+        ["Flagship", "Cruiser", "Ébauche"]
+
+
+def test_game_round_trip():
+    for game in make_games(50, seed=3):
+        for player, difficulty in zip(game.players, random.sample(DIFFICULTIES, 2)):
+            player.ai = AI(player, difficulty)
+        copy = serialization.loads(bytearray(serialization.dumps(game)))
+        assert copy.current_turn == game.current_turn
+        for mine, theirs in zip(copy.players, game.players):
+            assert (mine.name, mine.is_ai, mine.ai.difficulty) == \
+                (theirs.name, theirs.is_ai, theirs.ai.difficulty)
+            assert _board_state(mine.board) == _board_state(theirs.board)
+
+
+def test_load_from_returns_the_next_offset():
+    player = Player("Alice", _random_board(10, 10, random.Random(2)))
+    out = bytearray(b"xx")
+    serialization.dump_into(player, out)
+    serialization.dump_into(player.board, out)
+    loaded, offset = serialization.load_from(memoryview(out), 2)
+    assert loaded.name == "Alice"
+    assert _board_state(serialization.loads(out, offset)) == _board_state(player.board)
+
+
+def _corrupt(data, index, value):
+    data = bytearray(data)
+    data[index] = value
+    return bytes(data)
+
+
+def test_corrupt_data_is_a_value_error():
+    # The default fleet, ship i across row i from column 0 (4 byte records,
+    # no names), with the Carrier hit at (0, 0)
+    board = Board(10, 10)
+    for i, (name, size) in enumerate(DEFAULT_SHIPS):
+        board.place_ship(Ship(name, size), (i, 0), "H")
+    board.take_shot(0, 0)
+    data = serialization.dumps(board)
+    shots = serialization.BOARD_HEADER.size
+    hits = shots + serialization._mask_bytes(10, 10)
+    battleship = hits + serialization._mask_bytes(10, 10) + 4
+
+    bad = [
+        data[:-1],                          # truncated
+        b"Q" + data[1:],                    # unknown tag
+        _corrupt(data, shots, 0),           # hit without its shot
+        _corrupt(data, shots + 1, 0x04),    # shot on the Battleship, no hit
+        _corrupt(data, hits - 1, 0x10),     # shot past the last cell
+        _corrupt(data, hits + 12, 0x10),    # hit past the last cell
+        _corrupt(data, battleship + 1, 0),  # Battleship onto the Carrier's row
+        _corrupt(data, battleship + 2, 7),  # Battleship off the board
+    ]
+    for data in bad:
+        with pytest.raises(ValueError):
+            serialization.loads(data)